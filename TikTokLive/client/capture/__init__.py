@@ -0,0 +1,4 @@
+from .capture_codec import DictionaryCodec, DictionaryCodecType, SUPPORTS_ZSTANDARD
+from .capture_format import CaptureRecordKind, CaptureRecord, CaptureIndexEntry, CaptureFormatError
+from .capture_reader import read_capture, CaptureReader, CapturedMessage
+from .capture_writer import CaptureWriter
@@ -0,0 +1,315 @@
+import enum
+import struct
+import zlib
+from collections import Counter
+from typing import Optional, Sequence, List, Set, Tuple
+
+from TikTokLive.client.capture.capture_format import CaptureFormatError
+from TikTokLive.proto.proto_wire import WireBuffer
+
+"""Whether zstandard is installed"""
+try:
+    import zstandard
+
+    SUPPORTS_ZSTANDARD: bool = True
+except ImportError:
+    SUPPORTS_ZSTANDARD: bool = False
+
+"""The header of a serialized dictionary: codec type, dictionary ID"""
+DICTIONARY_HEADER: struct.Struct = struct.Struct("<BI")
+
+"""The dictionary ID in front of each compressed payload"""
+PAYLOAD_HEADER: struct.Struct = struct.Struct("<I")
+
+"""The largest dictionary zlib can use (the size of its window)"""
+ZLIB_MAX_DICTIONARY_SIZE: int = 32 * 1024
+
+"""The substring length used to find content shared between samples, when training a zlib dictionary"""
+ZLIB_TRAINING_GRAM: int = 8
+
+"""
+The most sample bytes a zlib dictionary is trained on, split evenly between the samples' openings. Training is pure
+Python & holds the GIL, so it is bounded (~0.1 s), & more samples barely improve the dictionary.
+
+"""
+ZLIB_TRAINING_BYTES: int = 128 * 1024
+
+
+class DictionaryCodecType(enum.IntEnum):
+    """
+    The compressor behind a dictionary codec
+
+    """
+
+    ZSTD = 1
+    ZLIB = 2
+
+
+class DictionaryCodec:
+    """
+    Compress small, repetitive payloads (user structs, CDN URLs, badges...) with a dictionary trained on a sample of them.
+
+    Each payload is compressed on its own, so any one can be decompressed without the others. The dictionary carries
+    the content the payloads share, which per-payload gzip has to re-learn every time. zstd is used if it is installed,
+    otherwise zlib with a preset dictionary.
+
+    """
+
+    def __init__(
+            self,
+            dictionary: bytes,
+            codec_type: Optional[DictionaryCodecType] = None,
+            level: Optional[int] = None
+    ):
+        """
+        Create a codec from an existing dictionary
+
+        :param dictionary: The dictionary
+        :param codec_type: The compressor to use. Defaults to zstd if it is installed, otherwise zlib.
+        :param level: The compression level. Defaults to the compressor's default.
+        :raises ImportError: If zstd is asked for & zstandard is not installed
+
+        """
+
+        if codec_type is None:
+            codec_type = DictionaryCodecType.ZSTD if SUPPORTS_ZSTANDARD else DictionaryCodecType.ZLIB
+
+        if codec_type == DictionaryCodecType.ZSTD and not SUPPORTS_ZSTANDARD:
+            raise ImportError(
+                'Cannot use a zstd dictionary without zstandard. '
+                'To install it, type "pip install TikTokLive[compression]".'
+            )
+
+        self._dictionary: bytes = bytes(dictionary)
+        self._codec_type: DictionaryCodecType = DictionaryCodecType(codec_type)
+        self._dictionary_id: int = zlib.crc32(self._dictionary)
+
+        if self._codec_type == DictionaryCodecType.ZSTD:
+            zstd_dictionary = zstandard.ZstdCompressionDict(self._dictionary)
+            self._compressor = zstandard.ZstdCompressor(level=3 if level is None else level, dict_data=zstd_dictionary)
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=zstd_dictionary)
+        else:
+            # Prime the dictionary once; each payload then starts from a copy of the primed state
+            self._compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION if level is None else level,
+                zlib.DEFLATED,
+                -zlib.MAX_WBITS,
+                zdict=self._dictionary[-ZLIB_MAX_DICTIONARY_SIZE:]
+            )
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=self._dictionary[-ZLIB_MAX_DICTIONARY_SIZE:])
+
+    @property
+    def codec_type(self) -> DictionaryCodecType:
+        """The compressor behind the codec"""
+
+        return self._codec_type
+
+    @property
+    def dictionary(self) -> bytes:
+        """The dictionary"""
+
+        return self._dictionary
+
+    @property
+    def dictionary_id(self) -> int:
+        """The ID payloads compressed with this dictionary are tagged with"""
+
+        return self._dictionary_id
+
+    @classmethod
+    def train(
+            cls,
+            samples: Sequence[WireBuffer],
+            dictionary_size: int = ZLIB_MAX_DICTIONARY_SIZE,
+            codec_type: Optional[DictionaryCodecType] = None,
+            level: Optional[int] = None
+    ) -> "DictionaryCodec":
+        """
+        Train a dictionary on sample payloads
+
+        :param samples: The sample payloads. A few dozen representative ones are plenty.
+        :param dictionary_size: The maximum dictionary size (zlib can only use the last 32 KiB)
+        :param codec_type: The compressor to use. Defaults to zstd if it is installed, otherwise zlib.
+        :param level: The compression level. Defaults to the compressor's default.
+        :return: The codec
+
+        """
+
+        if codec_type is None:
+            codec_type = DictionaryCodecType.ZSTD if SUPPORTS_ZSTANDARD else DictionaryCodecType.ZLIB
+
+        samples: List[bytes] = [bytes(sample) for sample in samples if len(sample)]
+
+        if codec_type == DictionaryCodecType.ZSTD and SUPPORTS_ZSTANDARD:
+            try:
+                dictionary: bytes = zstandard.train_dictionary(dictionary_size, samples).as_bytes()
+            except zstandard.ZstdError:
+                # Too few samples for the trainer, so use their shared content as-is
+                dictionary: bytes = cls._shared_content(samples, dictionary_size)
+        else:
+            dictionary: bytes = cls._shared_content(samples, min(dictionary_size, ZLIB_MAX_DICTIONARY_SIZE))
+
+        return cls(dictionary, codec_type=codec_type, level=level)
+
+    def compress(self, payload: WireBuffer) -> bytes:
+        """
+        Compress a payload, tagged with the dictionary ID
+
+        :param payload: The payload
+        :return: The compressed payload
+
+        """
+
+        if self._codec_type == DictionaryCodecType.ZSTD:
+            compressed: bytes = self._compressor.compress(payload)
+        else:
+            compressor = self._compressor.copy()
+            compressed: bytes = compressor.compress(payload) + compressor.flush()
+
+        return PAYLOAD_HEADER.pack(self._dictionary_id) + compressed
+
+    def decompress(self, payload: WireBuffer) -> bytes:
+        """
+        Decompress a payload compressed with this codec
+
+        :param payload: The compressed payload
+        :return: The original payload
+        :raises CaptureFormatError: If the payload was compressed with another dictionary
+
+        """
+
+        if self.payload_dictionary_id(payload) != self._dictionary_id:
+            raise CaptureFormatError("The payload was compressed with a different dictionary.")
+
+        compressed: memoryview = memoryview(payload)[PAYLOAD_HEADER.size:]
+
+        if self._codec_type == DictionaryCodecType.ZSTD:
+            return self._decompressor.decompress(compressed)
+
+        decompressor = self._decompressor.copy()
+        return decompressor.decompress(compressed) + decompressor.flush()
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the codec, so payloads can be decompressed later
+
+        :return: The codec type, dictionary ID & dictionary
+
+        """
+
+        return DICTIONARY_HEADER.pack(self._codec_type, self._dictionary_id) + self._dictionary
+
+    @classmethod
+    def from_bytes(cls, data: WireBuffer) -> "DictionaryCodec":
+        """
+        Load a codec serialized with `to_bytes`
+
+        :param data: The serialized codec
+        :return: The codec
+        :raises CaptureFormatError: If the data is not a serialized codec
+
+        """
+
+        if len(data) < DICTIONARY_HEADER.size:
+            raise CaptureFormatError("Truncated compression dictionary.")
+
+        codec_type, dictionary_id = DICTIONARY_HEADER.unpack_from(data)
+
+        if codec_type not in DictionaryCodecType.__members__.values():
+            raise CaptureFormatError(f"Unknown compression dictionary type {codec_type}.")
+
+        codec: DictionaryCodec = cls(bytes(memoryview(data)[DICTIONARY_HEADER.size:]), codec_type=codec_type)
+
+        if codec.dictionary_id != dictionary_id:
+            raise CaptureFormatError("Corrupt compression dictionary.")
+
+        return codec
+
+    @classmethod
+    def payload_dictionary_id(cls, payload: WireBuffer) -> int:
+        """
+        Get the ID of the dictionary a payload was compressed with
+
+        :param payload: The compressed payload
+        :return: The dictionary ID
+
+        """
+
+        return PAYLOAD_HEADER.unpack_from(payload)[0]
+
+    @classmethod
+    def _shared_content(cls, samples: Sequence[bytes], dictionary_size: int) -> bytes:
+        """
+        Build a raw-content dictionary from the runs of bytes that recur across samples
+
+        :param samples: The sample payloads
+        :param dictionary_size: The maximum dictionary size
+        :return: The dictionary
+
+        """
+
+        gram: int = ZLIB_TRAINING_GRAM
+        per_sample: int = max(ZLIB_TRAINING_BYTES // max(len(samples), 1), gram)
+        samples = [sample[:per_sample] for sample in samples]
+
+        # How many samples each substring appears in
+        spread: Counter = Counter()
+
+        for sample in samples:
+            spread.update({sample[pos:pos + gram] for pos in range(len(sample) - gram + 1)})
+
+        # Cut each sample into the maximal runs covered by shared substrings, scored by how widely they are shared
+        scores: Counter = Counter()
+
+        for sample in samples:
+            start: Optional[int] = None
+            run_score: int = 0
+
+            for pos in range(len(sample) - gram + 1):
+                count: int = spread[sample[pos:pos + gram]]
+
+                if count > 1:
+                    if start is None:
+                        start, run_score = pos, 0
+                    run_score += count
+                    continue
+
+                if start is not None:
+                    scores[sample[start:pos + gram - 1]] = max(scores[sample[start:pos + gram - 1]], run_score)
+                    start = None
+
+            if start is not None:
+                scores[sample[start:]] = max(scores[sample[start:]], run_score)
+
+        # Pack the best runs, skipping ones whose substrings are all covered. The most valuable go last, nearest the data.
+        chosen: List[bytes] = []
+        covered: Set[bytes] = set()
+        size: int = 0
+
+        for run, _ in sorted(scores.items(), key=cls._run_rank):
+            if size + len(run) > dictionary_size:
+                continue
+
+            grams: Set[bytes] = {run[pos:pos + gram] for pos in range(len(run) - gram + 1)}
+
+            if grams <= covered:
+                continue
+
+            chosen.append(run)
+            covered |= grams
+            size += len(run)
+
+        return b"".join(reversed(chosen))
+
+    @classmethod
+    def _run_rank(cls, item: Tuple[bytes, int]) -> Tuple[int, int]:
+        """
+        Sort key for candidate runs: most shared content first
+
+        :param item: The run & its score
+        :return: The sort key
+
+        """
+
+        run, score = item
+        return -score, -len(run)
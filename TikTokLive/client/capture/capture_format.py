@@ -0,0 +1,125 @@
+import enum
+import os
+import struct
+from dataclasses import dataclass
+from typing import Union
+
+from TikTokLive.client.errors import TikTokLiveError
+from TikTokLive.proto.proto_wire import WireBuffer
+
+"""
+Capture files are append-only. After the file header, each record is laid out as:
+
+    <u32 payload length> <u8 record kind> <f64 receive time (unix seconds)> <payload>
+
+Since version 2, a record's payload may be compressed with a DictionaryCodec, marked by COMPRESSED_FLAG on its kind.
+The codec is stored in a DICTIONARY record ahead of the first record that uses it.
+
+The sidecar index ("<capture>.idx") holds one fixed-size entry per record, in the same order.
+
+"""
+
+"""Identifies a capture file & its format version"""
+CAPTURE_MAGIC: bytes = b"TTLCAP"
+CAPTURE_VERSION: int = 2
+
+"""The header at the start of capture & index files"""
+FILE_HEADER: struct.Struct = struct.Struct("<6sH")
+
+"""The header in front of each record's payload"""
+RECORD_HEADER: struct.Struct = struct.Struct("<IBd")
+
+"""An index entry: record offset, receive time, first & last msg_id, message count"""
+INDEX_ENTRY: struct.Struct = struct.Struct("<QdqqI")
+
+"""Set on the kind of a record whose payload is dictionary-compressed"""
+COMPRESSED_FLAG: int = 0x80
+
+"""The extension of the sidecar index"""
+INDEX_SUFFIX: str = ".idx"
+
+
+class CaptureFormatError(TikTokLiveError):
+    """
+    Thrown when a capture or index file is not in a format this version can read
+
+    """
+
+
+class CaptureRecordKind(enum.IntEnum):
+    """
+    What a record's payload holds
+
+    """
+
+    # A raw WebcastPushFrame, exactly as received on the WebSocket
+    PUSH_FRAME = 1
+
+    # A ProtoMessageFetchResult, i.e. the initial fetch from the sign server
+    FETCH_RESULT = 2
+
+    # A serialized DictionaryCodec, used by the compressed records after it
+    DICTIONARY = 3
+
+
+@dataclass(frozen=True)
+class CaptureRecord:
+    """
+    A record read back from a capture. Records from a CaptureReader hold a memoryview into the mapped file.
+
+    """
+
+    kind: CaptureRecordKind
+    received_at: float
+    payload: WireBuffer
+
+
+@dataclass(frozen=True)
+class CaptureIndexEntry:
+    """
+    Where a record is & what it holds
+
+    """
+
+    offset: int
+    received_at: float
+    first_msg_id: int
+    last_msg_id: int
+    message_count: int
+
+
+def index_path(path: Union[str, os.PathLike]) -> str:
+    """
+    Get the path of a capture's sidecar index
+
+    :param path: The capture path
+    :return: The index path
+
+    """
+
+    return os.fspath(path) + INDEX_SUFFIX
+
+
+def check_file_header(header: bytes, path: Union[str, os.PathLike]) -> int:
+    """
+    Validate the header of a capture or index file
+
+    :param header: The first FILE_HEADER.size bytes of the file
+    :param path: The file path, for the error message
+    :return: The format version
+    :raises CaptureFormatError: If the header is not a supported capture header
+
+    """
+
+    if len(header) < FILE_HEADER.size:
+        raise CaptureFormatError(f"'{path}' is too short to be a capture file.")
+
+    magic, version = FILE_HEADER.unpack_from(header)
+
+    if magic != CAPTURE_MAGIC:
+        raise CaptureFormatError(f"'{path}' is not a capture file.")
+
+    if not 1 <= version <= CAPTURE_VERSION:
+        raise CaptureFormatError(f"'{path}' is capture version {version}, but only up to version {CAPTURE_VERSION} is supported.")
+
+    return version
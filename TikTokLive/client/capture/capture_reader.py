@@ -0,0 +1,503 @@
+import bisect
+import gzip
+import itertools
+import mmap
+import os
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, Union, BinaryIO, Optional, Iterable, FrozenSet, Type, Sequence, Tuple, List, Dict
+
+from TikTokLive.client.capture.capture_codec import DictionaryCodec
+from TikTokLive.client.capture.capture_format import FILE_HEADER, RECORD_HEADER, INDEX_ENTRY, COMPRESSED_FLAG, \
+    CaptureRecord, CaptureRecordKind, CaptureIndexEntry, CaptureFormatError, check_file_header, index_path
+from TikTokLive.events.proto_events import EVENT_MAPPINGS, ProtoEvent
+from TikTokLive.proto.custom_extras import WebcastPushFrame
+from TikTokLive.proto.proto_forward import scan_raw_messages
+from TikTokLive.proto.proto_wire import WireBuffer, iter_fields
+
+# noinspection PyProtectedMember
+_PUSH_FRAME_FIELDS = WebcastPushFrame._betterproto.meta_by_field_name
+
+"""Field numbers read straight from the wire when scanning captured frames"""
+PUSH_FRAME_HEADERS: int = _PUSH_FRAME_FIELDS["headers"].number
+PUSH_FRAME_PAYLOAD_TYPE: int = _PUSH_FRAME_FIELDS["payload_type"].number
+PUSH_FRAME_PAYLOAD: int = _PUSH_FRAME_FIELDS["payload"].number
+
+
+def read_capture(path: Union[str, os.PathLike]) -> Iterator[CaptureRecord]:
+    """
+    Read the records of a capture in order. A record cut short at the end of the file
+    (e.g. by a crash mid-write) ends the iteration. Compressed records are decompressed,
+    and the dictionaries they need are read along the way.
+
+    :param path: The capture path
+    :return: The records
+    :raises CaptureFormatError: If the file is not a capture file
+
+    """
+
+    file: BinaryIO
+    codecs: Dict[int, DictionaryCodec] = {}
+
+    with open(path, "rb") as file:
+        check_file_header(file.read(FILE_HEADER.size), path)
+
+        while True:
+            header: bytes = file.read(RECORD_HEADER.size)
+
+            if len(header) < RECORD_HEADER.size:
+                return
+
+            length, kind, received_at = RECORD_HEADER.unpack(header)
+            payload: bytes = file.read(length)
+
+            if len(payload) < length:
+                return
+
+            if kind == CaptureRecordKind.DICTIONARY:
+                codec: DictionaryCodec = DictionaryCodec.from_bytes(payload)
+                codecs[codec.dictionary_id] = codec
+                continue
+
+            if kind & COMPRESSED_FLAG:
+                codec: Optional[DictionaryCodec] = codecs.get(DictionaryCodec.payload_dictionary_id(payload))
+
+                if codec is None:
+                    raise CaptureFormatError(f"'{path}' has a compressed record without its dictionary.")
+
+                kind, payload = kind & ~COMPRESSED_FLAG, codec.decompress(payload)
+
+            yield CaptureRecord(kind=CaptureRecordKind(kind), received_at=received_at, payload=payload)
+
+
+@dataclass(frozen=True)
+class CapturedMessage:
+    """
+    One Webcast message from a capture, left undecoded until `decode` is called
+
+    """
+
+    method: str
+    msg_id: int
+    payload: WireBuffer
+    received_at: float
+    record: int
+
+    def decode(self) -> Optional[ProtoEvent]:
+        """
+        Decode the message into its proto event
+
+        :return: The event, or None if the method has no event type
+
+        """
+
+        event_type: Optional[Type[ProtoEvent]] = EVENT_MAPPINGS.get(self.method)
+
+        if event_type is None:
+            return None
+
+        return event_type().parse(self.payload)
+
+
+class _IndexColumn(Sequence):
+    """
+    One field of the index entries, readable by position so the index can be bisected in place
+
+    """
+
+    def __init__(self, index: mmap.mmap, length: int, field: int):
+        self._index: mmap.mmap = index
+        self._length: int = length
+        self._field: int = field
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position: int) -> Union[int, float]:
+        return INDEX_ENTRY.unpack_from(self._index, FILE_HEADER.size + position * INDEX_ENTRY.size)[self._field]
+
+
+class CaptureReader:
+    """
+    Random access to a capture & its index through memory maps.
+
+    Seeking by receive time or msg_id bisects the index, records are memoryview slices of the mapped file,
+    and frames are only decompressed & scanned when their messages are asked for.
+
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        """
+        Map a capture & its index
+
+        :param path: The capture path. The index must sit next to it, with an ".idx" suffix.
+        :raises CaptureFormatError: If either file is not a capture file
+
+        """
+
+        self._path: str = os.fspath(path)
+        self._data: mmap.mmap = self._map(self._path)
+        self._index: mmap.mmap = self._map(index_path(self._path))
+        self._view: memoryview = memoryview(self._data)
+
+        # Drop index entries for records that never fully reached the disk
+        length: int = (len(self._index) - FILE_HEADER.size) // INDEX_ENTRY.size
+
+        while length and self._record_end(length - 1) > len(self._data):
+            length -= 1
+
+        self._length: int = length
+        self._times: _IndexColumn = _IndexColumn(self._index, length, 1)
+
+        # Built on the first msg_id seek
+        self._msg_id_starts: Optional[array] = None
+        self._msg_id_records: Optional[array] = None
+        self._msg_id_reach: Optional[array] = None
+
+        # Dictionaries are loaded the first time a record needs one
+        self._codecs: Dict[int, DictionaryCodec] = {}
+        self._codec_scan: int = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __enter__(self) -> "CaptureReader":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """The capture path"""
+
+        return self._path
+
+    @property
+    def start_time(self) -> Optional[float]:
+        """The receive time of the first record"""
+
+        return self._times[0] if self._length else None
+
+    @property
+    def end_time(self) -> Optional[float]:
+        """The receive time of the last record"""
+
+        return self._times[self._length - 1] if self._length else None
+
+    def close(self) -> None:
+        """
+        Unmap the files. Slices handed out by the reader must be released first, or the maps stay open until they are.
+
+        :return: None
+
+        """
+
+        self._view.release()
+
+        for mapped in (self._data, self._index):
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+
+    def entry(self, position: int) -> CaptureIndexEntry:
+        """
+        Get the index entry of a record
+
+        :param position: The record position
+        :return: The index entry
+
+        """
+
+        if not 0 <= position < self._length:
+            raise IndexError("Capture record out of range")
+
+        return CaptureIndexEntry(*INDEX_ENTRY.unpack_from(self._index, FILE_HEADER.size + position * INDEX_ENTRY.size))
+
+    def record(self, position: int) -> CaptureRecord:
+        """
+        Get a record, with its payload as a memoryview of the mapped file (no copy).
+        Compressed records are decompressed into new bytes.
+
+        :param position: The record position
+        :return: The record
+
+        """
+
+        offset: int = self.entry(position).offset
+        length, kind, received_at = RECORD_HEADER.unpack_from(self._data, offset)
+        start: int = offset + RECORD_HEADER.size
+        payload: WireBuffer = self._view[start:start + length]
+
+        if kind & COMPRESSED_FLAG:
+            kind, payload = kind & ~COMPRESSED_FLAG, self._codec(DictionaryCodec.payload_dictionary_id(payload)).decompress(payload)
+
+        return CaptureRecord(
+            kind=CaptureRecordKind(kind),
+            received_at=received_at,
+            payload=payload
+        )
+
+    def seek_time(self, received_at: float) -> int:
+        """
+        Find the first record received at or after a time, in O(log n)
+
+        :param received_at: The time (unix seconds)
+        :return: The record position (len(reader) if every record is older)
+
+        """
+
+        return bisect.bisect_left(self._times, received_at)
+
+    def seek_msg_id(self, msg_id: int) -> Optional[int]:
+        """
+        Find the record holding a msg_id, in O(log n) plus the records whose msg_id ranges overlap it.
+        The first call sorts the records by msg_id, which takes one pass over the index.
+
+        When several records' ranges hold the msg_id (e.g. frames replayed after a reconnect, or ids out of order),
+        their messages are scanned for it, & the first record received that carries it is returned.
+
+        :param msg_id: The msg_id
+        :return: The record position, or None if no record's range holds it
+
+        """
+
+        if self._msg_id_starts is None:
+            self._build_msg_id_index()
+
+        candidates: List[int] = []
+        candidate: int = bisect.bisect_right(self._msg_id_starts, msg_id) - 1
+
+        # Walk back over every range starting before the msg_id, until none of the earlier ones reach it
+        while candidate >= 0 and self._msg_id_reach[candidate] >= msg_id:
+            position: int = self._msg_id_records[candidate]
+
+            if self.entry(position).last_msg_id >= msg_id:
+                candidates.append(position)
+
+            candidate -= 1
+
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+
+        candidates.sort()
+        return next((position for position in candidates if self._holds_msg_id(position, msg_id)), candidates[0])
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[CaptureRecord]:
+        """
+        Iterate over records, with their payloads as memoryviews of the mapped file (no copies)
+
+        :param start: The first record position
+        :param stop: The position to stop before (defaults to the end)
+        :return: The records
+
+        """
+
+        for position in range(start, self._length if stop is None else min(stop, self._length)):
+            yield self.record(position)
+
+    def messages(
+            self,
+            start_time: Optional[float] = None,
+            end_time: Optional[float] = None,
+            methods: Optional[Iterable[str]] = None
+    ) -> Iterator[CapturedMessage]:
+        """
+        Iterate over the Webcast messages received in a time window. Only the frames in the window are
+        decompressed, and only the wanted messages are sliced out of them. Nothing is decoded until asked.
+
+        :param start_time: The start of the window (unix seconds, inclusive). Defaults to the start of the capture.
+        :param end_time: The end of the window (unix seconds, exclusive). Defaults to the end of the capture.
+        :param methods: The Webcast methods to keep (e.g. {"WebcastGiftMessage"}). Defaults to all.
+        :return: The messages, in receive order
+
+        """
+
+        methods: Optional[FrozenSet[str]] = frozenset(methods) if methods is not None else None
+        start: int = 0 if start_time is None else self.seek_time(start_time)
+        stop: int = self._length if end_time is None else self.seek_time(end_time)
+
+        for position in range(start, stop):
+            # Frames without messages (e.g. heartbeat acks) & dictionaries can be skipped on the index alone
+            if self.entry(position).message_count == 0 and self._record_kind(position) != CaptureRecordKind.FETCH_RESULT:
+                continue
+
+            record: CaptureRecord = self.record(position)
+            fetch_result: Optional[WireBuffer] = self._fetch_result(record)
+
+            if fetch_result is None:
+                continue
+
+            for message in scan_raw_messages(fetch_result, methods=methods):
+                yield CapturedMessage(
+                    method=message.method,
+                    msg_id=message.msg_id,
+                    payload=message.payload,
+                    received_at=record.received_at,
+                    record=position
+                )
+
+    def events(
+            self,
+            start_time: Optional[float] = None,
+            end_time: Optional[float] = None,
+            event_types: Optional[Iterable[Type[ProtoEvent]]] = None
+    ) -> Iterator[ProtoEvent]:
+        """
+        Decode the proto events received in a time window. Only the requested event types are decoded.
+
+        :param start_time: The start of the window (unix seconds, inclusive)
+        :param end_time: The end of the window (unix seconds, exclusive)
+        :param event_types: The event types to decode (e.g. [GiftEvent]). Defaults to all.
+        :return: The events, in receive order
+
+        """
+
+        methods: Optional[List[str]] = None
+
+        if event_types is not None:
+            event_types = set(event_types)
+            methods = [method for method, event_type in EVENT_MAPPINGS.items() if event_type in event_types]
+
+        for message in self.messages(start_time=start_time, end_time=end_time, methods=methods):
+            event: Optional[ProtoEvent] = message.decode()
+
+            if event is not None:
+                yield event
+
+    def _record_end(self, position: int) -> int:
+        """
+        Get the offset just past a record, from its header
+
+        :param position: The record position
+        :return: The end offset
+
+        """
+
+        offset: int = INDEX_ENTRY.unpack_from(self._index, FILE_HEADER.size + position * INDEX_ENTRY.size)[0]
+
+        if offset + RECORD_HEADER.size > len(self._data):
+            return offset + RECORD_HEADER.size
+
+        return offset + RECORD_HEADER.size + RECORD_HEADER.unpack_from(self._data, offset)[0]
+
+    def _record_kind(self, position: int) -> int:
+        """
+        Get the kind of a record, from its header
+
+        :param position: The record position
+        :return: The record kind, without the compression flag
+
+        """
+
+        return RECORD_HEADER.unpack_from(self._data, self.entry(position).offset)[1] & ~COMPRESSED_FLAG
+
+    def _codec(self, dictionary_id: int) -> DictionaryCodec:
+        """
+        Get the codec of a dictionary, reading ahead through the capture's dictionary records until it is found
+
+        :param dictionary_id: The dictionary ID
+        :return: The codec
+        :raises CaptureFormatError: If the capture has no such dictionary
+
+        """
+
+        while dictionary_id not in self._codecs and self._codec_scan < self._length:
+            position: int = self._codec_scan
+            self._codec_scan += 1
+
+            if self._record_kind(position) == CaptureRecordKind.DICTIONARY:
+                codec: DictionaryCodec = DictionaryCodec.from_bytes(self.record(position).payload)
+                self._codecs[codec.dictionary_id] = codec
+
+        if dictionary_id not in self._codecs:
+            raise CaptureFormatError(f"'{self._path}' has a compressed record without its dictionary.")
+
+        return self._codecs[dictionary_id]
+
+    def _build_msg_id_index(self) -> None:
+        """
+        Sort the records that carry messages by their first msg_id
+
+        :return: None
+
+        """
+
+        ranges: List[Tuple[int, int]] = sorted(
+            (entry.first_msg_id, position)
+            for position, entry in ((position, self.entry(position)) for position in range(self._length))
+            if entry.message_count
+        )
+
+        self._msg_id_starts = array("q", (first_msg_id for first_msg_id, _ in ranges))
+        self._msg_id_records = array("Q", (position for _, position in ranges))
+
+        # The furthest any range up to each one reaches, so a seek knows when to stop walking back
+        self._msg_id_reach = array("q", itertools.accumulate(
+            (self.entry(position).last_msg_id for _, position in ranges),
+            max
+        ))
+
+    def _holds_msg_id(self, position: int, msg_id: int) -> bool:
+        """
+        Check whether a record carries a message with a msg_id, by scanning its messages
+
+        :param position: The record position
+        :param msg_id: The msg_id
+        :return: Whether it does
+
+        """
+
+        fetch_result: Optional[WireBuffer] = self._fetch_result(self.record(position))
+        return fetch_result is not None and any(message.msg_id == msg_id for message in scan_raw_messages(fetch_result))
+
+    @classmethod
+    def _fetch_result(cls, record: CaptureRecord) -> Optional[WireBuffer]:
+        """
+        Get the serialized ProtoMessageFetchResult out of a record, decompressing it if needed
+
+        :param record: The record
+        :return: The serialized fetch result, or None if the frame does not carry messages
+
+        """
+
+        if record.kind == CaptureRecordKind.FETCH_RESULT:
+            return record.payload
+
+        if record.kind != CaptureRecordKind.PUSH_FRAME:
+            return None
+
+        payload_type: Optional[memoryview] = None
+        compress_type: Optional[bytes] = None
+        payload: WireBuffer = b""
+
+        for number, _, value in iter_fields(record.payload):
+            if number == PUSH_FRAME_PAYLOAD:
+                payload = value
+            elif number == PUSH_FRAME_PAYLOAD_TYPE:
+                payload_type = value
+            elif number == PUSH_FRAME_HEADERS:
+                entry: dict = {key: item for key, _, item in iter_fields(value)}
+                if bytes(entry.get(1, b"")) == b"compress_type":
+                    compress_type = bytes(entry.get(2, b""))
+
+        if payload_type is None or payload_type != b"msg":
+            return None
+
+        return gzip.decompress(payload) if compress_type == b"gzip" else payload
+
+    @classmethod
+    def _map(cls, path: str) -> mmap.mmap:
+        """
+        Map a capture or index file read-only
+
+        :param path: The file path
+        :return: The map
+        :raises CaptureFormatError: If the file is not a capture file
+
+        """
+
+        with open(path, "rb") as file:
+            check_file_header(file.read(FILE_HEADER.size), path)
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,439 @@
+import asyncio
+import gzip
+import os
+import time
+from logging import Logger
+from typing import Optional, List, Sequence, Union, Tuple, BinaryIO
+
+from TikTokLive.client.capture.capture_codec import DictionaryCodec
+from TikTokLive.client.capture.capture_format import FILE_HEADER, RECORD_HEADER, INDEX_ENTRY, CAPTURE_MAGIC, \
+    CAPTURE_VERSION, COMPRESSED_FLAG, CaptureRecordKind, CaptureFormatError, index_path, check_file_header
+from TikTokLive.client.logger import TikTokLiveLogHandler
+from TikTokLive.proto.custom_extras import WebcastPushFrame
+from TikTokLive.proto.proto_wire import WireBuffer
+
+"""A buffered record: kind, payload, receive time, first & last msg_id, message count"""
+_PendingRecord = Tuple[int, WireBuffer, float, int, int, int]
+
+
+class CaptureWriter:
+    """
+    Append raw Webcast frames to a capture file, with a sidecar index of offsets, receive times & msg_ids.
+
+    Writes are buffered in memory & handed to a worker thread in batches, where they are written & fsynced,
+    so the receive loop never waits on the disk. Pass the writer to `TikTokLiveClient.start(capture=...)`.
+    If a write fails (e.g. the disk is full), the capture stops at its last good record & the connection carries on.
+
+    With compression on, the first records of the session are kept as samples to train a DictionaryCodec on.
+    Every record after that is compressed with it, one by one, so each stays readable on its own. Push frames are
+    stored with their gzipped payload inflated, which the dictionary compresses far better.
+
+    """
+
+    def __init__(
+            self,
+            path: Union[str, os.PathLike],
+            batch_size: int = 256,
+            flush_interval: float = 1.0,
+            fsync: bool = True,
+            compression: bool = False,
+            codec: Optional[DictionaryCodec] = None,
+            train_records: int = 64
+    ):
+        """
+        Open a capture file for appending, creating it if it does not exist
+
+        :param path: The capture path. The index is written next to it, with an ".idx" suffix.
+        :param batch_size: Flush once this many records are buffered
+        :param flush_interval: Flush once the oldest buffered record is this many seconds old, even if no more arrive
+        :param fsync: Whether to fsync each batch, so a crash loses at most the buffered records
+        :param compression: Whether to compress records with a dictionary trained on the session's first records
+        :param codec: A pre-trained codec to compress records with, instead of training one (implies compression)
+        :param train_records: How many records to train the dictionary on
+        :raises CaptureFormatError: If the file exists & is not a capture file (or is too old to hold compressed records)
+
+        """
+
+        self._path: str = os.fspath(path)
+        self._batch_size: int = batch_size
+        self._flush_interval: float = flush_interval
+        self._fsync: bool = fsync
+        self._compression: bool = compression or codec is not None
+        self._codec: Optional[DictionaryCodec] = codec
+        self._codec_written: bool = False
+        self._train_records: int = train_records
+        self._samples: List[bytes] = []
+
+        self._file, version = self._open(self._path)
+        self._index_file, _ = self._open(index_path(self._path))
+        self._offset: int = self._file.tell()
+        self._index_offset: int = self._index_file.tell()
+
+        if self._compression and version < CAPTURE_VERSION:
+            self._file.close()
+            self._index_file.close()
+            raise CaptureFormatError(f"'{self._path}' is capture version {version}, which cannot hold compressed records.")
+
+        self._records: List[_PendingRecord] = []
+        self._last_flush: float = time.monotonic()
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._error: Optional[Exception] = None
+        self._logger: Logger = TikTokLiveLogHandler.get_logger()
+
+        self.records_written: int = 0
+        self.bytes_written: int = 0
+
+    @property
+    def path(self) -> str:
+        """The capture path"""
+
+        return self._path
+
+    @property
+    def closed(self) -> bool:
+        """Whether the writer has been closed"""
+
+        return self._file.closed
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """The error that stopped the capture, if writing to the disk failed"""
+
+        return self._error
+
+    def write(
+            self,
+            kind: CaptureRecordKind,
+            payload: WireBuffer,
+            msg_ids: Sequence[int] = (),
+            received_at: Optional[float] = None
+    ) -> None:
+        """
+        Buffer a record. This never blocks on the disk, & never raises for a failed disk write: the capture stops
+        instead (see `error`), so the connection it is recording carries on.
+
+        :param kind: What the payload holds
+        :param payload: The raw bytes, as received
+        :param msg_ids: The msg_ids of the messages in the payload, for the index
+        :param received_at: The receive time (unix seconds). Defaults to now.
+        :return: None
+
+        """
+
+        if self._file.closed:
+            raise ValueError("Cannot write to a closed capture.")
+
+        if self._error is not None:
+            return
+
+        received_at = time.time() if received_at is None else received_at
+
+        self._records.append(
+            (
+                kind,
+                payload,
+                received_at,
+                min(msg_ids) if msg_ids else 0,
+                max(msg_ids) if msg_ids else 0,
+                len(msg_ids)
+            )
+        )
+
+        if len(self._records) >= self._batch_size or time.monotonic() - self._last_flush >= self._flush_interval:
+            self._schedule_flush()
+        elif self._flush_timer is None:
+            self._start_flush_timer()
+
+    async def flush(self) -> None:
+        """
+        Write & fsync the buffered records in a worker thread
+
+        :return: None
+
+        """
+
+        await self._flush()
+
+    async def close(self) -> None:
+        """
+        Flush the buffered records & close the files
+
+        :return: None
+        :raises: The error that stopped the capture, if writing to the disk failed
+
+        """
+
+        if self._file.closed:
+            return
+
+        try:
+            await self._flush()
+        finally:
+            self._file.close()
+            self._index_file.close()
+
+        if self._error is not None:
+            raise self._error
+
+    async def __aenter__(self) -> "CaptureWriter":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def _flush(self) -> None:
+        """
+        Write & fsync the buffered records in a worker thread
+
+        :return: None
+
+        """
+
+        async with self._flush_lock:
+            records: List[_PendingRecord] = self._take_batch()
+
+            if records and self._error is None:
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, self._write_batch, records)
+                except Exception as ex:
+                    self._stop(ex)
+
+        # Records buffered while writing wait for their own timer
+        if self._records and self._flush_timer is None and not self._file.closed:
+            self._start_flush_timer()
+
+    def _schedule_flush(self) -> None:
+        """
+        Start a background flush, unless one is already running
+
+        :return: None
+
+        """
+
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+
+        try:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside an event loop there is no receive loop to protect, so write inline
+            try:
+                self._write_batch(self._take_batch())
+            except Exception as ex:
+                self._stop(ex)
+            return
+
+        self._flush_task = loop.create_task(self._flush())
+
+    def _start_flush_timer(self) -> None:
+        """
+        Flush once the buffered records are due, even if no more arrive to trigger it
+
+        :return: None
+
+        """
+
+        try:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._flush_timer = loop.call_later(self._flush_interval, self._on_flush_timer)
+
+    def _on_flush_timer(self) -> None:
+        """
+        Flush the records the timer was started for
+
+        :return: None
+
+        """
+
+        self._flush_timer = None
+
+        if self._records and not self._file.closed:
+            self._schedule_flush()
+
+    def _stop(self, error: Exception) -> None:
+        """
+        Stop the capture after a failed disk write. Buffered & later records are dropped, & `close` raises the error.
+
+        :param error: The error
+        :return: None
+
+        """
+
+        self._error = error
+        self._records = []
+        self._logger.error("Failed to write capture records to the disk. The capture has stopped.", exc_info=error)
+
+    def _take_batch(self) -> List[_PendingRecord]:
+        """
+        Swap out the buffered records
+
+        :return: The records
+
+        """
+
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        records: List[_PendingRecord] = self._records
+        self._records = []
+        self._last_flush = time.monotonic()
+        return records
+
+    def _write_batch(self, records: List[_PendingRecord]) -> None:
+        """
+        Encode & write a batch. The records are made durable before the index entries that point at them.
+
+        :param records: The records
+        :return: None
+
+        """
+
+        chunks: List[WireBuffer] = []
+        entries: List[bytes] = []
+        offset: int = self._offset
+        codec_written: bool = self._codec_written
+
+        for kind, payload, received_at, first_msg_id, last_msg_id, message_count in records:
+            encoded: List[Tuple[int, WireBuffer, float]] = self._encode(kind, payload, received_at)
+
+            for position, (encoded_kind, encoded_payload, encoded_at) in enumerate(encoded):
+                # Only the record itself (always last) is indexed by its messages
+                is_record: bool = position == len(encoded) - 1
+
+                chunks.append(RECORD_HEADER.pack(len(encoded_payload), encoded_kind, encoded_at))
+                chunks.append(encoded_payload)
+                entries.append(
+                    INDEX_ENTRY.pack(
+                        offset,
+                        encoded_at,
+                        first_msg_id if is_record else 0,
+                        last_msg_id if is_record else 0,
+                        message_count if is_record else 0
+                    )
+                )
+                offset += RECORD_HEADER.size + len(encoded_payload)
+
+        data: bytes = b"".join(chunks)
+        index: bytes = b"".join(entries)
+
+        try:
+            for file, chunk in ((self._file, data), (self._index_file, index)):
+                self._write_all(file, chunk)
+
+                if self._fsync:
+                    os.fsync(file.fileno())
+        except Exception:
+            # Cut off whatever part of the batch made it, so the files end on the last good record
+            self._file.truncate(self._offset)
+            self._index_file.truncate(self._index_offset)
+            self._codec_written = codec_written
+            raise
+
+        self._offset = offset
+        self._index_offset += len(index)
+        self.records_written += len(entries)
+        self.bytes_written += len(data)
+
+    @classmethod
+    def _write_all(cls, file: BinaryIO, data: bytes) -> None:
+        """
+        Write all of the data to an unbuffered file, which may take several writes
+
+        :param file: The file
+        :param data: The data
+        :return: None
+
+        """
+
+        view: memoryview = memoryview(data)
+
+        while view:
+            view = view[file.write(view):]
+
+    def _encode(self, kind: int, payload: WireBuffer, received_at: float) -> List[Tuple[int, WireBuffer, float]]:
+        """
+        Encode a record for the disk, compressing it if enabled. Runs in the worker thread.
+
+        :param kind: The record kind
+        :param payload: The raw payload
+        :param received_at: The receive time
+        :return: The records to write: the record itself, preceded by the dictionary when it is first used
+
+        """
+
+        if not self._compression:
+            return [(kind, payload, received_at)]
+
+        raw: bytes = self._inflate_push_frame(payload) if kind == CaptureRecordKind.PUSH_FRAME else bytes(payload)
+
+        # Records written while sampling keep their original (gzipped) form
+        if self._codec is None:
+            self._samples.append(raw)
+
+            if len(self._samples) < self._train_records:
+                return [(kind, payload, received_at)]
+
+            self._codec = DictionaryCodec.train(self._samples)
+            self._samples = []
+
+        encoded: List[Tuple[int, WireBuffer, float]] = []
+
+        if not self._codec_written:
+            encoded.append((CaptureRecordKind.DICTIONARY, self._codec.to_bytes(), received_at))
+            self._codec_written = True
+
+        encoded.append((kind | COMPRESSED_FLAG, self._codec.compress(raw), received_at))
+        return encoded
+
+    @classmethod
+    def _inflate_push_frame(cls, payload: WireBuffer) -> bytes:
+        """
+        Re-serialize a gzipped push frame with its payload inflated. It decodes exactly as the original does.
+
+        :param payload: The raw push frame
+        :return: The push frame, uncompressed
+
+        """
+
+        push_frame: WebcastPushFrame = WebcastPushFrame().parse(payload)
+
+        if push_frame.headers.get("compress_type") != "gzip":
+            return bytes(payload)
+
+        push_frame.payload = gzip.decompress(push_frame.payload)
+        push_frame.headers = {key: value for key, value in push_frame.headers.items() if key != "compress_type"}
+        return bytes(push_frame)
+
+    @classmethod
+    def _open(cls, path: str) -> Tuple[BinaryIO, int]:
+        """
+        Open a capture or index file for appending, writing the file header if it is new
+
+        :param path: The file path
+        :return: The file, positioned at its end, & its format version
+        :raises CaptureFormatError: If the file exists & has a different header
+
+        """
+
+        # Unbuffered, so a failed write leaves nothing behind to be written later
+        file: BinaryIO = open(path, "a+b", buffering=0)
+
+        try:
+            if file.seek(0, os.SEEK_END) == 0:
+                cls._write_all(file, FILE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION))
+                version: int = CAPTURE_VERSION
+            else:
+                file.seek(0)
+                version: int = check_file_header(file.read(FILE_HEADER.size), path)
+                file.seek(0, os.SEEK_END)
+        except Exception:
+            file.close()
+            raise
+
+        return file, version
@@ -4,25 +4,77 @@ import logging
 import traceback
 from asyncio import AbstractEventLoop, Task, CancelledError
 from logging import Logger
-from typing import Optional, Type, Dict, Any, Union, Callable, List, Coroutine, AsyncIterator
+from typing import Optional, Type, Dict, Any, Union, Callable, List, Coroutine, AsyncIterator, Iterable, Tuple, \
+    FrozenSet
 
 import httpx
+from betterproto import Message
 from pyee.asyncio import AsyncIOEventEmitter
 from pyee.base import Handler
 
+from TikTokLive.client.capture import CaptureWriter
 from TikTokLive.client.errors import AlreadyConnectedError, UserOfflineError, UserNotFoundError
+from TikTokLive.client.gift_catalogue import GiftCatalogue
 from TikTokLive.client.logger import TikTokLiveLogHandler, LogLevel
+from TikTokLive.client.room_resolver import RoomIdResolver
+from TikTokLive.client.sinks import EventSink
 from TikTokLive.client.web.routes.fetch_user_unique_id import FailedResolveUserId
+from TikTokLive.client.web.routes.fetch_is_live import MissingRoomIdInResponse
 from TikTokLive.client.web.web_client import TikTokWebClient
+from TikTokLive.client.web.web_identity import IdentityCache
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
 from TikTokLive.client.web.web_settings import WebDefaults
 from TikTokLive.client.ws.ws_client import WebcastWSClient
 from TikTokLive.client.ws.ws_connect import WebcastProxy
+from TikTokLive.client.ws.ws_replay import WebcastReplayClient, ReplaySource
+from TikTokLive.client.ws.ws_utils import proves_live
 from TikTokLive.events import Event, EventHandler, ControlEvent
 from TikTokLive.events.custom_events import WebsocketResponseEvent, FollowEvent, ShareEvent, LiveEndEvent, \
     DisconnectEvent, LivePauseEvent, LiveUnpauseEvent, UnknownEvent, CustomEvent, ConnectEvent
-from TikTokLive.events.proto_events import EVENT_MAPPINGS, ProtoEvent
+from TikTokLive.events.proto_events import EVENT_MAPPINGS, ProtoEvent, CommentEvent, GiftEvent, LikeEvent, \
+    JoinEvent, RoomUserSeqEvent, SocialEvent
 from TikTokLive.proto import ProtoMessageFetchResult, ProtoMessageFetchResultBaseProtoMessage
+from TikTokLive.proto.custom_extras import WebcastPushFrame
 from TikTokLive.proto.custom_proto import ControlAction
+from TikTokLive.proto.proto_forward import RawMessage
+from TikTokLive.proto.proto_intern import MessageInterner
+from TikTokLive.proto.proto_projection import FieldProjection, ProjectionRecord
+from TikTokLive.proto.proto_utils import warm_proto_metadata
+
+"""The order in which message metadata is warmed on start. The busiest message types come first."""
+PROTO_WARM_ORDER: List[Type[Message]] = [
+    WebcastPushFrame,
+    ProtoMessageFetchResult,
+    WebsocketResponseEvent,
+    CommentEvent,
+    GiftEvent,
+    LikeEvent,
+    JoinEvent,
+    RoomUserSeqEvent,
+    SocialEvent,
+    FollowEvent,
+    ShareEvent,
+    ControlEvent,
+    *EVENT_MAPPINGS.values()
+]
+
+"""The Webcast method each proto event is parsed from"""
+EVENT_METHODS: Dict[Type[ProtoEvent], str] = {event_type: method for method, event_type in EVENT_MAPPINGS.items()}
+
+"""Projection names for event properties that alias a proto field"""
+PROJECTION_ALIASES: Dict[Type[ProtoEvent], Dict[str, str]] = {
+    CommentEvent: {"user": "user_info", "comment": "content"},
+    GiftEvent: {"user": "from_user", "gift": "m_gift"},
+}
+
+"""Event types that must always be parsed in full, since custom events are derived from them"""
+FULL_PARSE_EVENT_TYPES: Tuple[Type[ProtoEvent], ...] = (ControlEvent, SocialEvent)
+
+"""The messages still decoded when event decoding is off, since the connection relies on them (e.g. stream end)"""
+CONTROL_METHODS: FrozenSet[str] = frozenset({EVENT_METHODS[ControlEvent]})
+
+"""A function forwarded the raw messages of each fetch result"""
+RawForwarder = Callable[[List[RawMessage]], Optional[Coroutine[Any, Any, Any]]]
 
 
 class TikTokLiveClient(AsyncIOEventEmitter):
@@ -44,7 +96,23 @@ class TikTokLiveClient(AsyncIOEventEmitter):
             web_kwargs: Optional[dict] = None,
             ws_kwargs: Optional[dict] = None,
 
-            is_userid: Optional[bool] = False
+            is_userid: Optional[bool] = False,
+
+            # String interning
+            intern_fields: Optional[Iterable[str]] = None,
+            intern_pool_size: int = 8192,
+
+            # Shared connections
+            http_pool: Optional[TikTokHTTPPool] = None,
+
+            # Resolved user & room IDs
+            identity_cache: Optional[IdentityCache] = None,
+
+            # Shared gift list
+            gift_catalogue: Optional[GiftCatalogue] = None,
+
+            # Room ID lookups
+            room_id_resolver: Optional[RoomIdResolver] = None
     ):
         """
         Instantiate the TikTokLiveClient client
@@ -55,6 +123,17 @@ class TikTokLiveClient(AsyncIOEventEmitter):
         :param web_kwargs: Optional arguments used by the HTTP client
         :param ws_kwargs: Optional arguments used by the WebSocket client
         :param is_userid: Optional argument to resolve userid to unique_id
+        :param intern_fields: String fields (by name, on any message) whose repeated values share one object per room.
+                              Off (None) by default. To turn it on, pass `DEFAULT_INTERN_FIELDS` from
+                              `TikTokLive.proto.proto_intern`, or the names of the fields to intern.
+        :param intern_pool_size: The maximum number of distinct strings interned per room
+        :param http_pool: An optional pool of HTTP connections shared with other clients (see TikTokHTTPPool)
+        :param identity_cache: An optional cache of resolved user & room IDs, to skip scraping them on start.
+                               Use a SQLiteIdentityCache to keep them across restarts.
+        :param gift_catalogue: An optional gift list shared with other clients. It is used for `fetch_gift_info`,
+                               & fills in the diamond count, name & image of gift events that lack them.
+        :param room_id_resolver: How room IDs are looked up. By default, the live page HTML is hedged with the API.
+                                 Share one between clients to share its latency stats.
 
         """
 
@@ -67,6 +146,7 @@ class TikTokLiveClient(AsyncIOEventEmitter):
 
         self._web: TikTokWebClient = TikTokWebClient(
             web_proxy=web_proxy or (web_kwargs or {}).pop("web_proxy", None),
+            pool=http_pool,
             **(web_kwargs or {})
         )
 
@@ -80,6 +160,9 @@ class TikTokLiveClient(AsyncIOEventEmitter):
         # Overridable properties
         self.ignore_broken_payload: bool = False
 
+        # Set to False to only forward raw messages (see `forward`), without decoding events from them
+        self.decode_events: bool = True
+
         # Properties
         self._is_userid: bool = is_userid
         self._unique_id: str = self.parse_unique_id(unique_id)
@@ -87,6 +170,15 @@ class TikTokLiveClient(AsyncIOEventEmitter):
         self._room_info: Optional[Dict[str, Any]] = None
         self._gift_info: Optional[Dict[str, Any]] = None
         self._event_loop_task: Optional[Task] = None
+        self._projections: Dict[str, Dict[str, FieldProjection]] = {}
+        self._interner: Optional[MessageInterner] = (
+            MessageInterner(fields=intern_fields, max_size=intern_pool_size) if intern_fields else None
+        )
+        self._sinks: List[EventSink] = []
+        self._forwarders: List[RawForwarder] = []
+        self._identity_cache: Optional[IdentityCache] = identity_cache
+        self._gift_catalogue: Optional[GiftCatalogue] = gift_catalogue
+        self._room_id_resolver: RoomIdResolver = room_id_resolver or RoomIdResolver()
 
     @classmethod
     def parse_unique_id(cls, unique_id: str) -> str:
@@ -113,7 +205,10 @@ class TikTokLiveClient(AsyncIOEventEmitter):
             fetch_gift_info: bool = False,
             fetch_live_check: bool = True,
             room_id: Optional[int] = None,
-            preferred_agent_ids: Optional[list[str]] = None
+            preferred_agent_ids: Optional[list[str]] = None,
+            warm_proto_cache: bool = True,
+            capture: Optional[CaptureWriter] = None,
+            concurrent_start: bool = False
     ) -> Task:
         """
         Create a non-blocking connection to TikTok LIVE and return the task
@@ -126,6 +221,11 @@ class TikTokLiveClient(AsyncIOEventEmitter):
                         Useful when trying to scale, as scraping the HTML can result in TikTok blocks.
         :param compress_ws_events: Whether to compress the WebSocket events using gzip compression (you should probably have this on)
         :param preferred_agent_ids: The preferred agent IDs to use when connecting to the WebSocket
+        :param warm_proto_cache: Whether to build the protobuf class metadata in a background thread while connecting
+        :param capture: An optional writer to archive the raw frames to. It is flushed (not closed) on disconnect.
+        :param concurrent_start: Whether to make the requests before connecting all at once, rather than one by one.
+                                 The live check is not waited on if the first Webcast response proves the room live,
+                                 but an offline room then costs a sign server request, so it is off by default.
         :return: Task containing the heartbeat of the client
 
         """
@@ -133,48 +233,89 @@ class TikTokLiveClient(AsyncIOEventEmitter):
         if self._ws.connected:
             raise AlreadyConnectedError("You can only make one connection per client!")
 
-        self._unique_id = await self._resolve_user_id(self._unique_id)
-
-        # <Required> Fetch room ID
-        try:
-            self._room_id: int = int(room_id or await self._web.fetch_room_id_from_html(self._unique_id))
-        except Exception as base_ex:
+        # <Optional> Warm the protobuf metadata while we wait on the network, so the first frames parse quickly
+        warm_future: Optional[asyncio.Future] = (
+            self._asyncio_loop.run_in_executor(None, warm_proto_metadata, PROTO_WARM_ORDER)
+            if warm_proto_cache else None
+        )
 
-            if isinstance(base_ex, UserOfflineError) or isinstance(base_ex, UserNotFoundError):
-                raise base_ex
+        # <Optional> Fetch gift info while the room is resolved, as it doesn't depend on it
+        gift_task: Optional[Task] = (
+            self._asyncio_loop.create_task(self._fetch_gift_info())
+            if fetch_gift_info and concurrent_start else None
+        )
 
-            try:
-                self._logger.debug("Failed to parse room ID from HTML. Using API fallback.")
-                self._room_id: int = int(await self._web.fetch_room_id_from_api(self.unique_id))
-            except Exception as super_ex:
-                raise super_ex from base_ex
+        try:
+            self._unique_id = await self._resolve_user_id(self._unique_id)
 
-        # Gram Room ID
-        self._web.params["room_id"] = str(self._room_id) or None
+            # <Required> Fetch room ID, from the identity cache if it has one
+            cached_room_id: Optional[int] = (
+                self._identity_cache.get_room_id(self._unique_id)
+                if self._identity_cache is not None and not room_id else None
+            )
 
-        # <Optional> Fetch live status
-        if fetch_live_check and not await self._web.fetch_is_live(room_id=self._room_id):
-            raise UserOfflineError()
+            self._room_id: int = int(room_id or cached_room_id or await self._fetch_room_id())
 
-        # <Optional> Fetch room info
-        if fetch_room_info:
-            self._room_info = await self._web.fetch_room_info()
+            # Gram Room ID
+            self._web.params["room_id"] = str(self._room_id) or None
 
-        # <Optional> Fetch gift info
-        if fetch_gift_info:
-            self._gift_info = await self._web.fetch_gift_list()
+            # <Required> Fetch the first response, along with the live status & room info
+            fetch_kwargs: Dict[str, Any] = dict(
+                fetch_live_check=fetch_live_check,
+                fetch_room_info=fetch_room_info,
+                fetch_gift_info=fetch_gift_info and not concurrent_start,
+                preferred_agent_ids=preferred_agent_ids,
+                concurrent_start=concurrent_start
+            )
 
-        # <Required> Fetch the first response
-        initial_webcast_response: ProtoMessageFetchResult = await self._web.fetch_signed_websocket(
-            preferred_agent_ids=preferred_agent_ids
-        )
+            try:
+                initial_webcast_response: ProtoMessageFetchResult = await self._fetch_start_responses(**fetch_kwargs)
+
+                # Without a live check, a cached room ID is only trusted if its first response proves it live
+                if cached_room_id is not None and not fetch_live_check and not proves_live(initial_webcast_response):
+                    raise UserOfflineError()
+            except UserOfflineError:
+                self._invalidate_room_id()
+
+                # A cached room may have ended while the user went live in a new one
+                if cached_room_id is None:
+                    raise
+
+                self._logger.debug("Cached room ID is no longer live. Fetching it again.")
+                self._room_id = int(await self._fetch_room_id())
+                self._web.params["room_id"] = str(self._room_id)
+
+                try:
+                    initial_webcast_response = await self._fetch_start_responses(**fetch_kwargs)
+                except UserOfflineError:
+                    self._invalidate_room_id()
+                    raise
+
+            if gift_task is not None:
+                await gift_task
+        except BaseException:
+            # The metadata is no longer needed, but a warm-up that already failed has its error collected
+            if warm_future is not None:
+                warm_future.cancel()
+                await asyncio.gather(warm_future, return_exceptions=True)
+
+            raise
+        finally:
+            if gift_task is not None:
+                gift_task.cancel()
+                await asyncio.gather(gift_task, return_exceptions=True)
+
+        # Make sure the metadata is ready before the first frame is parsed
+        if warm_future is not None:
+            await warm_future
 
         # Start the websocket connection & return it
         self._event_loop_task = self._asyncio_loop.create_task(
             self._ws_client_loop(
                 initial_webcast_response=initial_webcast_response,
                 process_connect_events=process_connect_events,
-                compress_ws_events=compress_ws_events
+                compress_ws_events=compress_ws_events,
+                capture=capture
             )
         )
 
@@ -226,6 +367,60 @@ class TikTokLiveClient(AsyncIOEventEmitter):
 
         return self._asyncio_loop.run_until_complete(self.connect(**kwargs))
 
+    async def replay(
+            self,
+            source: ReplaySource,
+            *,
+            speed: Optional[float] = 1.0,
+            room_id: Optional[int] = None,
+            process_connect_events: bool = True
+    ) -> Task:
+        """
+        Replay a captured session through the normal parse & emit path, without touching the network.
+        Useful for testing handlers & measuring their throughput on real traffic.
+
+        :param source: The capture path (see `start(capture=...)`), or the captured records
+        :param speed: The playback speed (1.0 is real-time, 10.0 is 10x). None replays as fast as possible.
+        :param room_id: The room ID to report on events, as captures do not record it
+        :param process_connect_events: Whether to process the initial events in the capture's first fetch result
+        :return: Task containing the replay, which ends when the capture does
+
+        """
+
+        if self._ws.connected:
+            raise AlreadyConnectedError("You can only make one connection per client!")
+
+        replay_ws: WebcastReplayClient = WebcastReplayClient(source=source, speed=speed)
+        self._room_id = room_id
+
+        self._event_loop_task = self._asyncio_loop.create_task(
+            self._replay_loop(replay_ws=replay_ws, process_connect_events=process_connect_events)
+        )
+
+        return self._event_loop_task
+
+    async def _replay_loop(self, replay_ws: WebcastReplayClient, process_connect_events: bool) -> None:
+        """
+        Run the websocket loop over a replay, restoring the live WebSocket client afterwards
+
+        :param replay_ws: The replay transport
+        :param process_connect_events: Whether to process the initial events in the first fetch result
+        :return: None
+
+        """
+
+        live_ws: WebcastWSClient = self._ws
+        self._ws = replay_ws
+
+        try:
+            await self._ws_client_loop(
+                initial_webcast_response=None,
+                process_connect_events=process_connect_events,
+                compress_ws_events=False
+            )
+        finally:
+            self._ws = live_ws
+
     async def disconnect(self, close_client: bool = False) -> None:
         """
         Disconnect the client from the websocket.
@@ -259,14 +454,21 @@ class TikTokLiveClient(AsyncIOEventEmitter):
         self._room_info = None
         self._gift_info = None
 
+        # The intern pool is per-room
+        if self._interner is not None:
+            self._interner.clear()
+
     async def close(self) -> None:
         """
-        Discards the async sessions if you don't intend to use the client again
+        Discards the async sessions if you don't intend to use the client again. Registered sinks are closed too.
 
         :return: None
 
         """
 
+        for sink in self._sinks:
+            await sink.close()
+
         await self._web.close()
 
     def on(self, event: Type[Event], f: Optional[EventHandler] = None) -> Union[Handler, Callable[[Handler], Handler]]:
@@ -281,6 +483,45 @@ class TikTokLiveClient(AsyncIOEventEmitter):
 
         return super(TikTokLiveClient, self).on(event.get_type(), f)
 
+    def project(
+            self,
+            event: Type[ProtoEvent],
+            fields: Iterable[str],
+            f: Optional[Callable[[tuple], Any]] = None
+    ) -> Union[Handler, Callable[[Handler], Handler]]:
+        """
+        Decorator that subscribes a Python function to a handful of fields of an event.
+        Only the projected fields are decoded, straight from the wire, and the handler receives a named tuple with one
+        entry per field path (dots become underscores, e.g. "user.id" -> record.user_id).
+
+        When an event type has projections but no regular listeners (and the client has no sinks), it is no longer
+        parsed in full. Sinks never receive projected records, only full events, so projected event types are still
+        parsed in full while a sink is attached.
+
+        :param event: The proto event to project
+        :param fields: Dot-separated field paths (e.g. {"user.id", "comment"}). Sets are sorted into record order.
+        :param f: The function to handle the records
+        :return: The wrapped function as a generated `pyee.Handler` object
+
+        """
+
+        method: Optional[str] = EVENT_METHODS.get(event)
+
+        if method is None:
+            raise ValueError(f"Cannot project '{event.__name__}', as it is not parsed from a Webcast message.")
+
+        projection: FieldProjection = FieldProjection(
+            message_type=event,
+            fields=fields,
+            aliases=PROJECTION_ALIASES.get(event)
+        )
+
+        # Handlers projecting the same fields share one decode
+        method_projections: Dict[str, FieldProjection] = self._projections.setdefault(method, {})
+        method_projections.setdefault(projection.event_name, projection)
+
+        return super(TikTokLiveClient, self).on(projection.event_name, f)
+
     def add_listener(self, event: Type[Event], f: EventHandler) -> Handler:
         """
         Method that can be used to register a Python function as an event listener
@@ -295,6 +536,53 @@ class TikTokLiveClient(AsyncIOEventEmitter):
 
         return super().add_listener(event=event.get_type(), f=f)
 
+    def forward(self, f: Optional[RawForwarder] = None) -> Union[RawForwarder, Callable[[RawForwarder], RawForwarder]]:
+        """
+        Decorator that forwards the messages of each fetch result, still encoded, as RawMessage records
+        (room_id, method, msg_id, payload). Payloads are memoryviews of the received data, so nothing is copied
+        or decoded on their way through. Async functions are awaited before the next fetch result is read.
+
+        Set `decode_events` to False to skip decoding events altogether (control messages are still decoded).
+
+        :param f: The function to forward to
+        :return: The function
+
+        """
+
+        def register(forwarder: RawForwarder) -> RawForwarder:
+            self._forwarders.append(forwarder)
+            return forwarder
+
+        return register(f) if f is not None else register
+
+    def add_sink(self, sink: EventSink) -> EventSink:
+        """
+        Forward events to a sink. The client waits on the sink's back-pressure, if it applies any,
+        flushes it on disconnect & closes it on close. While a sink is attached, projected events are parsed in full
+        as well, so the sink receives them.
+
+        :param sink: The sink
+        :return: The sink
+
+        """
+
+        if sink not in self._sinks:
+            self._sinks.append(sink)
+
+        return sink
+
+    def remove_sink(self, sink: EventSink) -> None:
+        """
+        Stop forwarding events to a sink. The sink is left open.
+
+        :param sink: The sink
+        :return: None
+
+        """
+
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
     def has_listener(self, event: Type[Event]) -> bool:
         """
         Check whether the client is listening to a given event
@@ -310,7 +598,8 @@ class TikTokLiveClient(AsyncIOEventEmitter):
             self,
             initial_webcast_response: ProtoMessageFetchResult,
             process_connect_events: bool,
-            compress_ws_events: bool
+            compress_ws_events: bool,
+            capture: Optional[CaptureWriter] = None
     ) -> None:
         """
         Run the websocket loop to handle incoming WS events
@@ -318,6 +607,7 @@ class TikTokLiveClient(AsyncIOEventEmitter):
         :param initial_webcast_response: The ProtoMessageFetchResult (as bytes) retrieved from the sign server with connection info
         :param process_connect_events: Whether to process initial events sent on room join
         :param compress_ws_events: Whether to compress the WebSocket events using gzip compression
+        :param capture: An optional writer to archive the raw frames to
         :return: None
 
         """
@@ -329,18 +619,63 @@ class TikTokLiveClient(AsyncIOEventEmitter):
                 compress_ws_events=compress_ws_events,
                 cookies=self._web.cookies,
                 room_id=self._room_id,
-                user_agent=self._web.headers['User-Agent']
+                user_agent=self._web.headers['User-Agent'],
+                capture=capture
         ):
 
+            # Forward the raw messages
+            if self._forwarders:
+                await self._forward_raw_messages(webcast_response)
+
             # Iterate over the events extracted
             async for event in self._parse_webcast_response(webcast_response):
+
+                # Projection records are emitted to their projection's handlers only
+                if isinstance(event, ProjectionRecord):
+                    self.emit(event._event_type, event)
+                    continue
+
                 self._logger.debug(f"Received Event '{event.type}' [{event.size} bytes]")
                 self.emit(event.type, event)
 
+                for sink in self._sinks:
+                    await sink.put(event)
+
+        # Make the captured frames durable
+        if capture is not None:
+            await capture.flush()
+
+        for sink in self._sinks:
+            await sink.flush()
+
         # Send the Disconnect event when we disconnect
         ev: DisconnectEvent = DisconnectEvent()
         self.emit(ev.type, ev)
 
+    async def _forward_raw_messages(self, webcast_response: ProtoMessageFetchResult) -> None:
+        """
+        Forward the messages of a fetch result to the raw forwarders
+
+        :param webcast_response: The ProtoMessageFetchResult protobuf message
+        :return: None
+
+        """
+
+        room_id: int = self._room_id or 0
+        messages: List[RawMessage] = [RawMessage.from_message(room_id, message) for message in webcast_response.messages]
+
+        if not messages:
+            return
+
+        for forwarder in self._forwarders:
+            try:
+                result: Any = forwarder(messages)
+
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                self._logger.error(f"Failed to forward raw messages.\n{traceback.format_exc()}")
+
     async def _parse_webcast_response(self, webcast_response: ProtoMessageFetchResult) -> AsyncIterator[Event]:
         """
         Parse incoming webcast responses into events that can be emitted
@@ -350,12 +685,19 @@ class TikTokLiveClient(AsyncIOEventEmitter):
 
         """
 
+        # Share the repeated method strings
+        if self._interner is not None:
+            self._interner.intern(webcast_response)
+
         # The first event means we connected
         if webcast_response.is_first:
             yield ConnectEvent(unique_id=self._unique_id, room_id=self._room_id)
 
         # Yield events
         for message in webcast_response.messages:
+            if not self.decode_events and message.method not in CONTROL_METHODS:
+                continue
+
             for event in await self._parse_webcast_response_message(webcast_response_message=message):
                 if event is not None:
                     yield event
@@ -385,6 +727,25 @@ class TikTokLiveClient(AsyncIOEventEmitter):
         if event_type is None:
             return [response_event, UnknownEvent().from_dict(webcast_response_message.to_dict())]
 
+        # Decode projected fields straight from the wire
+        projections: Optional[Dict[str, FieldProjection]] = self._projections.get(webcast_response_message.method)
+        records: List[Event] = []
+
+        if projections:
+            try:
+                records = [projection.decode(webcast_response_message.payload) for projection in projections.values()]
+            except Exception:
+                # Parse it in full instead, which reports the payload if it is broken
+                self._logger.debug(f"Failed to project '{webcast_response_message.method}'. Parsing it in full.")
+            else:
+                # Skip the full parse if nothing else needs it (sinks get every event in full)
+                if (
+                        not self.has_listener(event_type)
+                        and not self._sinks
+                        and not issubclass(event_type, FULL_PARSE_EVENT_TYPES)
+                ):
+                    return [response_event, *records]
+
         # Get the underlying events
         try:
             proto_event: ProtoEvent = event_type().parse(webcast_response_message.payload)
@@ -394,9 +755,19 @@ class TikTokLiveClient(AsyncIOEventEmitter):
                     traceback.format_exc() + "\nBroken Payload:\n" + str(webcast_response_message.payload))
             return [response_event]
 
-        parsed_events: List[Event] = [response_event, proto_event]
+        # Fill in gift details the message left out
+        if self._gift_catalogue is not None and isinstance(proto_event, GiftEvent):
+            self._gift_catalogue.enrich(proto_event)
+
+        parsed_events: List[Event] = [response_event, proto_event, *records]
         custom_event: Optional[Event] = await self.handle_custom_event(webcast_response_message, proto_event)
 
+        # Share repeated strings (nicknames, CDN URLs...) with the room's earlier events
+        if self._interner is not None:
+            self._interner.intern(proto_event)
+            if custom_event is not None:
+                self._interner.intern(custom_event)
+
         # Add the custom event IF not null
         return [custom_event, *parsed_events] if custom_event else parsed_events
 
@@ -411,7 +782,19 @@ class TikTokLiveClient(AsyncIOEventEmitter):
 
         self._unique_id = unique_id = await self._resolve_user_id(unique_id or self.unique_id)
 
-        return await self._web.fetch_is_live(unique_id=unique_id or self.unique_id)
+        # A cached room that is still live saves the user lookup
+        room_id: Optional[int] = self._identity_cache.get_room_id(unique_id) if self._identity_cache is not None else None
+
+        if room_id is not None:
+            try:
+                if await self._web.fetch_is_live(room_id=room_id):
+                    return True
+            except MissingRoomIdInResponse:
+                pass
+
+            self._invalidate_room_id(unique_id, room_id)
+
+        return await self._web.fetch_is_live(unique_id=unique_id)
 
     async def handle_custom_event(self, response: ProtoMessageFetchResultBaseProtoMessage, event: ProtoEvent) -> \
             Optional[CustomEvent]:
@@ -431,7 +814,11 @@ class TikTokLiveClient(AsyncIOEventEmitter):
                 ControlAction.CONTROL_ACTION_STREAM_SUSPENDED
             }:
                 # If the stream is over, disconnect the client. Can't await due to circular dependency.
-                self._asyncio_loop.create_task(self.disconnect())
+                # A replay of a stream that ended says nothing about the live room, & ends by itself.
+                if not isinstance(self._ws, WebcastReplayClient):
+                    self._invalidate_room_id()
+                    self._asyncio_loop.create_task(self.disconnect())
+
                 return LiveEndEvent().parse(response.payload)
             elif event.action == ControlAction.CONTROL_ACTION_STREAM_PAUSED:
                 return LivePauseEvent().parse(response.payload)
@@ -454,12 +841,150 @@ class TikTokLiveClient(AsyncIOEventEmitter):
         """Resolve a unique_id and return the resolved value"""
         parsed_id = self.parse_unique_id(unique_id)
         if parsed_id.isdigit() and self._is_userid:
+            if self._identity_cache is not None and (cached_id := self._identity_cache.get_unique_id(parsed_id)):
+                return cached_id
             resolved_id = await self._web.fetch_user_unique_id(int(parsed_id))
             if not resolved_id:
                 raise FailedResolveUserId(f"Resolved ID is invalid: {resolved_id}")
+            if self._identity_cache is not None:
+                self._identity_cache.set_unique_id(parsed_id, resolved_id)
             return resolved_id
         return parsed_id
 
+    async def _fetch_start_responses(
+            self,
+            fetch_live_check: bool,
+            fetch_room_info: bool,
+            fetch_gift_info: bool,
+            preferred_agent_ids: Optional[list[str]],
+            concurrent_start: bool
+    ) -> ProtoMessageFetchResult:
+        """
+        Make the requests for the client's room before connecting, one by one or all at once.
+
+        At once, the live check is only waited on if the first Webcast response doesn't prove the room live,
+        & whatever is still in flight is cancelled when one of the requests fails.
+
+        :param fetch_live_check: Whether to check if the room is live
+        :param fetch_room_info: Whether to fetch room info
+        :param fetch_gift_info: Whether to fetch gift info, when one by one (at once, it is fetched by `start`)
+        :param preferred_agent_ids: The preferred agent IDs to use when connecting to the WebSocket
+        :param concurrent_start: Whether to make the requests all at once
+        :return: The first Webcast response
+        :raises: UserOfflineError if the room is not live
+
+        """
+
+        if not concurrent_start:
+            if fetch_live_check and not await self._web.fetch_is_live(room_id=self._room_id):
+                raise UserOfflineError()
+
+            if fetch_room_info:
+                self._room_info = await self._web.fetch_room_info()
+
+            if fetch_gift_info:
+                await self._fetch_gift_info()
+
+            return await self._web.fetch_signed_websocket(preferred_agent_ids=preferred_agent_ids)
+
+        signed_task: Task = self._asyncio_loop.create_task(
+            self._web.fetch_signed_websocket(preferred_agent_ids=preferred_agent_ids)
+        )
+        live_task: Optional[Task] = (
+            self._asyncio_loop.create_task(self._web.fetch_is_live(room_id=self._room_id))
+            if fetch_live_check else None
+        )
+        room_info_task: Optional[Task] = (
+            self._asyncio_loop.create_task(self._web.fetch_room_info())
+            if fetch_room_info else None
+        )
+        tasks: List[Task] = [task for task in (signed_task, live_task, room_info_task) if task is not None]
+
+        try:
+            if live_task is not None:
+                await asyncio.wait((signed_task, live_task), return_when=asyncio.FIRST_COMPLETED)
+
+                if (
+                        signed_task.done()
+                        and signed_task.exception() is None
+                        and proves_live(signed_task.result())
+                ):
+                    live_task.cancel()
+                elif not await live_task:
+                    raise UserOfflineError()
+
+            initial_webcast_response: ProtoMessageFetchResult = await signed_task
+
+            if room_info_task is not None:
+                self._room_info = await room_info_task
+
+            return initial_webcast_response
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+            # Collect what was cancelled or failed, so nothing is left running or unretrieved
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_gift_info(self) -> None:
+        """
+        Fetch the gift list for the client, through the shared catalogue if there is one (only if stale)
+
+        :return: None
+
+        """
+
+        if self._gift_catalogue is not None:
+            await self._gift_catalogue.ensure()
+            self._gift_info = self._gift_catalogue.data
+        else:
+            self._gift_info = await self._web.fetch_gift_list()
+
+    async def _fetch_room_id(self) -> int:
+        """
+        Look up the room ID of the client's user, from the live page HTML and/or the API, & cache it
+
+        :return: The room ID
+        :raises: UserOfflineError if the user is offline
+        :raises: UserNotFoundError if the user does not exist
+
+        """
+
+        try:
+            room_id: int = await self._room_id_resolver.resolve(self._web, self._unique_id)
+        except (UserOfflineError, UserNotFoundError):
+            self._invalidate_room_id()
+            raise
+
+        if self._identity_cache is not None:
+            self._identity_cache.set_room_id(self._unique_id, room_id)
+
+        return room_id
+
+    def _invalidate_room_id(self, unique_id: Optional[str] = None, room_id: Optional[int] = None) -> None:
+        """
+        Drop a user's room ID from the identity cache, once their stream is over, along with the cached responses
+        it was looked up & checked with, so looking it up again goes back to TikTok
+
+        :param unique_id: The user. Defaults to the client's.
+        :param room_id: The room that is over. Defaults to the client's, for the client's user.
+        :return: None
+
+        """
+
+        room_id = room_id or (self._room_id if unique_id is None else None)
+        unique_id = unique_id or self._unique_id
+
+        if self._identity_cache is not None:
+            self._identity_cache.invalidate_room_id(unique_id)
+
+        self._web.fetch_room_id_from_html.invalidate(unique_id)
+        self._web.fetch_room_id_from_api.invalidate(unique_id)
+
+        if room_id:
+            self._web.fetch_is_live.invalidate(room_id)
+
     async def send_room_chat(
             self,
             content: str
@@ -494,6 +1019,61 @@ class TikTokLiveClient(AsyncIOEventEmitter):
 
         return self._room_id
 
+    @property
+    def interner(self) -> Optional[MessageInterner]:
+        """
+        The interner that repeated event strings are shared through, if interning is enabled
+
+        :return: The MessageInterner or None
+
+        """
+
+        return self._interner
+
+    @property
+    def sinks(self) -> List[EventSink]:
+        """
+        The sinks events are forwarded to
+
+        :return: The sinks
+
+        """
+
+        return list(self._sinks)
+
+    @property
+    def identity_cache(self) -> Optional[IdentityCache]:
+        """
+        The cache of resolved user & room IDs, if the client has one
+
+        :return: The identity cache
+
+        """
+
+        return self._identity_cache
+
+    @property
+    def gift_catalogue(self) -> Optional[GiftCatalogue]:
+        """
+        The gift list shared by the client, if it has one
+
+        :return: The gift catalogue
+
+        """
+
+        return self._gift_catalogue
+
+    @property
+    def room_id_resolver(self) -> RoomIdResolver:
+        """
+        How the client looks up room IDs
+
+        :return: The room ID resolver
+
+        """
+
+        return self._room_id_resolver
+
     @property
     def web(self) -> TikTokWebClient:
         """
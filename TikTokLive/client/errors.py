@@ -1,4 +1,5 @@
 import enum
+import os
 from functools import cached_property
 from typing import Optional
 
@@ -196,6 +197,32 @@ class SignatureRateLimitError(SignAPIError):
         _args[0] = str(args[0]) % self.calculate_retry_after(response=response)
         super().__init__(SignAPIError.ErrorReason.RATE_LIMIT, *_args, response=response)
 
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "SignatureRateLimitError":
+        """
+        Create the error for a 429 response from the sign server
+
+        :param response: The response
+        :return: The error
+
+        """
+
+        try:
+            data_json: dict = response.json()
+        except ValueError:
+            data_json: dict = {}
+
+        server_message: Optional[str] = None if os.environ.get('SIGN_SERVER_MESSAGE_DISABLED') else data_json.get("message")
+        limit_label: str = f"({data_json['limit_label']}) " if data_json.get("limit_label") else ""
+
+        return cls(
+            server_message,
+            (
+                f"{limit_label}Too many connections started, try again in %s seconds."
+            ),
+            response=response
+        )
+
     @classmethod
     def calculate_retry_after(cls, response: httpx.Response) -> int:
         """
@@ -0,0 +1,2 @@
+from .export_columns import EventColumns, ExportColumn
+from .export_parquet import ParquetExportSink, SUPPORTS_PYARROW
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import enum
+from dataclasses import dataclass
+from typing import Dict, Tuple, List, Type, Any, Optional
+
+import betterproto
+
+from TikTokLive.events.proto_events import ProtoEvent
+from TikTokLive.proto import User, Gift
+
+"""The pyarrow type (factory name) each scalar protobuf type is exported as. Enums are exported by name."""
+COLUMN_TYPES: Dict[str, str] = {
+    betterproto.TYPE_BOOL: "bool_",
+    betterproto.TYPE_INT32: "int32",
+    betterproto.TYPE_SINT32: "int32",
+    betterproto.TYPE_SFIXED32: "int32",
+    betterproto.TYPE_UINT32: "uint32",
+    betterproto.TYPE_FIXED32: "uint32",
+    betterproto.TYPE_INT64: "int64",
+    betterproto.TYPE_SINT64: "int64",
+    betterproto.TYPE_SFIXED64: "int64",
+    betterproto.TYPE_UINT64: "uint64",
+    betterproto.TYPE_FIXED64: "uint64",
+    betterproto.TYPE_FLOAT: "float32",
+    betterproto.TYPE_DOUBLE: "float64",
+    betterproto.TYPE_STRING: "string",
+    betterproto.TYPE_ENUM: "string",
+}
+
+"""The nested user fields flattened into "user_*" columns"""
+USER_COLUMNS: Dict[str, str] = {
+    "id": "id",
+    "unique_id": "username",
+    "nickname": "nick_name",
+    "sec_uid": "sec_uid",
+}
+
+"""The nested gift fields flattened into "gift_*" columns"""
+GIFT_COLUMNS: Dict[str, str] = {
+    "id": "id",
+    "name": "name",
+    "diamond_count": "diamond_count",
+    "type": "type",
+}
+
+"""The message-level columns every event gets, read from its base_message"""
+BASE_COLUMNS: Dict[str, str] = {
+    "msg_id": "message_id",
+    "room_id": "room_id",
+    "create_time": "create_time",
+}
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """
+    A column of an exported event type
+
+    """
+
+    name: str
+    path: Tuple[str, ...]
+    arrow_type: str
+    is_enum: bool = False
+
+
+class EventColumns:
+    """
+    The flattened columns of one event type: the base message fields, the user & gift (if the event has them),
+    then the event's own scalar fields.
+
+    """
+
+    def __init__(self, event_type: Type[ProtoEvent]):
+        """
+        Compile the columns of an event type
+
+        :param event_type: The event type
+
+        """
+
+        self._event_type: Type[ProtoEvent] = event_type
+        self._columns: Tuple[ExportColumn, ...] = tuple(self._compile())
+
+    @property
+    def event_type(self) -> Type[ProtoEvent]:
+        """The event type"""
+
+        return self._event_type
+
+    @property
+    def columns(self) -> Tuple[ExportColumn, ...]:
+        """The columns, in export order"""
+
+        return self._columns
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """The column names, in export order"""
+
+        return tuple(column.name for column in self._columns)
+
+    def row(self, event: ProtoEvent) -> List[Any]:
+        """
+        Flatten an event into a row
+
+        :param event: The event
+        :return: One value per column
+
+        """
+
+        return [self._read(event, column) for column in self._columns]
+
+    @classmethod
+    def _read(cls, event: ProtoEvent, column: ExportColumn) -> Any:
+        """
+        Read a column value, following its path through the nested messages
+
+        :param event: The event
+        :param column: The column
+        :return: The value, or None if a message on the path is unset
+
+        """
+
+        value: Any = event
+
+        for name in column.path:
+            try:
+                value = getattr(value, name)
+            except AttributeError:
+                # Unset members of a oneof raise on access
+                return None
+
+            if value is None:
+                return None
+
+        if column.is_enum and isinstance(value, enum.Enum):
+            return value.name
+
+        return value
+
+    def _compile(self) -> List[ExportColumn]:
+        """
+        Build the columns of the event type
+
+        :return: The columns
+
+        """
+
+        # noinspection PyProtectedMember
+        metadata: betterproto.ProtoClassMetadata = self._event_type._betterproto
+        columns: List[ExportColumn] = []
+
+        if "base_message" in metadata.meta_by_field_name:
+            columns.extend(self._nested("", "base_message", metadata.cls_by_field["base_message"], BASE_COLUMNS))
+
+        user_field: Optional[str] = self._find_field(metadata, User)
+        gift_field: Optional[str] = self._find_field(metadata, Gift)
+
+        if user_field is not None:
+            columns.extend(self._nested("user_", user_field, metadata.cls_by_field[user_field], USER_COLUMNS))
+
+        if gift_field is not None:
+            columns.extend(self._nested("gift_", gift_field, metadata.cls_by_field[gift_field], GIFT_COLUMNS))
+
+        taken: set = {column.name for column in columns}
+
+        for name, meta in metadata.meta_by_field_name.items():
+            if name in taken or meta.proto_type not in COLUMN_TYPES or metadata.default_gen[name] is list:
+                continue
+
+            columns.append(
+                ExportColumn(
+                    name=name,
+                    path=(name,),
+                    arrow_type=COLUMN_TYPES[meta.proto_type],
+                    is_enum=meta.proto_type == betterproto.TYPE_ENUM
+                )
+            )
+
+        return columns
+
+    @classmethod
+    def _nested(
+            cls,
+            prefix: str,
+            field_name: str,
+            message_type: Type[betterproto.Message],
+            fields: Dict[str, str]
+    ) -> List[ExportColumn]:
+        """
+        Build the flattened columns of a nested message
+
+        :param prefix: The column name prefix
+        :param field_name: The event field holding the nested message
+        :param message_type: The nested message class
+        :param fields: Column suffix to nested field name
+        :return: The columns
+
+        """
+
+        # noinspection PyProtectedMember
+        metadata: betterproto.ProtoClassMetadata = message_type._betterproto
+
+        return [
+            ExportColumn(
+                name=prefix + suffix,
+                path=(field_name, name),
+                arrow_type=COLUMN_TYPES[metadata.meta_by_field_name[name].proto_type],
+                is_enum=metadata.meta_by_field_name[name].proto_type == betterproto.TYPE_ENUM
+            )
+            for suffix, name in fields.items()
+        ]
+
+    @classmethod
+    def _find_field(cls, metadata: betterproto.ProtoClassMetadata, message_type: Type[betterproto.Message]) -> Optional[str]:
+        """
+        Find the first singular field holding a given message type
+
+        :param metadata: The event metadata
+        :param message_type: The message type to look for
+        :return: The field name, if there is one
+
+        """
+
+        for name, meta in metadata.meta_by_field_name.items():
+            field_type: Any = metadata.cls_by_field.get(name)
+
+            if (
+                    meta.proto_type == betterproto.TYPE_MESSAGE
+                    and metadata.default_gen[name] is not list
+                    and isinstance(field_type, type)
+                    and issubclass(field_type, message_type)
+            ):
+                return name
+
+        return None
@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Type, Tuple, Any, Optional, Set, Union
+
+from TikTokLive.client.export.export_columns import EventColumns
+from TikTokLive.client.logger import TikTokLiveLogHandler
+from TikTokLive.events.proto_events import ProtoEvent, CommentEvent, GiftEvent, LikeEvent, JoinEvent, SocialEvent, \
+    RoomUserSeqEvent
+
+"""Whether pyarrow is installed"""
+try:
+    import pyarrow
+    import pyarrow.parquet
+
+    SUPPORTS_PYARROW: bool = True
+except ImportError:
+    SUPPORTS_PYARROW: bool = False
+
+"""The event types exported when none are given"""
+DEFAULT_EXPORT_EVENTS: Tuple[Type[ProtoEvent], ...] = (
+    CommentEvent,
+    GiftEvent,
+    LikeEvent,
+    JoinEvent,
+    SocialEvent,
+    RoomUserSeqEvent,
+)
+
+"""Exported files roll over on the hour (UTC)"""
+ROLL_SECONDS: int = 3600
+
+"""How often old batches & idle files are looked for, in seconds"""
+SWEEP_INTERVAL: float = 1.0
+
+"""A batch & file key: the event type, room ID & hour (hours since the epoch, UTC)"""
+BatchKey = Tuple[Type[ProtoEvent], int, int]
+
+
+@dataclass()
+class _ColumnBatch:
+    """
+    The buffered rows of one event type, for one room & hour
+
+    """
+
+    room_id: int
+    hour: int
+    columns: List[List[Any]]
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def rows(self) -> int:
+        return len(self.columns[0])
+
+
+class ParquetExportSink:
+    """
+    Export events to Parquet files for warehouse loading, with nested user & gift fields flattened into columns.
+
+    Rows are buffered per event type, room & hour as column batches & written by a worker thread once a batch is big
+    or old enough (checked on a timer, so a room that goes quiet is still written), so the event loop never waits on
+    the disk. Files roll per room & hour, laid out as
+    "<directory>/room_id=<room>/date=<YYYY-MM-DD>/hour=<HH>/<EventType>-<opened at>.parquet", & are closed (their
+    footer written, so they can be read) once idle, on a later hour, or on `close()`.
+
+    """
+
+    def __init__(
+            self,
+            directory: Union[str, os.PathLike],
+            event_types: Iterable[Type[ProtoEvent]] = DEFAULT_EXPORT_EVENTS,
+            max_rows: int = 10_000,
+            flush_interval: float = 60.0,
+            compression: str = "zstd",
+            idle_timeout: float = 300.0
+    ):
+        """
+        Create a Parquet export sink
+
+        :param directory: The directory to export to
+        :param event_types: The event types to export
+        :param max_rows: Flush a batch once it holds this many rows
+        :param flush_interval: Flush a batch once its oldest row is this many seconds old
+        :param compression: The Parquet compression codec
+        :param idle_timeout: Close a file once nothing has been written to it for this many seconds
+
+        """
+
+        if not SUPPORTS_PYARROW:
+            raise ImportError(
+                'Cannot export to Parquet without pyarrow. '
+                'To install it, type "pip install TikTokLive[parquet]".'
+            )
+
+        self._directory: str = os.fspath(directory)
+        self._max_rows: int = max_rows
+        self._flush_interval: float = flush_interval
+        self._compression: str = compression
+        self._idle_timeout: float = idle_timeout
+        self._logger = TikTokLiveLogHandler.get_logger()
+
+        self._columns: Dict[Type[ProtoEvent], EventColumns] = {
+            event_type: EventColumns(event_type) for event_type in event_types
+        }
+        self._schemas: Dict[Type[ProtoEvent], pyarrow.Schema] = {
+            event_type: pyarrow.schema(
+                [("received_at", pyarrow.float64())]
+                + [(column.name, getattr(pyarrow, column.arrow_type)()) for column in event_columns.columns]
+            )
+            for event_type, event_columns in self._columns.items()
+        }
+
+        self._batches: Dict[BatchKey, _ColumnBatch] = {}
+        self._writers: Dict[BatchKey, Tuple[float, pyarrow.parquet.ParquetWriter]] = {}
+        self._last_sweep: float = time.monotonic()
+        self._sweep_timer: Optional[asyncio.TimerHandle] = None
+        self._closed: bool = False
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ParquetExport")
+        self._pending: Set[Future] = set()
+        self._room_id: Optional[int] = None
+
+        self.rows_written: int = 0
+        self.files_written: List[str] = []
+
+    @property
+    def event_types(self) -> Tuple[Type[ProtoEvent], ...]:
+        """The exported event types"""
+
+        return tuple(self._columns.keys())
+
+    def attach(self, client: Any) -> None:
+        """
+        Export a client's events. Events without a room ID of their own are filed under the client's room.
+
+        :param client: The TikTokLiveClient
+        :return: None
+
+        """
+
+        def on_event(event: ProtoEvent) -> None:
+            self._room_id = client.room_id
+            self.write(event)
+
+        for event_type in self._columns:
+            client.add_listener(event_type, on_event)
+
+    def write(self, event: ProtoEvent, received_at: Optional[float] = None) -> None:
+        """
+        Buffer an event as a row. This never blocks on the disk.
+
+        :param event: The event
+        :param received_at: The receive time (unix seconds). Defaults to now.
+        :return: None
+
+        """
+
+        event_columns: Optional[EventColumns] = self._columns.get(type(event))
+
+        if event_columns is None:
+            return
+
+        received_at = time.time() if received_at is None else received_at
+        row: List[Any] = event_columns.row(event)
+        room_id: int = self._row_room_id(event_columns, row)
+        hour: int = int(received_at) // ROLL_SECONDS
+        key: BatchKey = (type(event), room_id, hour)
+
+        # Rows from each room & hour are batched apart, as they go to different files
+        batch: Optional[_ColumnBatch] = self._batches.get(key)
+
+        if batch is None:
+            batch = self._batches[key] = _ColumnBatch(
+                room_id=room_id,
+                hour=hour,
+                columns=[[] for _ in range(len(row) + 1)]
+            )
+
+        batch.columns[0].append(received_at)
+
+        for column, value in zip(batch.columns[1:], row):
+            column.append(value)
+
+        now: float = time.monotonic()
+
+        if batch.rows >= self._max_rows or now - batch.started_at >= self._flush_interval:
+            self._submit(key)
+
+        if now - self._last_sweep >= SWEEP_INTERVAL:
+            self._sweep(now)
+
+        if self._sweep_timer is None:
+            self._start_sweep_timer()
+
+    async def flush(self) -> None:
+        """
+        Write every buffered batch & wait for the writes to finish. Files idle for `idle_timeout` are closed.
+
+        :return: None
+
+        """
+
+        for key in list(self._batches):
+            self._submit(key)
+
+        self._sweep(time.monotonic())
+
+        if self._pending:
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in list(self._pending)))
+
+    async def close(self) -> None:
+        """
+        Flush, then close the open files (which writes their footers)
+
+        :return: None
+
+        """
+
+        self._closed = True
+
+        if self._sweep_timer is not None:
+            self._sweep_timer.cancel()
+            self._sweep_timer = None
+
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close_writers)
+        self._executor.shutdown(wait=True)
+
+    def _row_room_id(self, event_columns: EventColumns, row: List[Any]) -> int:
+        """
+        Get the room a row belongs to, preferring the event's own room ID
+
+        :param event_columns: The event columns
+        :param row: The row
+        :return: The room ID (0 if unknown)
+
+        """
+
+        names: Tuple[str, ...] = event_columns.names
+
+        if "room_id" in names and row[names.index("room_id")]:
+            return row[names.index("room_id")]
+
+        return self._room_id or 0
+
+    def _submit(self, key: BatchKey) -> None:
+        """
+        Hand a batch to the writer thread
+
+        :param key: The key of the batch
+        :return: None
+
+        """
+
+        batch: Optional[_ColumnBatch] = self._batches.pop(key, None)
+
+        if batch is None or not batch.rows:
+            return
+
+        self._run_in_writer(self._write_batch, key, batch)
+
+    def _sweep(self, now: float) -> None:
+        """
+        Hand batches of rooms that went quiet to the writer thread, & have it close idle files
+
+        :param now: The time (monotonic)
+        :return: None
+
+        """
+
+        self._last_sweep = now
+
+        for key, batch in list(self._batches.items()):
+            if now - batch.started_at >= self._flush_interval:
+                self._submit(key)
+
+        self._run_in_writer(self._close_idle_writers, now)
+
+    def _start_sweep_timer(self) -> None:
+        """
+        Sweep every `SWEEP_INTERVAL`, even if no more events arrive to trigger it
+
+        :return: None
+
+        """
+
+        try:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._sweep_timer = loop.call_later(SWEEP_INTERVAL, self._on_sweep_timer)
+
+    def _on_sweep_timer(self) -> None:
+        """
+        Sweep, & keep sweeping while there are rows to write or files to close
+
+        :return: None
+
+        """
+
+        self._sweep_timer = None
+
+        if self._closed:
+            return
+
+        self._sweep(time.monotonic())
+
+        if self._batches or self._writers or self._pending:
+            self._start_sweep_timer()
+
+    def _run_in_writer(self, fn: Any, *args: Any) -> None:
+        """
+        Run a function in the writer thread, logging it if it fails
+
+        :param fn: The function
+        :param args: Its arguments
+        :return: None
+
+        """
+
+        future: Future = self._executor.submit(fn, *args)
+        self._pending.add(future)
+        future.add_done_callback(self._on_written)
+
+    def _on_written(self, future: Future) -> None:
+        """
+        Forget a finished write, logging it if it failed
+
+        :param future: The write
+        :return: None
+
+        """
+
+        self._pending.discard(future)
+
+        if future.exception() is not None:
+            self._logger.error("Failed to write a Parquet export file.", exc_info=future.exception())
+
+    def _write_batch(self, key: BatchKey, batch: _ColumnBatch) -> None:
+        """
+        Write a batch as a row group of its room & hour's file, closing the room's files for earlier hours.
+        Runs in the writer thread.
+
+        :param key: The key of the batch
+        :param batch: The batch
+        :return: None
+
+        """
+
+        event_type, room_id, hour = key
+        schema: pyarrow.Schema = self._schemas[event_type]
+        current: Optional[Tuple[float, pyarrow.parquet.ParquetWriter]] = self._writers.get(key)
+
+        if current is None:
+            for other_key in [other for other in self._writers if other[:2] == key[:2] and other[2] < hour]:
+                self._writers.pop(other_key)[1].close()
+
+            path: str = self._file_path(event_type, room_id, hour)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            current = (0.0, pyarrow.parquet.ParquetWriter(path, schema, compression=self._compression))
+            self.files_written.append(path)
+
+        table: pyarrow.Table = pyarrow.Table.from_arrays(
+            [pyarrow.array(column, type=schema_field.type) for column, schema_field in zip(batch.columns, schema)],
+            schema=schema
+        )
+
+        current[1].write_table(table)
+        self._writers[key] = (time.monotonic(), current[1])
+        self.rows_written += batch.rows
+
+    def _close_idle_writers(self, now: float) -> None:
+        """
+        Close the files nothing has been written to for `idle_timeout`. Runs in the writer thread.
+
+        :param now: The time (monotonic)
+        :return: None
+
+        """
+
+        for key in [key for key, (last_write, _) in self._writers.items() if now - last_write >= self._idle_timeout]:
+            self._writers.pop(key)[1].close()
+
+    def _close_writers(self) -> None:
+        """
+        Close every open file. Runs in the writer thread.
+
+        :return: None
+
+        """
+
+        for _, writer in self._writers.values():
+            writer.close()
+
+        self._writers.clear()
+
+    def _file_path(self, event_type: Type[ProtoEvent], room_id: int, hour: int) -> str:
+        """
+        Build the path of a new export file
+
+        :param event_type: The event type
+        :param room_id: The room ID
+        :param hour: The hour (hours since the epoch, UTC)
+        :return: The path
+
+        """
+
+        started: datetime = datetime.fromtimestamp(hour * ROLL_SECONDS, tz=timezone.utc)
+
+        return os.path.join(
+            self._directory,
+            f"room_id={room_id}",
+            f"date={started:%Y-%m-%d}",
+            f"hour={started:%H}",
+            f"{event_type.get_type()}-{int(time.time() * 1000)}.parquet"
+        )
@@ -0,0 +1,349 @@
+import asyncio
+import random
+import time
+import traceback
+from asyncio import Task
+from logging import Logger
+from typing import Optional, Dict, List, Any, NamedTuple, Iterator, Tuple
+
+import betterproto
+
+from TikTokLive.client.logger import TikTokLiveLogHandler
+from TikTokLive.client.web.web_client import TikTokWebClient
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+from TikTokLive.events.proto_events import GiftEvent
+from TikTokLive.proto import ImageModel
+
+"""How long the catalogue is trusted before it is fetched again, in seconds"""
+DEFAULT_CATALOGUE_TTL: float = 60 * 60
+
+"""The image fields of a gift list entry, in order of preference"""
+GIFT_IMAGE_KEYS: Tuple[str, ...] = ("image", "icon")
+
+
+def _unset(value: Any) -> bool:
+    """Whether a proto field value, as stored, is unset or empty"""
+
+    return value is None or value is betterproto.PLACEHOLDER or not value
+
+
+class CatalogueGift(NamedTuple):
+    """
+    A gift from the gift list
+
+    """
+
+    id: int
+    name: str
+    diamond_count: int
+    image_urls: List[str]
+    data: Dict[str, Any]
+
+    @property
+    def image_url(self) -> Optional[str]:
+        """The gift's image, if it has one"""
+
+        return self.image_urls[0] if self.image_urls else None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CatalogueGift":
+        """
+        Read a gift list entry
+
+        :param data: The entry
+        :return: The gift
+
+        """
+
+        image_urls: List[str] = next(
+            (data[key]["url_list"] for key in GIFT_IMAGE_KEYS if (data.get(key) or {}).get("url_list")),
+            []
+        )
+
+        return cls(
+            id=int(data["id"]),
+            name=data.get("name") or "",
+            diamond_count=int(data.get("diamond_count") or 0),
+            image_urls=list(image_urls),
+            data=data
+        )
+
+
+class GiftCatalogue:
+    """
+    The gift list, fetched once for any number of clients & indexed by gift ID & name.
+
+    The list is re-fetched with conditional requests (ETag / Last-Modified) once its TTL is up, either lazily when a
+    client starts or in the background with `start()`. Pass it to `TikTokLiveClient(gift_catalogue=...)` to fill in
+    the diamond count, name & image of gift events that arrive without them.
+
+    """
+
+    def __init__(
+            self,
+            web: Optional[TikTokWebClient] = None,
+            http_pool: Optional[TikTokHTTPPool] = None,
+            ttl: float = DEFAULT_CATALOGUE_TTL
+    ):
+        """
+        Create a gift catalogue. It is empty until first refreshed.
+
+        :param web: The web client to fetch with. Defaults to a new one (on `http_pool`, if given).
+        :param http_pool: An optional HTTP pool for the default web client
+        :param ttl: How long the list is trusted before it is fetched again, in seconds
+
+        """
+
+        self._web: TikTokWebClient = web or TikTokWebClient(pool=http_pool)
+        self._owns_web: bool = web is None
+        self._ttl: float = ttl
+
+        self._data: Optional[Dict[str, Any]] = None
+        self._by_id: Dict[int, CatalogueGift] = {}
+        self._by_name: Dict[str, List[CatalogueGift]] = {}
+        self._images: Dict[int, ImageModel] = {}
+        self._validators: Dict[str, str] = {}
+        self._expires_at: float = 0.0
+        self._refreshing: Optional[asyncio.Future] = None
+        self._task: Optional[Task] = None
+        self._logger: Logger = TikTokLiveLogHandler.get_logger()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, gift_id: int) -> bool:
+        return gift_id in self._by_id
+
+    def __iter__(self) -> Iterator[CatalogueGift]:
+        return iter(self._by_id.values())
+
+    @property
+    def data(self) -> Optional[Dict[str, Any]]:
+        """
+        The gift list as returned by TikTok, as in `client.gift_info`
+
+        :return: The gift list, or None if not yet fetched
+
+        """
+
+        return self._data
+
+    @property
+    def stale(self) -> bool:
+        """
+        Whether the TTL is up (or the list was never fetched)
+
+        :return: Whether it is stale
+
+        """
+
+        return time.monotonic() >= self._expires_at
+
+    def get(self, gift_id: int) -> Optional[CatalogueGift]:
+        """
+        Look a gift up by ID
+
+        :param gift_id: The gift ID
+        :return: The gift, if listed
+
+        """
+
+        return self._by_id.get(gift_id)
+
+    def find(self, name: str) -> List[CatalogueGift]:
+        """
+        Look gifts up by name, ignoring case. Several gifts can share a name.
+
+        :param name: The gift name
+        :return: The gifts with that name
+
+        """
+
+        return list(self._by_name.get(name.casefold(), ()))
+
+    async def ensure(self) -> None:
+        """
+        Refresh the list if it is stale
+
+        :return: None
+
+        """
+
+        if self.stale:
+            await self.refresh()
+
+    async def refresh(self) -> bool:
+        """
+        Fetch the list if it changed since the last fetch. Concurrent calls share one request.
+
+        :return: Whether the list changed
+
+        """
+
+        refreshing: Optional[asyncio.Future] = self._refreshing
+
+        if refreshing is not None:
+            try:
+                return await asyncio.shield(refreshing)
+            except asyncio.CancelledError:
+                # Only retry if the refresh we were sharing was cancelled, rather than us
+                if not refreshing.cancelled():
+                    raise
+
+                return await self.refresh()
+
+        self._refreshing = asyncio.get_running_loop().create_future()
+
+        try:
+            data, self._validators = await self._web.fetch_gift_list.fetch_if_changed(self._validators)
+
+            if data is not None:
+                self._index(data)
+
+            self._expires_at = time.monotonic() + self._ttl
+            self._refreshing.set_result(data is not None)
+            return data is not None
+        except asyncio.CancelledError:
+            self._refreshing.cancel()
+            raise
+        except Exception as ex:
+            self._refreshing.set_exception(ex)
+
+            # Mark it retrieved, since there may be no other caller waiting on it
+            self._refreshing.exception()
+            raise
+        finally:
+            self._refreshing = None
+
+    def enrich(self, event: GiftEvent) -> GiftEvent:
+        """
+        Fill in the diamond count, name & image of a gift event from the catalogue, where the event lacks them.
+        Filled-in images are shared by every event of that gift, so must not be modified.
+
+        :param event: The gift event
+        :return: The same event
+
+        """
+
+        # Read the fields as stored, since betterproto builds (slowly) a default for each unset one on access
+        values: Dict[str, Any] = event.m_gift.__dict__
+        gift: Optional[CatalogueGift] = self._by_id.get(values.get("id"))
+
+        if gift is None:
+            return event
+
+        if _unset(values.get("diamond_count")):
+            values["diamond_count"] = gift.diamond_count
+
+        if _unset(values.get("name")):
+            values["name"] = gift.name
+
+        image: Any = values.get("image")
+
+        if (_unset(image) or not image.m_urls) and gift.image_urls:
+            if gift.id not in self._images:
+                self._images[gift.id] = ImageModel(m_urls=gift.image_urls)
+
+            values["image"] = self._images[gift.id]
+
+        return event
+
+    def start(self) -> Task:
+        """
+        Refresh the list in the background, every TTL
+
+        :return: The refresh task
+
+        """
+
+        if self._task is not None and not self._task.done():
+            raise RuntimeError("The gift catalogue is already refreshing in the background.")
+
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        """
+        Stop refreshing in the background
+
+        :return: None
+
+        """
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    async def close(self) -> None:
+        """
+        Stop refreshing & close the web client, if the catalogue created it
+
+        :return: None
+
+        """
+
+        await self.stop()
+
+        if self._owns_web:
+            await self._web.close()
+
+    async def _run(self) -> None:
+        """
+        Refresh whenever the list goes stale, retrying failures sooner
+
+        :return: None
+
+        """
+
+        while True:
+            try:
+                await self.ensure()
+                delay: float = self._expires_at - time.monotonic()
+            except Exception:
+                self._logger.error(f"Failed to refresh the gift catalogue.\n{traceback.format_exc()}")
+                delay: float = min(self._ttl, 60.0)
+
+            await asyncio.sleep(max(1.0, delay) * random.uniform(1.0, 1.1))
+
+    def _index(self, data: Dict[str, Any]) -> None:
+        """
+        Index a fetched gift list, replacing the previous one
+
+        :param data: The gift list
+        :return: None
+
+        """
+
+        entries: List[Dict[str, Any]] = list(data.get("gifts") or [])
+
+        # Gifts can also be listed by panel page
+        for page in data.get("pages") or []:
+            entries.extend(page.get("gifts") or [])
+
+        by_id: Dict[int, CatalogueGift] = {}
+        by_name: Dict[str, List[CatalogueGift]] = {}
+
+        for entry in entries:
+            if entry.get("id") is None or int(entry["id"]) in by_id:
+                continue
+
+            gift: CatalogueGift = CatalogueGift.from_dict(entry)
+            by_id[gift.id] = gift
+            by_name.setdefault(gift.name.casefold(), []).append(gift)
+
+        self._data, self._by_id, self._by_name, self._images = data, by_id, by_name, {}
+
+    async def __aenter__(self) -> "GiftCatalogue":
+        await self.ensure()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
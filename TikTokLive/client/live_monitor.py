@@ -0,0 +1,433 @@
+import asyncio
+import inspect
+import random
+import time
+import traceback
+from asyncio import Task
+from dataclasses import dataclass
+from logging import Logger
+from typing import Optional, Dict, List, Callable, Coroutine, Any, Union, Iterable
+
+from TikTokLive.client.errors import UserNotFoundError
+from TikTokLive.client.logger import TikTokLiveLogHandler
+from TikTokLive.client.web.routes.fetch_room_id_api import FetchRoomIdAPIRoute
+from TikTokLive.client.web.web_client import TikTokWebClient
+from TikTokLive.client.web.web_identity import IdentityCache
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+
+"""The most room IDs sent in one /room/check_alive/ request"""
+MAX_CHECK_ALIVE_BATCH: int = 100
+
+"""The room status the user room API reports for a creator who is not live"""
+ROOM_STATUS_OFFLINE: int = 4
+
+"""A function called with the unique_id & room ID of a creator whose live status changed"""
+LiveStatusCallback = Callable[[str, int], Optional[Coroutine[Any, Any, Any]]]
+
+
+@dataclass
+class WatchedCreator:
+    """
+    A creator on the monitor's watch list
+
+    """
+
+    unique_id: str
+    """The creator's unique_id"""
+
+    room_id: Optional[int] = None
+    """Their last known room ID"""
+
+    is_live: Optional[bool] = None
+    """Whether they are live, or None until first checked"""
+
+    interval: float = 0.0
+    """The current time between checks, in seconds"""
+
+    next_check: float = 0.0
+    """When they are next due a check (monotonic)"""
+
+
+class LiveMonitor:
+    """
+    Tracks the live status of a large watch list of creators, calling back when they go live or offline.
+
+    Live creators are polled in batches through /room/check_alive/, so a thousand live rooms cost ten requests.
+    Offline creators have no room ID to batch-check (a new stream gets a new room), so each is looked up through the
+    user room API instead, backing off from `min_interval` to `max_interval` for as long as they stay offline.
+
+    """
+
+    def __init__(
+            self,
+            web: Optional[TikTokWebClient] = None,
+            http_pool: Optional[TikTokHTTPPool] = None,
+            identity_cache: Optional[IdentityCache] = None,
+            min_interval: float = 30.0,
+            max_interval: float = 600.0,
+            backoff: float = 2.0,
+            batch_size: int = MAX_CHECK_ALIVE_BATCH,
+            max_lookups: int = 10
+    ):
+        """
+        Create a live monitor
+
+        :param web: The web client to poll with. Defaults to a new one (on `http_pool`, if given).
+        :param http_pool: An optional HTTP pool for the default web client
+        :param identity_cache: An optional identity cache, to start from known room IDs & keep it up to date
+        :param min_interval: The time between checks of live creators & of those that just went offline, in seconds
+        :param max_interval: The longest time between checks of an offline creator, in seconds
+        :param backoff: The factor an offline creator's check interval grows by on each check they stay offline
+        :param batch_size: The most room IDs per check_alive request
+        :param max_lookups: The most user room lookups in flight at once
+
+        """
+
+        self._web: TikTokWebClient = web or TikTokWebClient(pool=http_pool)
+        self._owns_web: bool = web is None
+        self._identity_cache: Optional[IdentityCache] = identity_cache
+
+        self._min_interval: float = min_interval
+        self._max_interval: float = max_interval
+        self._backoff: float = backoff
+        self._batch_size: int = batch_size
+        self._lookup_semaphore: asyncio.Semaphore = asyncio.Semaphore(max_lookups)
+
+        self._creators: Dict[str, WatchedCreator] = {}
+        self._on_live: List[LiveStatusCallback] = []
+        self._on_offline: List[LiveStatusCallback] = []
+        self._wake: asyncio.Event = asyncio.Event()
+        self._task: Optional[Task] = None
+        self._logger: Logger = TikTokLiveLogHandler.get_logger()
+
+    def watch(self, *unique_ids: str) -> None:
+        """
+        Add creators to the watch list. They are checked on the next poll.
+
+        :param unique_ids: The creators' unique_ids
+        :return: None
+
+        """
+
+        for unique_id in unique_ids:
+            if unique_id in self._creators:
+                continue
+
+            room_id: Optional[int] = self._identity_cache.get_room_id(unique_id) if self._identity_cache else None
+            self._creators[unique_id] = WatchedCreator(unique_id=unique_id, room_id=room_id, interval=self._min_interval)
+
+        self._wake.set()
+
+    def unwatch(self, *unique_ids: str) -> None:
+        """
+        Remove creators from the watch list
+
+        :param unique_ids: The creators' unique_ids
+        :return: None
+
+        """
+
+        for unique_id in unique_ids:
+            self._creators.pop(unique_id, None)
+
+    def on_live(self, f: Optional[LiveStatusCallback] = None) -> Union[LiveStatusCallback, Callable[[LiveStatusCallback], LiveStatusCallback]]:
+        """
+        Decorator for a function called with (unique_id, room_id) when a creator goes live,
+        including creators found live on their first check. Async functions are awaited.
+
+        :param f: The function
+        :return: The function
+
+        """
+
+        def register(callback: LiveStatusCallback) -> LiveStatusCallback:
+            self._on_live.append(callback)
+            return callback
+
+        return register(f) if f is not None else register
+
+    def on_offline(self, f: Optional[LiveStatusCallback] = None) -> Union[LiveStatusCallback, Callable[[LiveStatusCallback], LiveStatusCallback]]:
+        """
+        Decorator for a function called with (unique_id, room_id) when a live creator goes offline.
+        Async functions are awaited.
+
+        :param f: The function
+        :return: The function
+
+        """
+
+        def register(callback: LiveStatusCallback) -> LiveStatusCallback:
+            self._on_offline.append(callback)
+            return callback
+
+        return register(f) if f is not None else register
+
+    def is_live(self, unique_id: str) -> Optional[bool]:
+        """
+        Get a watched creator's last known live status
+
+        :param unique_id: The creator's unique_id
+        :return: Whether they are live, or None if not checked yet (or not watched)
+
+        """
+
+        creator: Optional[WatchedCreator] = self._creators.get(unique_id)
+        return creator.is_live if creator is not None else None
+
+    @property
+    def live(self) -> List[str]:
+        """
+        The watched creators currently live
+
+        :return: Their unique_ids
+
+        """
+
+        return [creator.unique_id for creator in self._creators.values() if creator.is_live]
+
+    @property
+    def creators(self) -> List[WatchedCreator]:
+        """
+        The watch list
+
+        :return: The watched creators
+
+        """
+
+        return list(self._creators.values())
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the monitor is polling in the background
+
+        :return: Whether it is running
+
+        """
+
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> Task:
+        """
+        Start polling in the background
+
+        :return: The polling task
+
+        """
+
+        if self.running:
+            raise RuntimeError("The live monitor is already running.")
+
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        """
+        Stop polling
+
+        :return: None
+
+        """
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    async def close(self) -> None:
+        """
+        Stop polling & close the web client, if the monitor created it
+
+        :return: None
+
+        """
+
+        await self.stop()
+
+        if self._owns_web:
+            await self._web.close()
+
+    async def poll(self) -> None:
+        """
+        Check every creator due a check: those with a room ID to confirm in check_alive batches, the rest by lookup
+
+        :return: None
+
+        """
+
+        now: float = time.monotonic()
+        due: List[WatchedCreator] = [creator for creator in self._creators.values() if creator.next_check <= now]
+
+        # Offline creators' old rooms say nothing of whether they started a new one
+        batched: List[WatchedCreator] = [creator for creator in due if creator.room_id and creator.is_live is not False]
+        looked_up: List[WatchedCreator] = [creator for creator in due if not (creator.room_id and creator.is_live is not False)]
+
+        for start in range(0, len(batched), self._batch_size):
+            await self._check_batch(batched[start:start + self._batch_size])
+
+        await asyncio.gather(*(self._look_up(creator) for creator in looked_up))
+
+    async def _run(self) -> None:
+        """
+        Poll until stopped, sleeping until the next creator is due (or the watch list changes)
+
+        :return: None
+
+        """
+
+        while True:
+            self._wake.clear()
+            await self.poll()
+
+            next_check: float = min((creator.next_check for creator in self._creators.values()), default=float("inf"))
+            delay: float = max(1.0, next_check - time.monotonic())
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=min(delay, self._max_interval))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _check_batch(self, batch: List[WatchedCreator]) -> None:
+        """
+        Check a batch of creators' rooms in one check_alive request
+
+        :param batch: The creators, each with a room ID
+        :return: None
+
+        """
+
+        try:
+            statuses: List[bool] = await self._web.fetch_is_live.fetch_is_live_room_ids(*(creator.room_id for creator in batch))
+        except Exception:
+            self._logger.error(f"Failed to check a batch of {len(batch)} rooms.\n{traceback.format_exc()}")
+
+            for creator in batch:
+                self._schedule(creator, self._min_interval)
+
+            return
+
+        for creator, alive in zip(batch, statuses):
+            if alive:
+                await self._update(creator, True, creator.room_id)
+                continue
+
+            # Not yet checked, so the cached room is just old. Look them up on the next poll instead.
+            if creator.is_live is None:
+                creator.room_id = None
+                self._schedule(creator, 0.0)
+                continue
+
+            await self._update(creator, False, creator.room_id)
+
+    async def _look_up(self, creator: WatchedCreator) -> None:
+        """
+        Check a creator through the user room API, which also finds the room of a new stream
+
+        :param creator: The creator
+        :return: None
+
+        """
+
+        try:
+            async with self._lookup_semaphore:
+                room_data: dict = await FetchRoomIdAPIRoute.fetch_user_room_data(web=self._web, unique_id=creator.unique_id)
+
+            # Offline creators may come back without a live room or room ID at all
+            data: dict = room_data.get("data") or {}
+            alive: bool = (data.get("liveRoom") or {}).get("status", ROOM_STATUS_OFFLINE) != ROOM_STATUS_OFFLINE
+            room_id: Optional[int] = int((data.get("user") or {}).get("roomId") or 0) or None
+        except UserNotFoundError:
+            self._logger.debug(f"Watched creator '@{creator.unique_id}' was not found. Checking again later.")
+            await self._update(creator, False, creator.room_id, interval=self._max_interval)
+            return
+        except Exception:
+            self._logger.error(f"Failed to look up '@{creator.unique_id}'.\n{traceback.format_exc()}")
+            self._schedule(creator, creator.interval)
+            return
+
+        await self._update(creator, alive and room_id is not None, room_id or creator.room_id)
+
+    async def _update(
+            self,
+            creator: WatchedCreator,
+            alive: bool,
+            room_id: Optional[int],
+            interval: Optional[float] = None
+    ) -> None:
+        """
+        Record a creator's status, reschedule them & call back if it changed
+
+        :param creator: The creator
+        :param alive: Whether they are live
+        :param room_id: Their room ID
+        :param interval: Override the time until the next check
+        :return: None
+
+        """
+
+        changed: bool = creator.is_live is not alive
+        was_live: bool = creator.is_live is True
+        creator.is_live, creator.room_id = alive, room_id
+
+        # Live creators are re-checked often, since batching makes it cheap. Offline ones back off while unchanged.
+        if interval is None:
+            interval = self._min_interval if alive or changed else min(creator.interval * self._backoff, self._max_interval)
+
+        self._schedule(creator, interval)
+
+        if self._identity_cache is not None and room_id:
+            if alive:
+                self._identity_cache.set_room_id(creator.unique_id, room_id)
+            else:
+                self._identity_cache.invalidate_room_id(creator.unique_id)
+
+        if changed and alive:
+            await self._notify(self._on_live, creator)
+        elif changed and was_live:
+            await self._notify(self._on_offline, creator)
+
+    def _schedule(self, creator: WatchedCreator, interval: float) -> None:
+        """
+        Set when a creator is next checked, with jitter so that creators added together spread out
+
+        :param creator: The creator
+        :param interval: The time until the check, in seconds
+        :return: None
+
+        """
+
+        creator.interval = interval or self._min_interval
+        creator.next_check = time.monotonic() + interval * random.uniform(0.9, 1.1)
+
+    async def _notify(self, callbacks: Iterable[LiveStatusCallback], creator: WatchedCreator) -> None:
+        """
+        Call back with a creator's status change
+
+        :param callbacks: The callbacks
+        :param creator: The creator
+        :return: None
+
+        """
+
+        for callback in callbacks:
+            try:
+                result: Any = callback(creator.unique_id, creator.room_id or 0)
+
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                self._logger.error(f"Live status callback failed for '@{creator.unique_id}'.\n{traceback.format_exc()}")
+
+    async def __aenter__(self) -> "LiveMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
@@ -0,0 +1,278 @@
+import asyncio
+import enum
+import time
+from asyncio import Task
+from dataclasses import dataclass
+from logging import Logger
+from typing import Optional, Dict, Tuple, List
+
+from TikTokLive.client.errors import UserOfflineError, UserNotFoundError
+from TikTokLive.client.logger import TikTokLiveLogHandler
+from TikTokLive.client.web.web_client import TikTokWebClient
+
+"""How long the first method gets before the other is launched, until its latency is known, in seconds"""
+DEFAULT_HEDGE_DELAY: float = 1.0
+
+"""Errors that answer the lookup (the user is offline, or doesn't exist), rather than failing it"""
+ANSWER_ERRORS: Tuple[type, ...] = (UserOfflineError, UserNotFoundError)
+
+
+class RoomIdMethod(enum.Enum):
+    """
+    The ways a room ID is looked up
+
+    """
+
+    HTML = "html"
+    """Scraping the user's live page"""
+
+    API = "api"
+    """The user room API"""
+
+
+@dataclass
+class RoomIdMethodStats:
+    """
+    How a lookup method has performed, smoothed over recent lookups
+
+    """
+
+    attempts: int = 0
+    """Lookups that finished, with an answer or not"""
+
+    wins: int = 0
+    """Lookups the method answered first"""
+
+    latency: Optional[float] = None
+    """The smoothed time to finish, in seconds"""
+
+    deviation: float = 0.0
+    """The smoothed deviation from that time, in seconds"""
+
+    success_rate: float = 1.0
+    """The smoothed share of lookups that finished with an answer"""
+
+    def record(self, elapsed: float, success: bool, smoothing: float) -> None:
+        """
+        Record a finished lookup
+
+        :param elapsed: How long it took, in seconds
+        :param success: Whether it answered
+        :param smoothing: The weight of this lookup against the previous ones
+        :return: None
+
+        """
+
+        self.attempts += 1
+        self.success_rate += smoothing * (float(success) - self.success_rate)
+        self._record_latency(elapsed, smoothing)
+
+    def record_cancelled(self, elapsed: float, smoothing: float) -> None:
+        """
+        Record a lookup cancelled once the other method answered. It would have taken at least `elapsed`.
+
+        :param elapsed: How long it ran, in seconds
+        :param smoothing: The weight of this lookup against the previous ones
+        :return: None
+
+        """
+
+        if self.latency is None or elapsed > self.latency:
+            self._record_latency(elapsed, smoothing)
+
+    def _record_latency(self, elapsed: float, smoothing: float) -> None:
+        if self.latency is None:
+            self.latency, self.deviation = elapsed, elapsed / 2
+        else:
+            self.deviation += smoothing * (abs(elapsed - self.latency) - self.deviation)
+            self.latency += smoothing * (elapsed - self.latency)
+
+    @property
+    def score(self) -> float:
+        """
+        The expected time to an answer, worse for methods that often fail. Unknown until the method has finished once.
+
+        :return: The score, in seconds (lower is better)
+
+        """
+
+        if self.latency is None:
+            return float("inf")
+
+        return self.latency / max(self.success_rate, 0.05)
+
+
+class RoomIdResolver:
+    """
+    Looks up room IDs through the live page HTML & the user room API, hedging one with the other.
+
+    The method that has been quicker & more reliable goes first. If it hasn't answered within the hedge delay (by
+    default, its usual latency plus four deviations, as with TCP retransmits) or fails, the other is launched too, &
+    whichever answers first wins while the other is cancelled. Share one resolver between clients to share its stats.
+
+    """
+
+    def __init__(
+            self,
+            hedge: bool = True,
+            hedge_delay: Optional[float] = None,
+            min_hedge_delay: float = 0.25,
+            max_hedge_delay: float = 3.0,
+            smoothing: float = 0.2
+    ):
+        """
+        Create a resolver
+
+        :param hedge: Whether to launch the second method when the first is slow. If not, it is only a fallback.
+        :param hedge_delay: How long to give the first method, in seconds. 0 launches both at once, None adapts it
+                            to the first method's latency.
+        :param min_hedge_delay: The shortest adaptive hedge delay, in seconds
+        :param max_hedge_delay: The longest adaptive hedge delay, in seconds
+        :param smoothing: The weight of each lookup in the stats
+
+        """
+
+        self._hedge: bool = hedge
+        self._hedge_delay: Optional[float] = hedge_delay
+        self._min_hedge_delay: float = min_hedge_delay
+        self._max_hedge_delay: float = max_hedge_delay
+        self._smoothing: float = smoothing
+        self._stats: Dict[RoomIdMethod, RoomIdMethodStats] = {method: RoomIdMethodStats() for method in RoomIdMethod}
+        self._logger: Logger = TikTokLiveLogHandler.get_logger()
+
+        self.hedged: int = 0
+
+    @property
+    def stats(self) -> Dict[RoomIdMethod, RoomIdMethodStats]:
+        """
+        Get the stats of each method
+
+        :return: The stats
+
+        """
+
+        return self._stats
+
+    def order(self) -> Tuple[RoomIdMethod, RoomIdMethod]:
+        """
+        Get the order to try the methods in. The HTML goes first until the API proves better.
+
+        :return: The methods, best first
+
+        """
+
+        if self._stats[RoomIdMethod.API].score < self._stats[RoomIdMethod.HTML].score:
+            return RoomIdMethod.API, RoomIdMethod.HTML
+
+        return RoomIdMethod.HTML, RoomIdMethod.API
+
+    def hedge_delay(self, method: RoomIdMethod) -> Optional[float]:
+        """
+        Get how long to give a method before launching the other
+
+        :param method: The method going first
+        :return: The delay, in seconds, or None to wait for it to fail
+
+        """
+
+        if not self._hedge:
+            return None
+
+        if self._hedge_delay is not None:
+            return self._hedge_delay
+
+        stats: RoomIdMethodStats = self._stats[method]
+
+        if stats.latency is None:
+            return DEFAULT_HEDGE_DELAY
+
+        return min(max(stats.latency + 4 * stats.deviation, self._min_hedge_delay), self._max_hedge_delay)
+
+    async def resolve(self, web: TikTokWebClient, unique_id: str) -> int:
+        """
+        Look up a user's room ID
+
+        :param web: The web client to look it up with
+        :param unique_id: The user's unique_id
+        :return: The room ID
+        :raises: UserOfflineError if the user is offline
+        :raises: UserNotFoundError if the user does not exist
+        :raises: The second method's error, from the first's, if both fail
+
+        """
+
+        first, second = self.order()
+        delay: Optional[float] = self.hedge_delay(first)
+        running: Dict[Task, Tuple[RoomIdMethod, float]] = {}
+        errors: List[Exception] = []
+
+        def launch(method: RoomIdMethod) -> None:
+            running[asyncio.create_task(self._fetch(web, method, unique_id))] = (method, time.monotonic())
+
+        launch(first)
+
+        if delay == 0:
+            launch(second)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=delay if len(running) + len(errors) < 2 else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                # The first method is slow, so race it
+                if not done:
+                    self._logger.debug(f"Room ID lookup through {first.value} is slow. Racing it with {second.value}.")
+                    self.hedged += 1
+                    launch(second)
+                    continue
+
+                for task in done:
+                    method, started = running.pop(task)
+                    elapsed: float = time.monotonic() - started
+
+                    try:
+                        room_id: int = task.result()
+                    except ANSWER_ERRORS:
+                        self._stats[method].record(elapsed, True, self._smoothing)
+                        raise
+                    except Exception as ex:
+                        self._stats[method].record(elapsed, False, self._smoothing)
+                        self._logger.debug(f"Failed to look up the room ID through {method.value}.")
+                        errors.append(ex)
+
+                        if len(running) + len(errors) < 2:
+                            launch(second)
+
+                        continue
+
+                    self._stats[method].record(elapsed, True, self._smoothing)
+                    self._stats[method].wins += 1
+                    return room_id
+
+            raise errors[-1] from errors[0]
+        finally:
+            for task, (method, started) in running.items():
+                task.cancel()
+                self._stats[method].record_cancelled(time.monotonic() - started, self._smoothing)
+
+            await asyncio.gather(*running, return_exceptions=True)
+
+    @classmethod
+    async def _fetch(cls, web: TikTokWebClient, method: RoomIdMethod, unique_id: str) -> int:
+        """
+        Look up a room ID through one method
+
+        :param web: The web client
+        :param method: The method
+        :param unique_id: The user's unique_id
+        :return: The room ID
+
+        """
+
+        if method == RoomIdMethod.HTML:
+            return int(await web.fetch_room_id_from_html(unique_id))
+
+        return int(await web.fetch_room_id_from_api(unique_id))
@@ -0,0 +1,3 @@
+from .sink_base import EventSink, SinkMetrics, OverflowPolicy, DEFAULT_SINK_EVENTS
+from .sink_file import FileSink
+from .sink_redis import RedisStreamSink, SUPPORTS_REDIS
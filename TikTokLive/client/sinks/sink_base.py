@@ -0,0 +1,338 @@
+import asyncio
+import dataclasses
+import enum
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Iterable, Type, List, Deque, Tuple, FrozenSet, Dict, Any
+
+import betterproto
+
+from TikTokLive.client.logger import TikTokLiveLogHandler
+from TikTokLive.events import Event
+from TikTokLive.events.proto_events import EVENT_MAPPINGS
+from TikTokLive.proto.proto_json import MessageJSONEncoder
+
+"""The events a sink takes when none are given: every proto event, as parsed from its Webcast message"""
+DEFAULT_SINK_EVENTS: FrozenSet[Type[Event]] = frozenset(EVENT_MAPPINGS.values())
+
+
+class OverflowPolicy(enum.Enum):
+    """
+    What a sink does with a new event when its queue is full, i.e. when the destination cannot keep up
+
+    """
+
+    # Make the client wait (back-pressure), which slows reading from the WebSocket
+    BLOCK = "block"
+
+    # Drop the new event
+    DROP_NEWEST = "drop_newest"
+
+    # Drop the oldest queued event to make room
+    DROP_OLDEST = "drop_oldest"
+
+
+@dataclass()
+class SinkMetrics:
+    """
+    Throughput & lag of a sink
+
+    """
+
+    events_received: int = 0
+    events_written: int = 0
+    events_dropped: int = 0
+    events_failed: int = 0
+    batches_written: int = 0
+    write_errors: int = 0
+
+    # Seconds from an event being queued to its batch being written, for the last batch & the worst so far
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+
+    # Seconds spent inside the destination's writes
+    write_seconds: float = 0.0
+
+    started_at: Optional[float] = None
+    last_write_at: Optional[float] = None
+
+    @property
+    def events_per_second(self) -> float:
+        """The write throughput since the first event was queued"""
+
+        if self.started_at is None or self.last_write_at is None or self.last_write_at <= self.started_at:
+            return 0.0
+
+        return self.events_written / (self.last_write_at - self.started_at)
+
+
+class EventSink(ABC):
+    """
+    Forward events to a destination in batches.
+
+    Events are queued as the client emits them & written by a background task, once a batch is full or its oldest event
+    has waited `max_latency` seconds. When the queue fills up, the overflow policy decides between back-pressure &
+    dropping events. Register a sink with `TikTokLiveClient.add_sink`, or feed one yourself with `put`.
+
+    """
+
+    def __init__(
+            self,
+            event_types: Optional[Iterable[Type[Event]]] = None,
+            max_batch: int = 500,
+            max_latency: float = 1.0,
+            max_pending: int = 10_000,
+            overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+            encoder: Optional[MessageJSONEncoder] = None
+    ):
+        """
+        Create a sink
+
+        :param event_types: The event types to take (exact types). Defaults to every proto event.
+        :param max_batch: Write once this many events are queued
+        :param max_latency: Write once the oldest queued event has waited this many seconds
+        :param max_pending: The most events to queue before the overflow policy applies
+        :param overflow: What to do with new events while the queue is full
+        :param encoder: The JSON encoder for event payloads
+
+        """
+
+        if max_pending < max_batch:
+            raise ValueError("A sink must be able to queue at least one full batch.")
+
+        self._event_types: FrozenSet[Type[Event]] = frozenset(event_types) if event_types is not None else DEFAULT_SINK_EVENTS
+        self._max_batch: int = max_batch
+        self._max_latency: float = max_latency
+        self._max_pending: int = max_pending
+        self._overflow: OverflowPolicy = overflow
+        self._encoder: MessageJSONEncoder = encoder or MessageJSONEncoder()
+        self._logger = TikTokLiveLogHandler.get_logger()
+
+        self._queue: Deque[Tuple[Event, float, float]] = deque()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._space: asyncio.Event = asyncio.Event()
+        self._write_lock: asyncio.Lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closed: bool = False
+
+        self.metrics: SinkMetrics = SinkMetrics()
+
+    @property
+    def pending(self) -> int:
+        """The number of queued events"""
+
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the sink has been closed"""
+
+        return self._closed
+
+    def accepts(self, event: Event) -> bool:
+        """
+        Check whether the sink takes an event
+
+        :param event: The event
+        :return: Whether it is one of the sink's event types
+
+        """
+
+        return type(event) in self._event_types
+
+    async def put(self, event: Event, received_at: Optional[float] = None) -> bool:
+        """
+        Queue an event. With the BLOCK policy, waits while the queue is full.
+
+        :param event: The event
+        :param received_at: The receive time (unix seconds). Defaults to now.
+        :return: Whether the event was queued (False if it is not taken, or was dropped)
+
+        """
+
+        if self._closed:
+            raise ValueError("Cannot put events into a closed sink.")
+
+        if not self.accepts(event):
+            return False
+
+        self._start()
+        self.metrics.events_received += 1
+
+        while len(self._queue) >= self._max_pending:
+            if self._overflow == OverflowPolicy.DROP_NEWEST:
+                self.metrics.events_dropped += 1
+                return False
+
+            if self._overflow == OverflowPolicy.DROP_OLDEST:
+                self._queue.popleft()
+                self.metrics.events_dropped += 1
+                break
+
+            self._space.clear()
+            await self._space.wait()
+
+        self._queue.append((event, time.time() if received_at is None else received_at, time.monotonic()))
+
+        # Wake the writer for the first event (to start the latency clock) & for a full batch
+        if len(self._queue) == 1 or len(self._queue) >= self._max_batch:
+            self._wakeup.set()
+
+        return True
+
+    async def flush(self) -> None:
+        """
+        Write every queued event now
+
+        :return: None
+
+        """
+
+        async with self._write_lock:
+            while self._queue:
+                await self._write_next()
+
+    async def close(self) -> None:
+        """
+        Flush the queue, stop the writer & release the destination
+
+        :return: None
+
+        """
+
+        if self._closed:
+            return
+
+        # The writer drains the queue without waiting out the latency, then stops
+        self._closed = True
+        self._wakeup.set()
+
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+        await self.flush()
+        await self._close()
+
+    def to_record(self, event: Event, received_at: float) -> Dict[str, Any]:
+        """
+        Convert an event to the JSON-ready record sinks write
+
+        :param event: The event
+        :param received_at: The receive time (unix seconds)
+        :return: The record, with the event type, receive time & data
+
+        """
+
+        if isinstance(event, betterproto.Message):
+            data: Dict[str, Any] = self._encoder.to_dict(event)
+        elif dataclasses.is_dataclass(event):
+            data: Dict[str, Any] = dataclasses.asdict(event)
+        else:
+            data: Dict[str, Any] = {}
+
+        return {"type": event.type, "received_at": received_at, "data": data}
+
+    @abstractmethod
+    async def write(self, events: List[Tuple[Event, float]]) -> None:
+        """
+        Write a batch to the destination
+
+        :param events: The events, with their receive times (unix seconds)
+        :return: None
+
+        """
+
+        raise NotImplementedError
+
+    async def _close(self) -> None:
+        """
+        Release the destination. Called once, after the final flush.
+
+        :return: None
+
+        """
+
+    def _start(self) -> None:
+        """
+        Start the writer task, if it is not running
+
+        :return: None
+
+        """
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        """
+        Write batches as they fill up or age out
+
+        :return: None
+
+        """
+
+        while True:
+            if not self._queue:
+                if self._closed:
+                    return
+
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # Wait for a full batch, or for the oldest event to reach the latency limit
+            remaining: float = self._max_latency - (time.monotonic() - self._queue[0][2])
+
+            if not self._closed and len(self._queue) < self._max_batch and remaining > 0:
+                self._wakeup.clear()
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            async with self._write_lock:
+                if self._queue:
+                    await self._write_next()
+
+    async def _write_next(self) -> None:
+        """
+        Write the next batch off the queue. Must be called holding the write lock.
+
+        :return: None
+
+        """
+
+        batch: List[Tuple[Event, float, float]] = [
+            self._queue.popleft() for _ in range(min(self._max_batch, len(self._queue)))
+        ]
+
+        # The queue has room again
+        self._space.set()
+
+        if self.metrics.started_at is None:
+            self.metrics.started_at = batch[0][2]
+
+        started: float = time.monotonic()
+
+        try:
+            await self.write([(event, received_at) for event, received_at, _ in batch])
+        except Exception:
+            self.metrics.write_errors += 1
+            self.metrics.events_failed += len(batch)
+            self._logger.error(f"{type(self).__name__} failed to write a batch of {len(batch)} events.", exc_info=True)
+            return
+
+        finished: float = time.monotonic()
+
+        self.metrics.events_written += len(batch)
+        self.metrics.batches_written += 1
+        self.metrics.write_seconds += finished - started
+        self.metrics.last_lag = finished - batch[0][2]
+        self.metrics.max_lag = max(self.metrics.max_lag, self.metrics.last_lag)
+        self.metrics.last_write_at = finished
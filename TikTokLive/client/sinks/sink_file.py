@@ -0,0 +1,88 @@
+import asyncio
+import os
+from typing import Union, List, Tuple, BinaryIO, Any
+
+from TikTokLive.client.sinks.sink_base import EventSink
+from TikTokLive.events import Event
+
+
+class FileSink(EventSink):
+    """
+    Append events to a file as JSON lines, one write per batch.
+
+    Each line is a record of the form {"type": ..., "received_at": ..., "data": {...}}.
+    The writes run in a worker thread, so the event loop never waits on the disk. Lines are written uncompressed,
+    so the file stays readable line by line. To archive a session compactly, capture its raw frames with a
+    `CaptureWriter(compression=True)` instead, which compresses them with a dictionary trained on the session.
+
+    """
+
+    def __init__(
+            self,
+            path: Union[str, os.PathLike],
+            fsync: bool = False,
+            **kwargs: Any
+    ):
+        """
+        Open a file sink, creating the file if it does not exist
+
+        :param path: The file to append to
+        :param fsync: Whether to fsync each batch
+        :param kwargs: Batching & overflow options, passed to EventSink
+
+        """
+
+        super().__init__(**kwargs)
+
+        self._path: str = os.fspath(path)
+        self._fsync: bool = fsync
+        self._file: BinaryIO = open(self._path, "ab")
+
+        self.bytes_written: int = 0
+
+    @property
+    def path(self) -> str:
+        """The file path"""
+
+        return self._path
+
+    async def write(self, events: List[Tuple[Event, float]]) -> None:
+        """
+        Append a batch as JSON lines
+
+        :param events: The events, with their receive times
+        :return: None
+
+        """
+
+        data: bytes = b"".join(
+            self._encoder.dumps(self.to_record(event, received_at)) + b"\n" for event, received_at in events
+        )
+
+        await asyncio.get_running_loop().run_in_executor(None, self._write_data, data)
+        self.bytes_written += len(data)
+
+    async def _close(self) -> None:
+        """
+        Close the file
+
+        :return: None
+
+        """
+
+        self._file.close()
+
+    def _write_data(self, data: bytes) -> None:
+        """
+        Write & flush data. Runs in a worker thread.
+
+        :param data: The data
+        :return: None
+
+        """
+
+        self._file.write(data)
+        self._file.flush()
+
+        if self._fsync:
+            os.fsync(self._file.fileno())
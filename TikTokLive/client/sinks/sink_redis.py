@@ -0,0 +1,94 @@
+from typing import List, Tuple, Any, Optional, Dict
+
+from TikTokLive.client.sinks.sink_base import EventSink
+from TikTokLive.events import Event
+
+"""Whether redis is installed"""
+try:
+    import redis.asyncio
+
+    SUPPORTS_REDIS: bool = True
+except ImportError:
+    SUPPORTS_REDIS: bool = False
+
+
+class RedisStreamSink(EventSink):
+    """
+    Add events to a Redis stream, one pipelined round trip per batch.
+
+    Each entry has the fields "type", "received_at" & "data" (the event as JSON).
+    The stream is capped (approximately) at `max_length` entries.
+
+    """
+
+    def __init__(
+            self,
+            stream: str = "tiktok:events",
+            url: str = "redis://localhost:6379/0",
+            max_length: Optional[int] = 100_000,
+            client: Optional["redis.asyncio.Redis"] = None,
+            **kwargs: Any
+    ):
+        """
+        Create a Redis stream sink
+
+        :param stream: The stream key
+        :param url: The Redis URL, used if no client is given
+        :param max_length: Trim the stream to about this many entries. None to never trim.
+        :param client: An existing redis.asyncio client to use (it is not closed with the sink)
+        :param kwargs: Batching & overflow options, passed to EventSink
+
+        """
+
+        if not SUPPORTS_REDIS:
+            raise ImportError(
+                'Cannot write to Redis without redis. '
+                'To install it, type "pip install TikTokLive[redis]".'
+            )
+
+        super().__init__(**kwargs)
+
+        self._stream: str = stream
+        self._max_length: Optional[int] = max_length
+        self._owns_client: bool = client is None
+        self._redis: redis.asyncio.Redis = client or redis.asyncio.Redis.from_url(url)
+
+    @property
+    def stream(self) -> str:
+        """The stream key"""
+
+        return self._stream
+
+    async def write(self, events: List[Tuple[Event, float]]) -> None:
+        """
+        Add a batch to the stream in one pipeline
+
+        :param events: The events, with their receive times
+        :return: None
+
+        """
+
+        pipeline = self._redis.pipeline(transaction=False)
+
+        for event, received_at in events:
+            record: Dict[str, Any] = self.to_record(event, received_at)
+
+            pipeline.xadd(
+                self._stream,
+                {"type": record["type"], "received_at": repr(received_at), "data": self._encoder.dumps(record["data"])},
+                maxlen=self._max_length,
+                approximate=True
+            )
+
+        await pipeline.execute()
+
+    async def _close(self) -> None:
+        """
+        Close the Redis connection, if the sink opened it
+
+        :return: None
+
+        """
+
+        if self._owns_client:
+            await self._redis.aclose()
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from httpx import Response
 
@@ -20,6 +20,8 @@ class FetchGifListRoute(ClientRoute):
 
     """
 
+    cache_ttl: Optional[float] = 300
+
     async def __call__(self, room_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Fetch the gift list from TikTok
@@ -31,8 +33,48 @@ class FetchGifListRoute(ClientRoute):
 
         try:
             response: Response = await self._web.get(
-                url=WebDefaults.tiktok_webcast_url + "/gift/list/"
+                url=WebDefaults.tiktok_webcast_url + "/gift/list/",
+                cache_ttl=self.cache_ttl
             )
             return response.json()["data"]
         except Exception as ex:
             raise FailedFetchGiftListError from ex
+
+    async def fetch_if_changed(
+            self,
+            validators: Optional[Dict[str, str]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+        """
+        Fetch the gift list with a conditional request, so an unchanged list is not downloaded again
+
+        :param validators: The validators returned by the last fetch ("etag" & "last_modified")
+        :return: The gift list (None if unchanged) & the validators for the next fetch
+
+        """
+
+        validators = validators or {}
+        headers: Dict[str, str] = {}
+
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            response: Response = await self._web.get(
+                url=WebDefaults.tiktok_webcast_url + "/gift/list/",
+                extra_headers=headers
+            )
+
+            if response.status_code == 304:
+                return None, validators
+
+            data: Dict[str, Any] = response.json()["data"]
+        except Exception as ex:
+            raise FailedFetchGiftListError from ex
+
+        return data, {
+            "etag": response.headers.get("etag", ""),
+            "last_modified": response.headers.get("last-modified", "")
+        }
@@ -1,11 +1,19 @@
-from typing import Union
+from typing import Union, Sequence, List, Optional
 
 from httpx import Response
 
+from TikTokLive.client.errors import TikTokLiveError
 from TikTokLive.client.web.web_base import ClientRoute
 from TikTokLive.proto import ImageModel
 
 
+class FailedFetchImageError(TikTokLiveError):
+    """
+    Thrown when an image could not be downloaded from any of its URLs
+
+    """
+
+
 class FetchImageDataRoute(ClientRoute):
     """
     Fetch an image from the TikTok CDN
@@ -14,13 +22,37 @@ class FetchImageDataRoute(ClientRoute):
 
     async def __call__(self, image: Union[str, ImageModel]) -> bytes:
         """
-        Fetch the image from TikTok
+        Fetch the image from TikTok, or from the web client's image cache
 
-        :param image: A betterproto Image message
-        :return:
+        :param image: A betterproto Image message (each of its mirror URLs is tried in turn), or an image URL
+        :return: The image bytes
 
         """
 
-        image_url: str = image.m_urls[0] if isinstance(image, ImageModel) else image
-        response: Response = await self._web.get(url=image_url)
-        return response.read()
+        urls: List[str] = list(image.m_urls) if isinstance(image, ImageModel) else [image]
+
+        if not urls:
+            raise FailedFetchImageError("The image has no URLs to fetch it from.")
+
+        return await self._web.image_cache.fetch(urls, self.download)
+
+    async def download(self, urls: Sequence[str]) -> bytes:
+        """
+        Download an image, falling back through its mirror URLs
+
+        :param urls: The image's URLs
+        :return: The image bytes
+
+        """
+
+        error: Optional[Exception] = None
+
+        for image_url in urls:
+            try:
+                response: Response = await self._web.get(url=image_url)
+                response.raise_for_status()
+                return response.read()
+            except Exception as ex:
+                error = ex
+
+        raise FailedFetchImageError(f"Failed to fetch the image from any of its {len(urls)} URL(s).") from error
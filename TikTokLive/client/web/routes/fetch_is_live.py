@@ -32,6 +32,8 @@ class FetchIsLiveRoute(ClientRoute):
 
     """
 
+    cache_ttl: Optional[float] = 0
+
     async def __call__(
             self,
             room_id: Optional[int] = None,
@@ -63,6 +65,20 @@ class FetchIsLiveRoute(ClientRoute):
 
         return await self.fetch_is_live_unique_id(unique_id)
 
+    def invalidate(self, room_id: int) -> int:
+        """
+        Drop a room's live status from the response cache, so the next check fetches it again
+
+        :param room_id: The room_id
+        :return: The number of responses dropped
+
+        """
+
+        return self._web.response_cache.invalidate(
+            f"GET {WebDefaults.tiktok_webcast_url}/room/check_alive/",
+            params={"room_ids": str(room_id)}
+        )
+
     async def fetch_is_live_room_ids(self, *room_ids: int) -> List[bool]:
         """
         Check whether a list of room_id's are currently live
@@ -74,7 +90,8 @@ class FetchIsLiveRoute(ClientRoute):
 
         response: Response = await self._web.get(
             url=WebDefaults.tiktok_webcast_url + f"/room/check_alive/",
-            extra_params={"room_ids": ",".join([str(room_id) for room_id in room_ids])}
+            extra_params={"room_ids": ",".join([str(room_id) for room_id in room_ids])},
+            cache_ttl=self.cache_ttl
         )
 
         response_json: dict = response.json()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from httpx import Response
 
 from TikTokLive.client.errors import UserNotFoundError
@@ -12,6 +14,8 @@ class FetchRoomIdAPIRoute(ClientRoute):
 
     """
 
+    cache_ttl: Optional[float] = 0
+
     async def __call__(self, unique_id: str) -> int:
         """
         Fetch the Room ID for a given unique_id from the TikTok API
@@ -30,6 +34,20 @@ class FetchRoomIdAPIRoute(ClientRoute):
         # Parse & update the web client
         return int(self.parse_room_id(room_data))
 
+    def invalidate(self, unique_id: str) -> int:
+        """
+        Drop a user's room data from the response cache, so the next lookup fetches it again
+
+        :param unique_id: The user's uniqueId
+        :return: The number of responses dropped
+
+        """
+
+        return self._web.response_cache.invalidate(
+            f"GET {WebDefaults.tiktok_app_url}/api-live/user/room/",
+            params={"uniqueId": unique_id}
+        )
+
     @classmethod
     async def fetch_user_room_data(cls, web: TikTokHTTPClient, unique_id: str) -> dict:
         """
@@ -48,7 +66,8 @@ class FetchRoomIdAPIRoute(ClientRoute):
                     "uniqueId": unique_id,
                     "sourceType": 54
                 }
-            )
+            ),
+            cache_ttl=cls.cache_ttl
         )
 
         response_json: dict = response.json()
@@ -1,7 +1,7 @@
 import json
 import re
 from json import JSONDecodeError
-from typing import Optional
+from typing import Optional, Tuple
 
 from httpx import Response
 
@@ -23,7 +23,16 @@ class FetchRoomIdLiveHTMLRoute(ClientRoute):
 
     """
 
+    cache_ttl: Optional[float] = 0
     SIGI_PATTERN: re.Pattern = re.compile(r"""<script id="SIGI_STATE" type="application/json">(.*?)</script>""")
+    SIGI_OPEN_TAG: str = '<script id="SIGI_STATE" type="application/json">'
+    SIGI_CLOSE_TAG: str = "</script>"
+
+    # The page is read up to the end of the SIGI_STATE tag, then the connection is closed
+    SIGI_MARKERS: Tuple[bytes, ...] = (SIGI_OPEN_TAG.encode(), SIGI_CLOSE_TAG.encode())
+
+    # Where the room user object starts, so it can be decoded without the rest of SIGI_STATE
+    ROOM_USER_PATTERN: re.Pattern = re.compile(r""""liveRoomUserInfo"\s*:\s*\{\s*"user"\s*:\s*""")
 
     async def __call__(self, unique_id: str) -> str:
         """
@@ -37,12 +46,25 @@ class FetchRoomIdLiveHTMLRoute(ClientRoute):
         # Get their livestream HTML
         response: Response = await self._web.get(
             url=WebDefaults.tiktok_app_url + f"/@{unique_id}/live",
-            base_params=False
+            base_params=False,
+            cache_ttl=self.cache_ttl,
+            read_until=self.SIGI_MARKERS
         )
 
         # Parse room ID
         return self.parse_room_id(response.text)
 
+    def invalidate(self, unique_id: str) -> int:
+        """
+        Drop a user's live page from the response cache, so the next lookup fetches it again
+
+        :param unique_id: The user's username
+        :return: The number of responses dropped
+
+        """
+
+        return self._web.response_cache.invalidate(f"GET {WebDefaults.tiktok_app_url}/@{unique_id}/live")
+
     @classmethod
     def parse_room_id(cls, html: str) -> str:
         """
@@ -55,26 +77,34 @@ class FetchRoomIdLiveHTMLRoute(ClientRoute):
 
         """
 
-        match: Optional[re.Match[str]] = cls.SIGI_PATTERN.search(html)
+        # Plain searches, as matching SIGI_PATTERN lazily over the whole tag costs more than decoding it
+        start: int = html.find(cls.SIGI_OPEN_TAG)
+        end: int = html.find(cls.SIGI_CLOSE_TAG, start) if start >= 0 else -1
 
-        if match is None:
+        if end < 0:
             raise FailedParseRoomIdError("Failed to extract the SIGI_STATE HTML tag, you might be blocked by TikTok.")
 
-        # Load SIGI_STATE JSON
-        try:
-            sigi_state: dict = json.loads(match.group(1))
-        except JSONDecodeError:
-            raise FailedParseRoomIdError("Failed to parse SIGI_STATE into JSON. Are you captcha-blocked by TikTok?")
-
-        # LiveRoom is missing for users that have never been live
-        if sigi_state.get('LiveRoom') is None:
-            raise UserNotFoundError(
-                "The requested user is not capable of going LIVE on TikTok, "
-                "has never gone live on TikTok, or does not exist.."
-            )
+        sigi_json: str = html[start + len(cls.SIGI_OPEN_TAG):end]
 
         # Method 1) Parse the room ID from liveRoomUserInfo/user#roomId
-        room_data: dict = sigi_state["LiveRoom"]["liveRoomUserInfo"]["user"]
+        room_data: Optional[dict] = cls.scan_room_user(sigi_json)
+
+        # Otherwise, load all of the SIGI_STATE JSON
+        if room_data is None:
+            try:
+                sigi_state: dict = json.loads(sigi_json)
+            except JSONDecodeError:
+                raise FailedParseRoomIdError("Failed to parse SIGI_STATE into JSON. Are you captcha-blocked by TikTok?")
+
+            # LiveRoom is missing for users that have never been live
+            if sigi_state.get('LiveRoom') is None:
+                raise UserNotFoundError(
+                    "The requested user is not capable of going LIVE on TikTok, "
+                    "has never gone live on TikTok, or does not exist.."
+                )
+
+            room_data = sigi_state["LiveRoom"]["liveRoomUserInfo"]["user"]
+
         room_id: str = room_data.get('roomId')
         username_str: str = f" '@{room_data['uniqueId']}' " if room_data.get('uniqueId') else " "
 
@@ -83,3 +113,25 @@ class FetchRoomIdLiveHTMLRoute(ClientRoute):
             raise UserOfflineError(f"The requested TikTok LIVE user{username_str}is offline.")
 
         return room_id
+
+    @classmethod
+    def scan_room_user(cls, sigi_state: str) -> Optional[dict]:
+        """
+        Decode only the LiveRoom/liveRoomUserInfo/user object of the SIGI_STATE JSON
+
+        :param sigi_state: The SIGI_STATE JSON
+        :return: The room user object, or None if it could not be found (parse all of SIGI_STATE instead)
+
+        """
+
+        match: Optional[re.Match[str]] = cls.ROOM_USER_PATTERN.search(sigi_state)
+
+        if match is None:
+            return None
+
+        try:
+            room_user, _ = json.JSONDecoder().raw_decode(sigi_state, match.end())
+        except JSONDecodeError:
+            return None
+
+        return room_user if isinstance(room_user, dict) else None
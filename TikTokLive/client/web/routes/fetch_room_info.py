@@ -24,6 +24,8 @@ class FetchRoomInfoRoute(ClientRoute):
 
     """
 
+    cache_ttl: Optional[float] = 0
+
     async def __call__(
             self,
             room_id: Optional[int] = None,
@@ -57,7 +59,8 @@ class FetchRoomInfoRoute(ClientRoute):
             # Fetch from API
             response: Response = await self._web.get(
                 url=url,
-                extra_params=extra_params
+                extra_params=extra_params,
+                cache_ttl=self.cache_ttl
             )
             # Get data
             data: dict = response.json().get("data", dict())
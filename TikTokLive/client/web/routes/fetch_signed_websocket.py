@@ -1,5 +1,4 @@
 import json
-import os
 from http.cookies import SimpleCookie
 from json import JSONDecodeError
 from typing import Optional
@@ -58,6 +57,9 @@ class FetchSignedWebSocketRoute(ClientRoute):
             sign_params['tt_target_idc'] = tt_target_idc
             self._logger.warning("Sending session ID to sign server for WebSocket connection. This is a risky operation.")
 
+        # Take a turn on the sign server quota shared by every client
+        await self._web.signer.rate_limiter.acquire()
+
         try:
             response: httpx.Response = await signer_client.get(
                 url=WebDefaults.tiktok_sign_url + "/webcast/fetch/",
@@ -82,17 +84,8 @@ class FetchSignedWebSocketRoute(ClientRoute):
         data: bytes = await response.aread()
 
         if response.status_code == 429:
-            data_json = response.json()
-            server_message: Optional[str] = None if os.environ.get('SIGN_SERVER_MESSAGE_DISABLED') else data_json.get("message")
-            limit_label: str = f"({data_json['limit_label']}) " if data_json.get("limit_label") else ""
-
-            raise SignatureRateLimitError(
-                server_message,
-                (
-                    f"{limit_label}Too many connections started, try again in %s seconds."
-                ),
-                response=response
-            )
+            self._web.signer.rate_limiter.on_rate_limited(response)
+            raise SignatureRateLimitError.from_response(response)
 
         elif not data:
             raise SignAPIError(
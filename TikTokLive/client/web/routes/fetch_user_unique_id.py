@@ -30,6 +30,7 @@ class FetchUserUniqueIdRoute(ClientRoute):
 
     """
 
+    cache_ttl: Optional[float] = 300
     APP_INFO_PATTERN: re.Pattern = re.compile(
         r"""<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">(.*?)</script>""")
 
@@ -45,7 +46,8 @@ class FetchUserUniqueIdRoute(ClientRoute):
         # Get their User HTML
         response: Response = await self._web.get(
             url=WebDefaults.tiktok_app_url + f"/@{user_id}",
-            base_params=False
+            base_params=False,
+            cache_ttl=self.cache_ttl
         )
 
         return self.parse_app_info(response.text)
@@ -1,14 +1,18 @@
 import logging
 import random
 from abc import ABC, abstractmethod
-from typing import Optional, Any, Awaitable, Dict, Literal, Union
+from typing import Optional, Any, Awaitable, Dict, Literal, Union, Sequence, Tuple
 
 import httpx
 from httpx import Cookies, AsyncClient, Proxy, URL
 
 from TikTokLive.client.logger import TikTokLiveLogHandler
+from TikTokLive.client.web.web_cache import ResponseCache
+from TikTokLive.client.web.web_image_cache import ImageCache
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
 from TikTokLive.client.web.web_settings import WebDefaults, SUPPORTS_CURL_CFFI
 from TikTokLive.client.web.web_signer import TikTokSigner, SignData
+from TikTokLive.client.web.web_transport import HostSettings, DEFAULT_HOST_SETTINGS, create_host_mounts, check_http2
 
 # Import the curl_cffi module if it is supported
 try:
@@ -17,6 +21,9 @@ try:
 except:
     from . import curl_cffi_dummy as curl_cffi
 
+"""Headers describing the full body, dropped from responses cut short by `read_until`"""
+PARTIAL_BODY_HEADERS: Tuple[str, ...] = ("content-encoding", "content-length", "transfer-encoding")
+
 
 class TikTokHTTPClient:
     """
@@ -29,7 +36,12 @@ class TikTokHTTPClient:
             web_proxy: Optional[Proxy] = None,
             httpx_kwargs: Optional[dict] = None,
             curl_cffi_kwargs: Optional[dict] = None,
-            signer_kwargs: Optional[dict] = None
+            signer_kwargs: Optional[dict] = None,
+            pool: Optional[TikTokHTTPPool] = None,
+            response_cache: Optional[ResponseCache] = None,
+            image_cache: Optional[ImageCache] = None,
+            http2: bool = False,
+            host_settings: Optional[Dict[str, HostSettings]] = None
     ):
         """
         Create an HTTP client for interacting with the various APIs
@@ -38,20 +50,67 @@ class TikTokHTTPClient:
         :param httpx_kwargs: Additional httpx kwargs
         :param curl_cffi_kwargs: Additional curl_cffi kwargs
         :param signer_kwargs: Additional signer kwargs
+        :param pool: An optional pool to share connections & the signer with other clients.
+                     Proxy, curl_cffi & signer options are then set on the pool instead.
+        :param response_cache: The cache for idempotent route responses. Defaults to the pool's, or one of its own.
+        :param image_cache: The cache for downloaded images. Defaults to the pool's, or one of its own (in memory).
+        :param http2: Whether to use HTTP/2 with TikTok & the sign server, where they support it (requires "h2")
+        :param host_settings: Pool size, keep-alive & connect timeout by host, on top of the DEFAULT_HOST_SETTINGS.
+                              None (the default) keeps one pool with the limits & timeout of httpx_kwargs.
 
         """
 
+        if pool is not None and (web_proxy or curl_cffi_kwargs or signer_kwargs or http2 or host_settings):
+            raise ValueError("Proxy, curl_cffi, signer & connection options must be set on the HTTP pool when one is used.")
+
+        self._pool: Optional[TikTokHTTPPool] = pool
+        httpx_kwargs = httpx_kwargs or dict()
+
+        if pool is None and http2:
+            check_http2(http2)
+            httpx_kwargs = {"http2": http2, **httpx_kwargs}
+
+        # Given host settings, each busy host gets its own tuned pool, unless the client's transports are set some
+        # other way. Otherwise, the client keeps the one pool, with the limits & timeout of httpx_kwargs.
+        if pool is None and host_settings is not None and "transport" not in httpx_kwargs and "mounts" not in httpx_kwargs:
+            httpx_kwargs = {
+                "mounts": create_host_mounts(
+                    {**DEFAULT_HOST_SETTINGS, **host_settings},
+                    http2=http2,
+                    proxy=web_proxy,
+                    **{key: httpx_kwargs[key] for key in ("verify", "cert", "trust_env") if key in httpx_kwargs}
+                ),
+                **httpx_kwargs
+            }
+
         # The HTTP client
         self._httpx: AsyncClient = self._create_httpx_client(
             proxy=web_proxy,
-            httpx_kwargs=httpx_kwargs or dict()
+            httpx_kwargs={**(pool.client_kwargs() if pool is not None else {}), **httpx_kwargs}
         )
 
         # The URL signer
-        self._tiktok_signer: TikTokSigner = TikTokSigner(**(signer_kwargs or dict()))
+        self._tiktok_signer: TikTokSigner = pool.signer if pool is not None else TikTokSigner(**{"http2": http2, **(signer_kwargs or dict())})
+
+        # Identical GETs share one request & cache by route
+        self._response_cache: ResponseCache = (
+            response_cache if response_cache is not None
+            else pool.response_cache if pool is not None
+            else ResponseCache()
+        )
 
-        # Special client for requests that check the TLS certificate
-        self._curl_cffi: Optional[curl_cffi.requests.AsyncSession] = curl_cffi.requests.AsyncSession(**(curl_cffi_kwargs or {})) if SUPPORTS_CURL_CFFI else None
+        self._image_cache: ImageCache = (
+            image_cache if image_cache is not None
+            else pool.image_cache if pool is not None
+            else ImageCache()
+        )
+
+        # Special client for requests that check the TLS certificate. A pooled client's is created on first use, as
+        # the pool's shared connections need the event loop.
+        if pool is not None:
+            self._curl_cffi: Optional[curl_cffi.requests.AsyncSession] = None
+        else:
+            self._curl_cffi: Optional[curl_cffi.requests.AsyncSession] = curl_cffi.requests.AsyncSession(**(curl_cffi_kwargs or {})) if SUPPORTS_CURL_CFFI else None
 
     @property
     def httpx_client(self) -> AsyncClient:
@@ -67,14 +126,51 @@ class TikTokHTTPClient:
     @property
     def curl_cffi_client(self) -> curl_cffi.requests.AsyncSession:
         """
-        Get the underlying `curl_cffi.requests.AsyncSession` instance
+        Get the underlying `curl_cffi.requests.AsyncSession` instance. Pooled clients each have their own, so cookies
+        set for one client aren't sent by the others.
 
         :return: The `curl_cffi.requests.AsyncSession` instance
 
         """
 
+        if self._curl_cffi is None and self._pool is not None:
+            self._curl_cffi = self._pool.create_curl_cffi_session()
+
         return self._curl_cffi
 
+    @property
+    def pool(self) -> Optional[TikTokHTTPPool]:
+        """
+        Get the shared pool the client is attached to, if any
+
+        :return: The pool
+
+        """
+
+        return self._pool
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """
+        Get the cache for idempotent route responses
+
+        :return: The response cache
+
+        """
+
+        return self._response_cache
+
+    @property
+    def image_cache(self) -> ImageCache:
+        """
+        Get the cache for downloaded images
+
+        :return: The image cache
+
+        """
+
+        return self._image_cache
+
     @property
     def signer(self) -> TikTokSigner:
         """
@@ -125,14 +221,21 @@ class TikTokHTTPClient:
 
     async def close(self) -> None:
         """
-        Close the HTTP client gracefully
+        Close the HTTP client gracefully. The connections of a shared pool are left open for its other clients.
 
         :return: None
 
         """
 
         await self._httpx.aclose()
-        await self._curl_cffi.close()
+
+        # The pool owns the curl_cffi connections, not the client's session
+        if self._curl_cffi is not None:
+            await self._curl_cffi.close()
+
+        # The pool owns the signer
+        if self._pool is None:
+            await self._tiktok_signer.client.aclose()
 
     def set_session(self, session_id: str | None, tt_target_idc: str | None) -> None:
         """
@@ -276,6 +379,8 @@ class TikTokHTTPClient:
             sign_url: bool = False,
             sign_url_method: Optional[str] = None,
             sign_url_type: Literal["xhr", "fetch"] = None,
+            cache_ttl: Optional[float] = None,
+            read_until: Optional[Sequence[bytes]] = None,
             **kwargs
     ) -> Union[httpx.Response, curl_cffi.requests.Response]:
         """
@@ -293,10 +398,26 @@ class TikTokHTTPClient:
         :param base_headers: Whether to include the base headers
         :param sign_url_method: The HTTP method to sign with
         :param sign_url_type: The type of signing to use
+        :param cache_ttl: Share identical in-flight requests & cache the response for this many seconds (0 only shares).
+                          None (the default) bypasses the cache. Signed, logged-in & non-GET requests always bypass it.
+                          A cached or shared response doesn't set its cookies on this client (see ResponseCache).
+        :param read_until: Stream the body & stop reading once these markers have all appeared, in order, closing the
+                           connection. The response holds the (decoded) body up to the end of the last marker.
         :return: An `httpx.Response` object
 
         """
 
+        # Only anonymous, unsigned GETs are the same for every client
+        cacheable: bool = (
+                cache_ttl is not None
+                and method.upper() == "GET"
+                and http_backend == "httpx"
+                and http_client is None
+                and not sign_url
+                and not kwargs
+                and not self.cookies.get("sessionid")
+        )
+
         # Build the request
         request: httpx.Request = await self.build_request(
             url=url,
@@ -318,7 +439,20 @@ class TikTokHTTPClient:
                 raise ValueError("Cannot use the curl_cffi client with httpx backend!")
 
             http_client = http_client or self._httpx
-            return await http_client.send(request)
+
+            async def send() -> httpx.Response:
+                if read_until:
+                    return await self._send_until(http_client, request, read_until)
+                return await http_client.send(request)
+
+            if cacheable:
+                return await self._response_cache.fetch(
+                    key=self._response_cache.request_key(request),
+                    ttl=cache_ttl,
+                    send=send
+                )
+
+            return await send()
 
         elif http_backend == "curl_cffi":
 
@@ -331,7 +465,7 @@ class TikTokHTTPClient:
             if isinstance(http_client, httpx.AsyncClient):
                 raise ValueError("Cannot use the httpx client with curl_cffi backend!")
 
-            http_client = http_client or self._curl_cffi
+            http_client = http_client or self.curl_cffi_client
             return await http_client.request(
                 url=str(request.url),
                 headers=request.headers,
@@ -344,6 +478,61 @@ class TikTokHTTPClient:
 
             raise ValueError("Invalid HTTP backend specified!")
 
+    @classmethod
+    async def _send_until(
+            cls,
+            http_client: httpx.AsyncClient,
+            request: httpx.Request,
+            markers: Sequence[bytes]
+    ) -> httpx.Response:
+        """
+        Send a request, reading the body only until the given markers have appeared (in order)
+
+        :param http_client: The client to send with
+        :param request: The request
+        :param markers: The markers to read until
+        :return: A response holding the body read, up to the end of the last marker (or all of it if one is missing)
+
+        """
+
+        response: httpx.Response = await http_client.send(request, stream=True)
+        body: bytearray = bytearray()
+        marker_idx, pos = 0, 0
+
+        try:
+            async for chunk in response.aiter_bytes():
+                body += chunk
+
+                # Pick up the search where the last chunk left off, keeping room for a marker split across chunks
+                while marker_idx < len(markers):
+                    found: int = body.find(markers[marker_idx], pos)
+
+                    if found < 0:
+                        pos = max(pos, len(body) - len(markers[marker_idx]) + 1)
+                        break
+
+                    pos = found + len(markers[marker_idx])
+                    marker_idx += 1
+
+                if marker_idx == len(markers):
+                    del body[pos:]
+                    break
+        finally:
+            await response.aclose()
+
+        # The body is already decoded & no longer complete, so it must not be described by the original headers
+        headers: httpx.Headers = response.headers.copy()
+
+        for header in PARTIAL_BODY_HEADERS:
+            headers.pop(header, None)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=bytes(body),
+            request=request
+        )
+
     async def get(
             self,
             url: str,
@@ -356,6 +545,8 @@ class TikTokHTTPClient:
             sign_url: bool = False,
             sign_url_method: Optional[str] = None,
             sign_url_type: Literal["xhr", "fetch"] = None,
+            cache_ttl: Optional[float] = None,
+            read_until: Optional[Sequence[bytes]] = None,
             **kwargs
     ) -> httpx.Response:
         return await self.request(
@@ -370,6 +561,8 @@ class TikTokHTTPClient:
             sign_url=sign_url,
             sign_url_method=sign_url_method,
             sign_url_type=sign_url_type,
+            cache_ttl=cache_ttl,
+            read_until=read_until,
             **kwargs
         )
 
@@ -385,6 +578,8 @@ class TikTokHTTPClient:
             sign_url: bool = False,
             sign_url_method: Optional[str] = None,
             sign_url_type: Literal["xhr", "fetch"] = None,
+            cache_ttl: Optional[float] = None,
+            read_until: Optional[Sequence[bytes]] = None,
             **kwargs
     ) -> httpx.Response:
         return await self.request(
@@ -399,6 +594,8 @@ class TikTokHTTPClient:
             sign_url=sign_url,
             sign_url_method=sign_url_method,
             sign_url_type=sign_url_type,
+            cache_ttl=cache_ttl,
+            read_until=read_until,
             **kwargs
         )
 
@@ -409,6 +606,11 @@ class ClientRoute(ABC):
 
     """
 
+    # How long to cache the route's responses, in seconds (see TikTokHTTPClient.request). None to never cache, 0 to
+    # only share identical requests in flight. Routes whose answers go stale (live status, room info & room ID) only
+    # share them. To cache those too, set a TTL on the route class (e.g. FetchRoomInfoRoute.cache_ttl = 5).
+    cache_ttl: Optional[float] = None
+
     def __init__(self, web: TikTokHTTPClient):
         """
         Instantiate a route
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple, Callable, Awaitable, Optional
+
+import httpx
+
+"""Query params that vary by request or client without changing the response, & so are left out of cache keys"""
+VOLATILE_PARAMS: Tuple[str, ...] = ("device_id", "referer", "root_referer")
+
+
+class ResponseCache:
+    """
+    A single-flight, TTL & LRU cache for idempotent GET responses.
+
+    Identical requests made while one is in flight share its response instead of going out again.
+    Successful responses are then kept for the TTL their route asks for, up to `max_entries` (least recently
+    used first out). Shared through a TikTokHTTPPool, it coalesces the requests of every client in the pool.
+
+    Only the client that sent a request gets its Set-Cookie headers (e.g. ttwid, msToken) in its cookie jar. Clients
+    served a cached or coalesced response don't, so a client must not rely on cookies from a cached route (such as
+    the live page). The cookies a connection needs come from the signed WebSocket fetch, which is never cached.
+
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Create a response cache
+
+        :param max_entries: The most responses to keep
+
+        """
+
+        self._max_entries: int = max_entries
+        self._entries: OrderedDict[str, Tuple[float, httpx.Response]] = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def request_key(cls, request: httpx.Request) -> str:
+        """
+        Build the cache key of a request
+
+        :param request: The request
+        :return: The method & URL, without the volatile params
+
+        """
+
+        url: httpx.URL = request.url
+
+        for param in VOLATILE_PARAMS:
+            url = url.copy_remove_param(param)
+
+        return f"{request.method} {url}"
+
+    async def fetch(
+            self,
+            key: str,
+            ttl: float,
+            send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Get a response from the cache, from an identical request in flight, or by sending the request
+
+        :param key: The cache key
+        :param ttl: How long to keep a successful response, in seconds (0 only coalesces in-flight requests)
+        :param send: Sends the request
+        :return: The response. Callers sharing a response must not modify it.
+
+        """
+
+        entry: Optional[Tuple[float, httpx.Response]] = self._entries.get(key)
+
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            del self._entries[key]
+
+        in_flight: Optional[asyncio.Future] = self._in_flight.get(key)
+
+        if in_flight is not None:
+            self.coalesced += 1
+
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # Only retry if the request we were sharing was cancelled, rather than us
+                if not in_flight.cancelled():
+                    raise
+
+                return await self.fetch(key, ttl, send)
+
+        self.misses += 1
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+
+        try:
+            response: httpx.Response = await send()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as ex:
+            future.set_exception(ex)
+
+            # Mark it retrieved, since there may be no other caller waiting on it
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+
+            if ttl > 0 and response.is_success:
+                self._store(key, ttl, response)
+
+            return response
+        finally:
+            del self._in_flight[key]
+
+    def invalidate(self, prefix: str = "", params: Optional[Dict[str, str]] = None) -> int:
+        """
+        Drop cached responses
+
+        :param prefix: Only drop keys starting with this (e.g. "GET https://www.tiktok.com/@user"). Defaults to all.
+        :param params: Only drop responses to URLs with these query params (e.g. {"uniqueId": "user"})
+        :return: The number of responses dropped
+
+        """
+
+        keys = [
+            key for key in self._entries
+            if key.startswith(prefix) and (not params or self._has_params(key, params))
+        ]
+
+        for key in keys:
+            del self._entries[key]
+
+        return len(keys)
+
+    @classmethod
+    def _has_params(cls, key: str, params: Dict[str, str]) -> bool:
+        """
+        Check whether a cached request's URL has the given query params
+
+        :param key: The cache key
+        :param params: The params
+        :return: Whether it has all of them
+
+        """
+
+        url_params: httpx.QueryParams = httpx.URL(key.split(" ", 1)[1]).params
+        return all(url_params.get(name) == value for name, value in params.items())
+
+    def _store(self, key: str, ttl: float, response: httpx.Response) -> None:
+        """
+        Cache a response, evicting the least recently used ones past the size limit
+
+        :param key: The cache key
+        :param ttl: How long to keep it, in seconds
+        :param response: The response
+        :return: None
+
+        """
+
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
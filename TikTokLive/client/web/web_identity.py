@@ -0,0 +1,217 @@
+import enum
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Tuple, Union
+
+"""How long a resolved room ID is trusted, in seconds. Stale ones are caught by the live check & re-resolved."""
+DEFAULT_ROOM_ID_TTL: float = 6 * 60 * 60
+
+"""How long a user ID's unique_id is trusted, in seconds. User IDs never change, but users can rename themselves."""
+DEFAULT_UNIQUE_ID_TTL: float = 7 * 24 * 60 * 60
+
+
+class IdentityKind(enum.Enum):
+    """
+    The identities the cache resolves
+
+    """
+
+    ROOM_ID = "room_id"
+    """A unique_id's current room ID"""
+
+    UNIQUE_ID = "unique_id"
+    """A user ID's unique_id"""
+
+
+class IdentityCache:
+    """
+    An in-memory cache of resolved identities (user ID → unique_id, unique_id → room ID), so that starting a
+    client can skip the scrapes that resolve them. Share one instance between clients with `identity_cache=...`.
+
+    Expiry uses wall-clock time, so that entries stay meaningful across restarts in persistent subclasses.
+
+    """
+
+    def __init__(
+            self,
+            room_id_ttl: float = DEFAULT_ROOM_ID_TTL,
+            unique_id_ttl: float = DEFAULT_UNIQUE_ID_TTL
+    ):
+        """
+        Create an identity cache
+
+        :param room_id_ttl: How long to trust a resolved room ID, in seconds
+        :param unique_id_ttl: How long to trust a user ID's unique_id, in seconds
+
+        """
+
+        self._ttls: Dict[IdentityKind, float] = {
+            IdentityKind.ROOM_ID: room_id_ttl,
+            IdentityKind.UNIQUE_ID: unique_id_ttl
+        }
+
+        self._entries: Dict[Tuple[IdentityKind, str], Tuple[float, str]] = {}
+
+    def get_room_id(self, unique_id: str) -> Optional[int]:
+        """
+        Get a user's cached room ID
+
+        :param unique_id: The user's unique_id
+        :return: The room ID, if cached & not expired
+
+        """
+
+        room_id: Optional[str] = self._get(IdentityKind.ROOM_ID, unique_id)
+        return int(room_id) if room_id is not None else None
+
+    def set_room_id(self, unique_id: str, room_id: Union[int, str]) -> None:
+        """
+        Cache a user's room ID
+
+        :param unique_id: The user's unique_id
+        :param room_id: Their room ID
+        :return: None
+
+        """
+
+        self._set(IdentityKind.ROOM_ID, unique_id, str(room_id))
+
+    def invalidate_room_id(self, unique_id: str) -> None:
+        """
+        Forget a user's room ID, e.g. once they go offline
+
+        :param unique_id: The user's unique_id
+        :return: None
+
+        """
+
+        self._delete(IdentityKind.ROOM_ID, unique_id)
+
+    def get_unique_id(self, user_id: Union[int, str]) -> Optional[str]:
+        """
+        Get the cached unique_id of a user ID
+
+        :param user_id: The numeric user ID
+        :return: The unique_id, if cached & not expired
+
+        """
+
+        return self._get(IdentityKind.UNIQUE_ID, str(user_id))
+
+    def set_unique_id(self, user_id: Union[int, str], unique_id: str) -> None:
+        """
+        Cache the unique_id of a user ID
+
+        :param user_id: The numeric user ID
+        :param unique_id: Their unique_id
+        :return: None
+
+        """
+
+        self._set(IdentityKind.UNIQUE_ID, str(user_id), unique_id)
+
+    def clear(self) -> None:
+        """
+        Forget every identity
+
+        :return: None
+
+        """
+
+        self._entries.clear()
+
+    def close(self) -> None:
+        """
+        Release the cache's resources
+
+        :return: None
+
+        """
+
+    def _get(self, kind: IdentityKind, key: str) -> Optional[str]:
+        entry: Optional[Tuple[float, str]] = self._entries.get((kind, key))
+
+        if entry is None:
+            return None
+
+        if entry[0] <= time.time():
+            del self._entries[(kind, key)]
+            return None
+
+        return entry[1]
+
+    def _set(self, kind: IdentityKind, key: str, value: str) -> None:
+        self._entries[(kind, key)] = (time.time() + self._ttls[kind], value)
+
+    def _delete(self, kind: IdentityKind, key: str) -> None:
+        self._entries.pop((kind, key), None)
+
+
+class SQLiteIdentityCache(IdentityCache):
+    """
+    An identity cache kept in an SQLite database, so that resolved identities survive restarts.
+    Several processes may share one database file.
+
+    """
+
+    def __init__(
+            self,
+            path: Union[str, os.PathLike],
+            room_id_ttl: float = DEFAULT_ROOM_ID_TTL,
+            unique_id_ttl: float = DEFAULT_UNIQUE_ID_TTL
+    ):
+        """
+        Open (or create) an identity database
+
+        :param path: The database file
+        :param room_id_ttl: How long to trust a resolved room ID, in seconds
+        :param unique_id_ttl: How long to trust a user ID's unique_id, in seconds
+
+        """
+
+        super().__init__(room_id_ttl=room_id_ttl, unique_id_ttl=unique_id_ttl)
+
+        self._lock: threading.Lock = threading.Lock()
+        self._db: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+
+        # WAL lets other processes read while one writes, & NORMAL skips an fsync per write
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS identities ("
+            "kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+            "PRIMARY KEY (kind, key))"
+        )
+
+        # Drop what expired while we were away
+        self._db.execute("DELETE FROM identities WHERE expires_at <= ?", (time.time(),))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM identities")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _get(self, kind: IdentityKind, key: str) -> Optional[str]:
+        with self._lock:
+            row: Optional[Tuple[str]] = self._db.execute(
+                "SELECT value FROM identities WHERE kind = ? AND key = ? AND expires_at > ?",
+                (kind.value, key, time.time())
+            ).fetchone()
+
+        return row[0] if row is not None else None
+
+    def _set(self, kind: IdentityKind, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO identities (kind, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (kind.value, key, value, time.time() + self._ttls[kind])
+            )
+
+    def _delete(self, kind: IdentityKind, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM identities WHERE kind = ? AND key = ?", (kind.value, key))
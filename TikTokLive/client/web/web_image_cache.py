@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import urllib.parse
+from collections import OrderedDict
+from logging import Logger
+from pathlib import Path
+from typing import Optional, Dict, Tuple, Callable, Awaitable, Sequence, Union
+
+from TikTokLive.client.logger import TikTokLiveLogHandler
+
+"""Query params TikTok's CDN signs or varies per request. They are left out of cache keys."""
+IMAGE_SIGNATURE_PARAMS: Tuple[str, ...] = (
+    "x-expires", "x-signature", "nonce", "refresh_token", "lk3s", "shp", "shcp", "idc", "ps"
+)
+
+"""The default memory budget of an image cache, in bytes"""
+DEFAULT_IMAGE_MEMORY_BYTES: int = 32 * 1024 * 1024
+
+
+def canonical_image_url(url: str) -> str:
+    """
+    Reduce a CDN URL to what identifies the image. Mirrors share paths, so the host is dropped along with
+    the signature params.
+
+    :param url: The image URL
+    :return: The path & remaining (sorted) query params
+
+    """
+
+    parts: urllib.parse.SplitResult = urllib.parse.urlsplit(url)
+    params = sorted(
+        (key, value) for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in IMAGE_SIGNATURE_PARAMS
+    )
+
+    return parts.path + ("?" + urllib.parse.urlencode(params) if params else "")
+
+
+class ImageCache:
+    """
+    A two-tier cache of image bytes: in memory (least recently used out, by total size) &, optionally, on disk.
+
+    On disk, images are stored once per content hash under `objects/`, with a small file per canonical URL under
+    `keys/` pointing at them, so the same image reached through different URLs is only kept once.
+    Concurrent fetches of the same image share one download.
+
+    """
+
+    def __init__(
+            self,
+            max_memory_bytes: int = DEFAULT_IMAGE_MEMORY_BYTES,
+            directory: Optional[Union[str, os.PathLike]] = None
+    ):
+        """
+        Create an image cache
+
+        :param max_memory_bytes: The most image bytes to keep in memory
+        :param directory: An optional directory to also keep images in, across restarts
+
+        """
+
+        self._max_memory_bytes: int = max_memory_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes: int = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._directory: Optional[Path] = Path(directory) if directory is not None else None
+
+        if self._directory is not None:
+            (self._directory / "keys").mkdir(parents=True, exist_ok=True)
+            (self._directory / "objects").mkdir(parents=True, exist_ok=True)
+
+        self._logger: Logger = TikTokLiveLogHandler.get_logger()
+
+        self.memory_hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        The image bytes held in memory
+
+        :return: The size, in bytes
+
+        """
+
+        return self._memory_bytes
+
+    @classmethod
+    def image_key(cls, url: str) -> str:
+        """
+        Get the cache key of an image
+
+        :param url: Any of the image's URLs
+        :return: The hash of its canonical URL
+
+        """
+
+        return hashlib.sha256(canonical_image_url(url).encode()).hexdigest()
+
+    async def fetch(
+            self,
+            urls: Sequence[str],
+            download: Callable[[Sequence[str]], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Get an image from memory, from disk, from a download in flight, or by downloading it
+
+        :param urls: The image's URLs (mirrors), the first of which keys the cache
+        :param download: Downloads the image, given its URLs
+        :return: The image bytes
+
+        """
+
+        key: str = self.image_key(urls[0])
+        data: Optional[bytes] = self._memory.get(key)
+
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return data
+
+        in_flight: Optional[asyncio.Future] = self._in_flight.get(key)
+
+        if in_flight is not None:
+            self.coalesced += 1
+
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # Only retry if the download we were sharing was cancelled, rather than us
+                if not in_flight.cancelled():
+                    raise
+
+                return await self.fetch(urls, download)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+
+        try:
+            data = await self._read_disk(key)
+
+            if data is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                data = await download(urls)
+
+                # The download is good even if it can't be kept on disk (e.g. the disk is full)
+                try:
+                    await self._write_disk(key, data)
+                except OSError:
+                    self._logger.error("Failed to write an image to the disk cache.", exc_info=True)
+
+            self._store(key, data)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as ex:
+            future.set_exception(ex)
+
+            # Mark it retrieved, since there may be no other caller waiting on it
+            future.exception()
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            del self._in_flight[key]
+
+    def clear_memory(self) -> None:
+        """
+        Drop the images held in memory. Those on disk are kept.
+
+        :return: None
+
+        """
+
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def _store(self, key: str, data: bytes) -> None:
+        """
+        Keep an image in memory, evicting the least recently used ones past the memory budget
+
+        :param key: The image key
+        :param data: The image bytes
+        :return: None
+
+        """
+
+        # Too big to keep without flushing everything else
+        if len(data) > self._max_memory_bytes:
+            return
+
+        previous: Optional[bytes] = self._memory.pop(key, None)
+        self._memory_bytes -= len(previous) if previous is not None else 0
+
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self._max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    async def _read_disk(self, key: str) -> Optional[bytes]:
+        """
+        Read an image from disk
+
+        :param key: The image key
+        :return: The image bytes, if on disk
+
+        """
+
+        if self._directory is None:
+            return None
+
+        return await asyncio.get_running_loop().run_in_executor(None, self._read_disk_sync, key)
+
+    async def _write_disk(self, key: str, data: bytes) -> None:
+        """
+        Write an image to disk
+
+        :param key: The image key
+        :param data: The image bytes
+        :return: None
+
+        """
+
+        if self._directory is None:
+            return
+
+        await asyncio.get_running_loop().run_in_executor(None, self._write_disk_sync, key, data)
+
+    def _read_disk_sync(self, key: str) -> Optional[bytes]:
+        try:
+            digest: str = (self._directory / "keys" / key).read_text().strip()
+            return (self._directory / "objects" / digest[:2] / digest).read_bytes()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def _write_disk_sync(self, key: str, data: bytes) -> None:
+        digest: str = hashlib.sha256(data).hexdigest()
+        object_path: Path = self._directory / "objects" / digest[:2] / digest
+
+        if not object_path.exists():
+            object_path.parent.mkdir(exist_ok=True)
+            self._write_atomic(object_path, data)
+
+        self._write_atomic(self._directory / "keys" / key, digest.encode())
+
+    @classmethod
+    def _write_atomic(cls, path: Path, data: bytes) -> None:
+        """
+        Write a file through a temporary one, so readers (& other processes) never see it half-written
+
+        :param path: The file
+        :param data: The contents
+        :return: None
+
+        """
+
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
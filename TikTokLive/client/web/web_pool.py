@@ -0,0 +1,227 @@
+from typing import Optional, Dict, Any, Union
+
+import httpx
+from httpx import Proxy, Limits, AsyncBaseTransport, AsyncHTTPTransport
+
+from TikTokLive.client.web.web_cache import ResponseCache
+from TikTokLive.client.web.web_image_cache import ImageCache
+from TikTokLive.client.web.web_settings import SUPPORTS_CURL_CFFI
+from TikTokLive.client.web.web_signer import TikTokSigner
+from TikTokLive.client.web.web_transport import HostSettings, DEFAULT_HOST_SETTINGS, create_host_mounts, check_http2, \
+    environment_proxies
+
+# Import the curl_cffi module if it is supported
+try:
+    import curl_cffi.requests
+# Otherwise, import a dummy class
+except:
+    from . import curl_cffi_dummy as curl_cffi
+
+if SUPPORTS_CURL_CFFI:
+
+    class SharedAsyncCurl(curl_cffi.AsyncCurl):
+        """
+        The curl_cffi connections shared by the pool's clients. A client closing its session leaves them open.
+
+        """
+
+        async def close(self) -> None:
+            return
+
+        async def close_shared(self) -> None:
+            """
+            Close the connections, for every client
+
+            :return: None
+
+            """
+
+            await super().close()
+
+"""The connection limits of a pool's default transport, sized for many clients"""
+DEFAULT_POOL_LIMITS: Limits = Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=30.0)
+
+
+class SharedTransport(AsyncBaseTransport):
+    """
+    A view of a pooled transport for one client. Closing the client leaves the pool open for the others.
+
+    """
+
+    def __init__(self, transport: AsyncBaseTransport):
+        """
+        Wrap a pooled transport
+
+        :param transport: The pooled transport
+
+        """
+
+        self._transport: AsyncBaseTransport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """The pool owns the transport, so closing a client does not close it"""
+
+
+class TikTokHTTPPool:
+    """
+    Connection pools shared by many clients: the httpx transports, the curl_cffi connections, the sign server client
+    & the response & image caches, so identical requests from clients starting together go out once.
+
+    Each client attached to the pool still has its own `httpx.AsyncClient`, so cookies, params & headers stay
+    per-client, while connections (and their TLS sessions) are reused across all of them. Pass the pool to
+    `TikTokLiveClient(http_pool=...)`, and close it once every client is done.
+
+    """
+
+    def __init__(
+            self,
+            limits: Limits = DEFAULT_POOL_LIMITS,
+            host_limits: Optional[Dict[str, Union[Limits, HostSettings]]] = None,
+            proxy: Optional[Proxy] = None,
+            http2: bool = False,
+            transport_kwargs: Optional[dict] = None,
+            curl_cffi_kwargs: Optional[dict] = None,
+            signer_kwargs: Optional[dict] = None,
+            cache_entries: int = 1024,
+            image_cache: Optional[ImageCache] = None
+    ):
+        """
+        Create a shared pool
+
+        :param limits: The connection limits for hosts without limits of their own
+        :param host_limits: Connection limits (or HostSettings, with a connect timeout) by host, on top of the
+                            DEFAULT_HOST_SETTINGS (e.g. {"webcast.tiktok.com": Limits(max_connections=50)}).
+                            Each host gets its own pool. Wildcards are allowed, as in httpx mounts ("*.tiktokcdn.com").
+        :param proxy: An optional proxy for every pooled HTTP connection
+        :param http2: Whether to use HTTP/2 where the server supports it (requires the "h2" package)
+        :param transport_kwargs: Additional `httpx.AsyncHTTPTransport` kwargs
+        :param curl_cffi_kwargs: Additional curl_cffi kwargs
+        :param signer_kwargs: Additional signer kwargs. The signer shares the pool's HTTP/2 setting.
+        :param cache_entries: The most responses to cache for the pool's clients
+        :param image_cache: The image cache for the pool's clients. Defaults to one in memory.
+
+        """
+
+        check_http2(http2)
+
+        self._transport_kwargs: Dict[str, Any] = {"proxy": proxy, "http2": http2, **(transport_kwargs or {})}
+        self._transport: AsyncHTTPTransport = AsyncHTTPTransport(limits=limits, **self._transport_kwargs)
+        self._host_transports: Dict[str, AsyncBaseTransport] = create_host_mounts(
+            {**DEFAULT_HOST_SETTINGS, **(host_limits or {})},
+            **self._transport_kwargs
+        )
+
+        # Clients given a transport don't read proxies from the environment, so the pool mounts them instead
+        self._proxy_transports: Dict[str, AsyncBaseTransport] = {}
+
+        if proxy is None and self._transport_kwargs.get("trust_env", True):
+            self._proxy_transports = {
+                pattern: (
+                    AsyncHTTPTransport(limits=limits, **{**self._transport_kwargs, "proxy": env_proxy})
+                    if env_proxy else self._transport
+                )
+                for pattern, env_proxy in environment_proxies().items()
+            }
+
+        self._signer: TikTokSigner = TikTokSigner(**{"http2": http2, **(signer_kwargs or {})})
+        self._curl_cffi_kwargs: dict = curl_cffi_kwargs or {}
+        self._async_curl: Optional["SharedAsyncCurl"] = None
+        self._response_cache: ResponseCache = ResponseCache(max_entries=cache_entries)
+        self._image_cache: ImageCache = image_cache if image_cache is not None else ImageCache()
+        self._closed: bool = False
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """The response cache shared by the pool's clients"""
+
+        return self._response_cache
+
+    @property
+    def image_cache(self) -> ImageCache:
+        """The image cache shared by the pool's clients"""
+
+        return self._image_cache
+
+    @property
+    def signer(self) -> TikTokSigner:
+        """The sign server client shared by the pool's clients"""
+
+        return self._signer
+
+    def create_curl_cffi_session(self) -> Optional[curl_cffi.requests.AsyncSession]:
+        """
+        Create a curl_cffi session for one client. Each client keeps its own cookies, over the pool's shared
+        connections. Must be called from the event loop.
+
+        :return: The session, or None if curl_cffi is not installed
+
+        """
+
+        if not SUPPORTS_CURL_CFFI:
+            return None
+
+        if self._closed:
+            raise RuntimeError("Cannot attach a client to a closed HTTP pool.")
+
+        if self._async_curl is None:
+            self._async_curl = SharedAsyncCurl()
+
+        return curl_cffi.requests.AsyncSession(async_curl=self._async_curl, **self._curl_cffi_kwargs)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the pool has been closed"""
+
+        return self._closed
+
+    def client_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the `httpx.AsyncClient` kwargs that route a client's requests through the pool
+
+        :return: The transport, environment proxy & per-host mounts
+
+        """
+
+        if self._closed:
+            raise RuntimeError("Cannot attach a client to a closed HTTP pool.")
+
+        return {
+            "transport": SharedTransport(self._transport),
+            "mounts": {
+                pattern: SharedTransport(transport)
+                for pattern, transport in {**self._proxy_transports, **self._host_transports}.items()
+            }
+        }
+
+    async def close(self) -> None:
+        """
+        Close every pooled connection. Clients attached to the pool can no longer make requests.
+
+        :return: None
+
+        """
+
+        if self._closed:
+            return
+
+        self._closed = True
+
+        transports = (self._transport, *self._proxy_transports.values(), *self._host_transports.values())
+
+        # Direct (NO_PROXY) mounts share the default transport
+        for transport in {id(transport): transport for transport in transports}.values():
+            await transport.aclose()
+
+        await self._signer.client.aclose()
+
+        if self._async_curl is not None:
+            await self._async_curl.close_shared()
+
+    async def __aenter__(self) -> "TikTokHTTPPool":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
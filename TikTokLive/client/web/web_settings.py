@@ -114,6 +114,14 @@ try:
 except ImportError:
     SUPPORTS_CURL_CFFI: bool = False
 
+"""Whether the h2 library is installed, for HTTP/2"""
+try:
+    import h2
+
+    SUPPORTS_H2: bool = True
+except ImportError:
+    SUPPORTS_H2: bool = False
+
 
 @dataclass()
 class _WebDefaults:
@@ -147,5 +155,6 @@ WebDefaults: _WebDefaults = _WebDefaults()
 __all__ = [
     "WebDefaults",
     "CLIENT_NAME",
-    "SUPPORTS_CURL_CFFI"
+    "SUPPORTS_CURL_CFFI",
+    "SUPPORTS_H2"
 ]
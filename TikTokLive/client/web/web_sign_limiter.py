@@ -0,0 +1,371 @@
+import asyncio
+import math
+import time
+import weakref
+from collections import deque
+from typing import Optional, Dict, Tuple, Deque
+
+import httpx
+
+from TikTokLive.client.errors import SignatureRateLimitError
+
+"""The quota window of a sign server limit label mentioning each unit, in seconds"""
+LIMIT_LABEL_WINDOWS: Dict[str, float] = {
+    "sec": 1,
+    "min": 60,
+    "hour": 60 * 60,
+    "day": 24 * 60 * 60,
+}
+
+"""How far back requests are counted towards the observed rate, in seconds"""
+OBSERVED_RATE_WINDOW: float = 60.0
+
+"""How many recent waits the limiter keeps to report percentiles"""
+RECENT_WAITS: int = 1024
+
+"""The longest a request waits for its turn before giving up, in seconds"""
+DEFAULT_MAX_WAIT: float = 60.0
+
+
+class SignRateLimiter:
+    """
+    A token bucket for sign server requests, shared by every client signing with the same server & API key.
+
+    It starts out unlimited, then learns the quota from 429 responses: a limit label & RateLimit-Limit header set a
+    cap per label (e.g. 10 per minute), while a bare 429 halves the rate requests were being made at. Every request
+    waits out the retry hint, & the rate creeps back up once 429s stop. Waiting requests are served first come, first
+    served, so a burst of clients starting at once connects in order rather than all retrying. A request that would
+    wait longer than `max_wait` (e.g. the quota resets in an hour) fails right away with a SignatureRateLimitError.
+
+    """
+
+    _shared: Dict[Tuple[Optional[str], Optional[str]], "SignRateLimiter"] = {}
+
+    def __init__(
+            self,
+            rate: Optional[float] = None,
+            burst: float = 5,
+            min_rate: float = 0.1,
+            recovery_interval: float = 60.0,
+            recovery_factor: float = 1.25,
+            max_wait: Optional[float] = DEFAULT_MAX_WAIT
+    ):
+        """
+        Create a limiter
+
+        :param rate: A starting rate, in requests per second. None is unlimited until the first 429.
+        :param burst: The most requests made at once, after the limiter is idle
+        :param min_rate: The slowest a bare 429 can bring the rate down to, in requests per second
+        :param recovery_interval: How long without a 429 before the rate is raised again, in seconds
+        :param recovery_factor: How much the rate is raised by each recovery interval
+        :param max_wait: The longest a request waits for its turn before a SignatureRateLimitError, in seconds.
+                         None waits as long as it takes.
+
+        """
+
+        self._rate: Optional[float] = rate
+        self._burst: float = burst
+        self._min_rate: float = min_rate
+        self._recovery_interval: float = recovery_interval
+        self._recovery_factor: float = recovery_factor
+        self._max_wait: Optional[float] = max_wait
+
+        self._quotas: Dict[str, float] = {}
+        self._tokens: float = burst
+        self._updated: float = time.monotonic()
+        self._paused_until: float = 0.0
+        self._rate_limited_by: Optional[httpx.Response] = None
+        self._last_change: float = 0.0
+        self._granted_at: Deque[float] = deque()
+        self._locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = weakref.WeakKeyDictionary()
+
+        self.acquired: int = 0
+        self.rate_limited: int = 0
+        self.gave_up: int = 0
+        self.waiting: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=RECENT_WAITS)
+
+    @classmethod
+    def shared(cls, sign_api_base: Optional[str], sign_api_key: Optional[str]) -> "SignRateLimiter":
+        """
+        Get the process-wide limiter for a sign server & API key, which share a quota
+
+        :param sign_api_base: The sign server URL
+        :param sign_api_key: The API key, if any
+        :return: The limiter
+
+        """
+
+        key: Tuple[Optional[str], Optional[str]] = (sign_api_base, sign_api_key)
+
+        if key not in cls._shared:
+            cls._shared[key] = cls()
+
+        return cls._shared[key]
+
+    @property
+    def rate(self) -> Optional[float]:
+        """
+        The rate requests are let through at: the learned rate, capped by every known quota
+
+        :return: The rate in requests per second, or None if unlimited
+
+        """
+
+        rates = [rate for rate in (self._rate, *self._quotas.values()) if rate is not None]
+        return min(rates) if rates else None
+
+    @property
+    def quotas(self) -> Dict[str, float]:
+        """
+        The quotas learned from limit labels
+
+        :return: The rate each label allows, in requests per second
+
+        """
+
+        return dict(self._quotas)
+
+    @property
+    def paused_for(self) -> float:
+        """
+        How long requests are held back for, after a 429's retry hint
+
+        :return: The time left, in seconds
+
+        """
+
+        return max(self._paused_until - time.monotonic(), 0.0)
+
+    @property
+    def mean_wait(self) -> float:
+        """
+        The average time requests waited for the limiter
+
+        :return: The time, in seconds
+
+        """
+
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+    def wait_percentile(self, percentile: float) -> float:
+        """
+        Get a percentile of the time recent requests waited for the limiter
+
+        :param percentile: The percentile, from 0 to 100
+        :return: The time, in seconds
+
+        """
+
+        if not self._recent_waits:
+            return 0.0
+
+        waits = sorted(self._recent_waits)
+        return waits[min(int(len(waits) * percentile / 100), len(waits) - 1)]
+
+    async def acquire(self) -> float:
+        """
+        Wait for a turn to make a sign server request. Waiting requests are served in order.
+
+        :return: How long it waited, in seconds
+        :raises SignatureRateLimitError: If the turn would come after `max_wait`
+
+        """
+
+        started: float = time.monotonic()
+        deadline: float = started + self._max_wait if self._max_wait is not None else math.inf
+        lock: asyncio.Lock = self._lock()
+        self.waiting += 1
+
+        try:
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout=None if math.isinf(deadline) else self._max_wait)
+            except asyncio.TimeoutError:
+                raise self._give_up(self._delay(time.monotonic()))
+
+            try:
+                while (delay := self._delay(time.monotonic())) > 0:
+                    # Fail now, rather than hold up the queue for a turn that comes too late
+                    if time.monotonic() + delay > deadline:
+                        raise self._give_up(delay)
+
+                    await asyncio.sleep(delay)
+
+                self._take(time.monotonic())
+            finally:
+                lock.release()
+        finally:
+            self.waiting -= 1
+
+        waited: float = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self._recent_waits.append(waited)
+        return waited
+
+    def on_rate_limited(self, response: httpx.Response) -> None:
+        """
+        Learn from a 429 response: hold requests back until it may be retried, & slow down
+
+        :param response: The 429 response
+        :return: None
+
+        """
+
+        try:
+            limit_label: Optional[str] = response.json().get("limit_label")
+        except (ValueError, AttributeError):
+            limit_label: Optional[str] = None
+
+        now: float = time.monotonic()
+        self.rate_limited += 1
+        self._rate_limited_by = response
+        self._paused_until = max(self._paused_until, now + self._retry_after(response))
+
+        limit: Optional[str] = response.headers.get("RateLimit-Limit")
+        window: Optional[float] = next(
+            (window for unit, window in LIMIT_LABEL_WINDOWS.items() if unit in (limit_label or "").lower()),
+            None
+        )
+
+        # The label says what the quota is
+        if limit and limit.isdigit() and window is not None:
+            self._quotas[limit_label] = int(limit) / window
+
+        # Otherwise, halve the rate requests were made at
+        else:
+            observed: float = self._observed_rate(now)
+            self._rate = max(min(self._rate or observed, observed) / 2, self._min_rate)
+
+        # Let one request through when the pause is up, then pace the rest
+        self._tokens = 1.0
+        self._updated = self._paused_until
+        self._last_change = now
+
+    def _lock(self) -> asyncio.Lock:
+        """
+        Get the queue of the running event loop. asyncio locks serve waiters in order.
+
+        :return: The lock
+
+        """
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        if loop not in self._locks:
+            self._locks[loop] = asyncio.Lock()
+
+        return self._locks[loop]
+
+    def _give_up(self, delay: float) -> SignatureRateLimitError:
+        """
+        Create the error for a request that won't get a turn in time, as for the last 429 but with the time left
+
+        :param delay: How long until the request could be made, in seconds
+        :return: The error
+
+        """
+
+        self.gave_up += 1
+        last: Optional[httpx.Response] = self._rate_limited_by
+        headers: httpx.Headers = httpx.Headers(last.headers if last is not None else None)
+
+        for header in ("Content-Encoding", "Content-Length", "Transfer-Encoding"):
+            headers.pop(header, None)
+
+        # Round up, so it never says to retry in 0 seconds
+        headers["RateLimit-Remaining"] = str(max(math.ceil(delay), 1))
+
+        return SignatureRateLimitError.from_response(
+            httpx.Response(status_code=429, headers=headers, content=last.content if last is not None else b"")
+        )
+
+    def _delay(self, now: float) -> float:
+        """
+        Get how long until a request may be made
+
+        :param now: The time (monotonic)
+        :return: The delay, in seconds
+
+        """
+
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        rate: Optional[float] = self.rate
+
+        if rate is None:
+            return 0.0
+
+        self._tokens = min(self._burst, self._tokens + max(now - self._updated, 0.0) * rate)
+        self._updated = max(now, self._updated)
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / rate
+
+    def _take(self, now: float) -> None:
+        """
+        Use a token for a request, raising the learned rate if there hasn't been a 429 in a while
+
+        :param now: The time (monotonic)
+        :return: None
+
+        """
+
+        if self.rate is not None:
+            self._tokens -= 1
+
+        if self._rate is not None and now - self._last_change >= self._recovery_interval:
+            self._rate *= self._recovery_factor
+            self._last_change = now
+
+        self._granted_at.append(now)
+
+        while self._granted_at and self._granted_at[0] < now - OBSERVED_RATE_WINDOW:
+            self._granted_at.popleft()
+
+    def _observed_rate(self, now: float) -> float:
+        """
+        Get the rate requests were recently let through at
+
+        :param now: The time (monotonic)
+        :return: The rate, in requests per second
+
+        """
+
+        recent: int = sum(1 for granted_at in self._granted_at if granted_at >= now - OBSERVED_RATE_WINDOW)
+
+        if not recent:
+            return self._min_rate
+
+        # Over the time since the first of them, so a burst at start isn't diluted over the whole window
+        return recent / max(now - self._granted_at[-recent], 1.0)
+
+    @classmethod
+    def _retry_after(cls, response: httpx.Response) -> float:
+        """
+        Read how long to wait from a 429 response
+
+        :param response: The response
+        :return: The time, in seconds
+
+        """
+
+        retry_after: float = 0.0
+
+        # The sign server sends the seconds until the limit resets as RateLimit-Remaining (see SignatureRateLimitError)
+        for header in ("Retry-After", "RateLimit-Remaining"):
+            try:
+                retry_after = max(retry_after, float(response.headers[header]))
+            except (KeyError, ValueError):
+                continue
+
+        # A Unix timestamp, or (as in the IETF draft) seconds
+        try:
+            reset: float = float(response.headers["RateLimit-Reset"])
+            retry_after = max(retry_after, reset - time.time() if reset > 10 ** 9 else reset)
+        except (KeyError, ValueError):
+            pass
+
+        return retry_after
@@ -7,8 +7,11 @@ import httpx
 from httpx import URL
 
 from TikTokLive.__version__ import PACKAGE_VERSION
-from TikTokLive.client.errors import UnexpectedSignatureError, SignatureMissingTokensError, PremiumEndpointError
+from TikTokLive.client.errors import UnexpectedSignatureError, SignatureMissingTokensError, PremiumEndpointError, \
+    SignatureRateLimitError
 from TikTokLive.client.web.web_settings import WebDefaults
+from TikTokLive.client.web.web_sign_limiter import SignRateLimiter
+from TikTokLive.client.web.web_transport import HostSettings, SIGN_SERVER_SETTINGS, create_host_transport
 from TikTokLive.client.web.web_utils import check_authenticated_session
 
 
@@ -44,12 +47,20 @@ class TikTokSigner:
     def __init__(
             self,
             sign_api_key: Optional[str] = None,
-            sign_api_base: Optional[str] = None
+            sign_api_base: Optional[str] = None,
+            http2: bool = False,
+            host_settings: HostSettings = SIGN_SERVER_SETTINGS,
+            rate_limiter: Optional[SignRateLimiter] = None
     ):
         """
         Initialize the signing class
 
         :param sign_api_key: API key for signing requests
+        :param sign_api_base: The sign server URL
+        :param http2: Whether to use HTTP/2 with the sign server, if it supports it (requires the "h2" package)
+        :param host_settings: The pool size, keep-alive & connect timeout for the sign server
+        :param rate_limiter: The limiter to pace sign server requests with. By default, the one shared process-wide by
+                             every signer with the same sign server & API key.
 
         """
 
@@ -63,9 +74,18 @@ class TikTokSigner:
         if self._sign_api_key:
             initial_headers['X-Api-Key'] = self._sign_api_key
 
+        self._rate_limiter: SignRateLimiter = rate_limiter or SignRateLimiter.shared(self._sign_api_base, self._sign_api_key)
+
+        # Through the environment's proxy, if any, as the transport turns off httpx's own
         self._httpx: httpx.AsyncClient = httpx.AsyncClient(
             headers=initial_headers,
-            verify=False
+            verify=False,
+            transport=create_host_transport(
+                host_settings,
+                http2=http2,
+                host=URL(self._sign_api_base).host if self._sign_api_base else None,
+                verify=False
+            )
         )
 
     @property
@@ -73,6 +93,11 @@ class TikTokSigner:
         """API key for signing requests"""
         return self._sign_api_key
 
+    @property
+    def rate_limiter(self) -> SignRateLimiter:
+        """The limiter pacing sign server requests"""
+        return self._rate_limiter
+
     async def webcast_sign(
             self,
             url: str | URL,
@@ -108,6 +133,9 @@ class TikTokSigner:
         for param in must_remove_params:
             url = re.sub(rf"({param}=[^&]*&?)", "", url).rstrip('&').rstrip('?')
 
+        # Take a turn on the sign server quota shared by every client
+        await self._rate_limiter.acquire()
+
         try:
 
             payload: dict = {
@@ -134,6 +162,10 @@ class TikTokSigner:
                 "Failed to sign a request due to an error."
             ) from ex
 
+        if response.status_code == 429:
+            self._rate_limiter.on_rate_limited(response)
+            raise SignatureRateLimitError.from_response(response)
+
         try:
             sign_response = response.json()
         except Exception as ex:
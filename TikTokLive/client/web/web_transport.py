@@ -0,0 +1,289 @@
+import ipaddress
+import re
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Union, Tuple
+from urllib.request import getproxies
+
+import httpx
+from httpx import Limits, AsyncBaseTransport, AsyncHTTPTransport
+
+from TikTokLive.client.web.web_settings import SUPPORTS_H2
+
+
+@dataclass(frozen=True)
+class HostSettings:
+    """
+    Connection settings for one host: pool size, keep-alive & connect timeout
+
+    """
+
+    max_connections: Optional[int] = 100
+    """The most connections open to the host"""
+
+    max_keepalive_connections: Optional[int] = 20
+    """The most idle connections kept open to the host"""
+
+    keepalive_expiry: Optional[float] = 30.0
+    """How long an idle connection is kept open, in seconds"""
+
+    connect_timeout: Optional[float] = None
+    """How long to wait for a connection, in seconds. None keeps the client's timeout."""
+
+    @property
+    def limits(self) -> Limits:
+        """The settings as `httpx.Limits`"""
+
+        return Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    @classmethod
+    def from_limits(cls, limits: Union[Limits, "HostSettings"]) -> "HostSettings":
+        """
+        Read settings from `httpx.Limits`
+
+        :param limits: The limits (or settings, returned as-is)
+        :return: The settings
+
+        """
+
+        if isinstance(limits, HostSettings):
+            return limits
+
+        return cls(
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry
+        )
+
+
+"""
+Settings for the hosts a client talks to at start, tuned for many rooms starting at once. Connections are kept
+alive well past httpx's 5 seconds, since rooms poll & re-sign at longer intervals, & as many are kept as may be
+opened, so a burst doesn't close & re-open them. Failing connects fail fast.
+
+"""
+DEFAULT_HOST_SETTINGS: Dict[str, HostSettings] = {
+    "webcast.tiktok.com": HostSettings(max_connections=50, max_keepalive_connections=50, keepalive_expiry=60.0, connect_timeout=5.0),
+    "www.tiktok.com": HostSettings(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60.0, connect_timeout=5.0),
+}
+
+"""Settings for the sign server client"""
+SIGN_SERVER_SETTINGS: HostSettings = HostSettings(
+    max_connections=20,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+    connect_timeout=5.0
+)
+
+
+class HostTransport(AsyncBaseTransport):
+    """
+    A transport for one host that applies the host's connect timeout to every request
+
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, connect_timeout: Optional[float] = None):
+        """
+        Wrap a transport
+
+        :param transport: The transport
+        :param connect_timeout: The connect timeout, in seconds. None keeps the request's.
+
+        """
+
+        self._transport: AsyncBaseTransport = transport
+        self._connect_timeout: Optional[float] = connect_timeout
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._connect_timeout is not None:
+            request.extensions["timeout"] = {**request.extensions.get("timeout", {}), "connect": self._connect_timeout}
+
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def check_http2(http2: bool) -> None:
+    """
+    Make sure HTTP/2 can be used, if asked for
+
+    :param http2: Whether HTTP/2 was asked for
+    :return: None
+    :raises: ImportError if the "h2" package is missing
+
+    """
+
+    if http2 and not SUPPORTS_H2:
+        raise ImportError(
+            'Cannot use HTTP/2 without the "http2" package extension for h2. '
+            'To install it, type "pip install TikTokLive[http2]".'
+        )
+
+
+def _is_ip_address(host: str) -> bool:
+    """
+    Check whether a NO_PROXY entry is an IP address (or network, e.g. "192.168.0.0/16")
+
+    :param host: The entry
+    :return: Whether it is an IPv4 or IPv6 address
+
+    """
+
+    try:
+        ipaddress.ip_address(host.split("/")[0])
+    except ValueError:
+        return False
+
+    return True
+
+
+def environment_proxies() -> Dict[str, Optional[str]]:
+    """
+    Read the proxies in the environment (HTTP_PROXY, HTTPS_PROXY, ALL_PROXY & NO_PROXY) as httpx mount patterns, the
+    way httpx does when it isn't given a transport. A pattern mapped to None connects directly.
+
+    :return: The proxy URL by mount pattern (e.g. {"https://": "http://proxy:8080", "all://*example.com": None})
+
+    """
+
+    proxy_info: Dict[str, str] = getproxies()
+    proxies: Dict[str, Optional[str]] = {}
+
+    for scheme in ("http", "https", "all"):
+        if proxy_info.get(scheme):
+            proxy: str = proxy_info[scheme]
+            proxies[f"{scheme}://"] = proxy if "://" in proxy else f"http://{proxy}"
+
+    # NO_PROXY entries are matched as curl does: "example.com" also covers its subdomains, & "*" turns proxies off
+    for host in (host.strip() for host in proxy_info.get("no", "").split(",")):
+        if host == "*":
+            return {}
+        elif not host:
+            continue
+        elif "://" in host:
+            proxies[host] = None
+        elif _is_ip_address(host):
+            proxies[f"all://[{host}]" if ":" in host else f"all://{host}"] = None
+        elif host.lower() == "localhost":
+            proxies[f"all://{host}"] = None
+        else:
+            proxies[f"all://*{host}"] = None
+
+    return proxies
+
+
+def _pattern_matches(pattern: httpx.URL, url: httpx.URL) -> bool:
+    """
+    Check whether a URL falls under an httpx mount pattern
+
+    :param pattern: The pattern (e.g. "https://", "all://*example.com")
+    :param url: The URL
+    :return: Whether it matches
+
+    """
+
+    if pattern.scheme not in ("all", url.scheme):
+        return False
+
+    if pattern.port is not None and pattern.port != url.port:
+        return False
+
+    host: str = "" if pattern.host == "*" else pattern.host
+
+    # "*.example.com" matches subdomains only, "*example.com" the domain too
+    if host.startswith("*."):
+        return re.match(rf"^.+\.{re.escape(host[2:])}$", url.host) is not None
+    elif host.startswith("*"):
+        return re.match(rf"^(.+\.)?{re.escape(host[1:])}$", url.host) is not None
+
+    return not host or host == url.host
+
+
+def _pattern_priority(pattern: httpx.URL) -> Tuple[int, int, int]:
+    """
+    Get how specific an httpx mount pattern is, so the most specific can be matched first: with a port, then by the
+    length of the host, then of the scheme
+
+    :param pattern: The pattern
+    :return: The priority (lowest first)
+
+    """
+
+    host: str = "" if pattern.host == "*" else pattern.host
+    scheme: str = "" if pattern.scheme == "all" else pattern.scheme
+    return 0 if pattern.port is not None else 1, -len(host), -len(scheme)
+
+
+def environment_proxy(host: str) -> Optional[str]:
+    """
+    Get the proxy httpx would take from the environment (HTTPS_PROXY, ALL_PROXY & NO_PROXY) for HTTPS requests to a host.
+    Explicit transports & mounts don't get it from httpx, so it is passed to them instead.
+
+    :param host: The host. Wildcards are allowed, as in httpx mounts ("*.tiktokcdn.com").
+    :return: The proxy URL, or None to connect directly
+
+    """
+
+    url: httpx.URL = httpx.URL(f"https://{host.lstrip('*.')}")
+    proxies = sorted(
+        ((httpx.URL(pattern), proxy) for pattern, proxy in environment_proxies().items()),
+        key=lambda item: _pattern_priority(item[0])
+    )
+
+    # The most specific pattern wins, as with httpx mounts
+    return next((proxy for pattern, proxy in proxies if _pattern_matches(pattern, url)), None)
+
+
+def create_host_transport(
+        settings: HostSettings,
+        http2: bool = False,
+        host: Optional[str] = None,
+        **transport_kwargs: Any
+) -> HostTransport:
+    """
+    Create a transport with a host's settings
+
+    :param settings: The host's settings
+    :param http2: Whether to use HTTP/2 where the server supports it
+    :param host: The host the transport is for. Unless a proxy is given (or trust_env is off), it uses the
+                 environment's proxy for the host.
+    :param transport_kwargs: Additional `httpx.AsyncHTTPTransport` kwargs (e.g. proxy)
+    :return: The transport
+
+    """
+
+    check_http2(http2)
+
+    if host is not None and transport_kwargs.get("proxy") is None and transport_kwargs.get("trust_env", True):
+        transport_kwargs["proxy"] = environment_proxy(host)
+
+    return HostTransport(
+        AsyncHTTPTransport(limits=settings.limits, http2=http2, **transport_kwargs),
+        connect_timeout=settings.connect_timeout
+    )
+
+
+def create_host_mounts(
+        host_settings: Dict[str, Union[Limits, HostSettings]],
+        http2: bool = False,
+        **transport_kwargs: Any
+) -> Dict[str, HostTransport]:
+    """
+    Create `httpx.AsyncClient` mounts giving each host its own pool & settings
+
+    :param host_settings: Settings by host. Wildcards are allowed, as in httpx mounts ("*.tiktokcdn.com").
+    :param http2: Whether to use HTTP/2 where the servers support it
+    :param transport_kwargs: Additional `httpx.AsyncHTTPTransport` kwargs (e.g. proxy). Without a proxy, each host
+                             uses the environment's proxy for it, as httpx would.
+    :return: The mounts
+
+    """
+
+    return {
+        f"all://{host}": create_host_transport(HostSettings.from_limits(settings), http2=http2, host=host, **transport_kwargs)
+        for host, settings in host_settings.items()
+    }
@@ -7,6 +7,7 @@ import httpx
 from betterproto import Message
 from websockets.legacy.client import WebSocketClientProtocol
 
+from TikTokLive.client.capture import CaptureWriter
 from TikTokLive.client.logger import TikTokLiveLogHandler
 from TikTokLive.client.web.web_settings import WebDefaults
 from TikTokLive.client.ws.ws_connect import WebcastProxyConnect, WebcastConnect, WebcastProxy, WebcastIterator
@@ -170,7 +171,8 @@ class WebcastWSClient:
             user_agent: str,
             initial_webcast_response: ProtoMessageFetchResult,
             process_connect_events: bool = True,
-            compress_ws_events: bool = True
+            compress_ws_events: bool = True,
+            capture: Optional[CaptureWriter] = None
     ) -> AsyncIterator[ProtoMessageFetchResult]:
         """
         Connect to the Webcast server & iterate over response messages.
@@ -202,6 +204,7 @@ class WebcastWSClient:
         :param cookies: The cookies to pass to the WebSocket connection
         :param process_connect_events: Whether to process the initial events sent in the first fetch
         :param compress_ws_events: Whether to ask TikTok to gzip the WebSocket events
+        :param capture: An optional writer to append the raw frames to
         :return: Yields ProtoMessageFetchResultMessage, the messages within ProtoMessageFetchResult.messages
 
         """
@@ -223,6 +226,7 @@ class WebcastWSClient:
             subprotocols=ws_kwargs.pop("subprotocols", ["echo-protocol"]),
             logger=self._logger,
             uri=ws_kwargs.pop('uri', None),  # Always *should* be none as we build this internally
+            capture=capture,
             base_uri_append_str=(ws_kwargs.pop("base_uri_append_str", WebDefaults.ws_client_params_append_str)),
 
             # Base URI parameters
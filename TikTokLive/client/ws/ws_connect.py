@@ -8,6 +8,7 @@ from websockets.legacy.client import Connect, WebSocketClientProtocol
 from websockets_proxy import websockets_proxy
 from websockets_proxy.websockets_proxy import ProxyConnect
 
+from TikTokLive.client.capture import CaptureWriter, CaptureRecordKind
 from TikTokLive.client.errors import WebcastBlocked200Error
 from TikTokLive.client.ws.ws_utils import extract_webcast_response_message, build_webcast_uri, extract_websocket_options
 from TikTokLive.proto import ProtoMessageFetchResult
@@ -33,6 +34,7 @@ class WebcastConnect(Connect):
             base_uri_params: Dict[str, Any],
             base_uri_append_str: str,
             uri: Optional[str] = None,
+            capture: Optional[CaptureWriter] = None,
             **kwargs
     ):
 
@@ -50,6 +52,7 @@ class WebcastConnect(Connect):
         self._ws: Optional[WebSocketClientProtocol] = None
         self._ws_options: Optional[dict[str, str]] = None
         self._initial_response: ProtoMessageFetchResult = initial_webcast_response
+        self._capture: Optional[CaptureWriter] = capture
 
     @property
     def ws(self) -> Optional[WebSocketClientProtocol]:
@@ -84,6 +87,14 @@ class WebcastConnect(Connect):
                 self._ws = protocol
                 self._ws_options = extract_websocket_options(self._ws.response_headers)
 
+                # <Optional> Capture the first ProtoMessageFetchResult (it has already been parsed, so it is re-serialized)
+                if self._capture is not None:
+                    self._capture.write(
+                        kind=CaptureRecordKind.FETCH_RESULT,
+                        payload=bytes(self._initial_response),
+                        msg_ids=[message.msg_id for message in self._initial_response.messages]
+                    )
+
                 # Yield the first ProtoMessageFetchResult
                 yield None, self._initial_response
 
@@ -95,12 +106,24 @@ class WebcastConnect(Connect):
 
                     # Only deal with messages
                     if webcast_push_frame.payload_type != "msg":
+                        if self._capture is not None:
+                            self._capture.write(kind=CaptureRecordKind.PUSH_FRAME, payload=payload_bytes)
+
                         webcast_push_frame.payload = extract_webcast_response_message(webcast_push_frame, logger=self._logger)
                         self._logger.debug(f"Received payload of type '{webcast_push_frame.payload_type}', not 'msg': {webcast_push_frame}")
                         continue
 
                     # If it is of type msg, we can extract the ProtoMessageFetchResult item within
                     webcast_response: ProtoMessageFetchResult = extract_webcast_response_message(webcast_push_frame, logger=self._logger)
+
+                    # <Optional> Capture the raw frame, indexed by the msg_ids it carries
+                    if self._capture is not None:
+                        self._capture.write(
+                            kind=CaptureRecordKind.PUSH_FRAME,
+                            payload=payload_bytes,
+                            msg_ids=[message.msg_id for message in webcast_response.messages]
+                        )
+
                     yield webcast_push_frame, webcast_response
 
         except InvalidStatusCode as ex:
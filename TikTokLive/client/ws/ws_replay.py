@@ -0,0 +1,171 @@
+import asyncio
+import os
+import time
+from typing import Optional, AsyncIterator, Union, Iterable, Any
+
+from TikTokLive.client.capture import CaptureRecord, CaptureRecordKind, read_capture
+from TikTokLive.client.logger import TikTokLiveLogHandler
+from TikTokLive.client.ws.ws_utils import extract_webcast_push_frame, extract_webcast_response_message
+from TikTokLive.proto import ProtoMessageFetchResult
+from TikTokLive.proto.custom_extras import WebcastPushFrame
+
+"""A source of captured records: a capture path, or the records themselves"""
+ReplaySource = Union[str, os.PathLike, Iterable[CaptureRecord]]
+
+
+class WebcastReplayClient:
+    """
+    Stands in for WebcastWSClient, feeding captured frames to the client instead of a WebSocket.
+    Frames are decoded exactly as WebcastConnect decodes them, and nothing touches the network.
+
+    """
+
+    def __init__(
+            self,
+            source: ReplaySource,
+            speed: Optional[float] = 1.0
+    ):
+        """
+        Initialize WebcastReplayClient
+
+        :param source: The capture path, or the captured records, to replay
+        :param speed: The playback speed, relative to the capture's receive times (1.0 is real-time, 10.0 is 10x).
+                      None replays as fast as possible.
+
+        """
+
+        if speed is not None and speed <= 0:
+            raise ValueError("The replay speed must be positive, or None to replay as fast as possible.")
+
+        self._source: ReplaySource = source
+        self._speed: Optional[float] = speed
+        self._logger = TikTokLiveLogHandler.get_logger()
+        self._connected: bool = False
+
+        self.frames_replayed: int = 0
+        self.messages_replayed: int = 0
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+
+    @property
+    def connected(self) -> bool:
+        """
+        Whether the replay is running
+
+        :return: Replay status
+
+        """
+
+        return self._connected
+
+    @property
+    def elapsed(self) -> float:
+        """
+        The wall-clock seconds spent replaying so far
+
+        :return: The elapsed seconds
+
+        """
+
+        if self.started_at is None:
+            return 0.0
+
+        return (self.ended_at or time.perf_counter()) - self.started_at
+
+    async def send(self, *_: Any, **__: Any) -> None:
+        """
+        Replays have no server to send to. Kept for parity with WebcastWSClient.
+
+        """
+
+        self._logger.debug("Ignoring a message sent during a replay.")
+
+    async def disconnect(self) -> None:
+        """
+        Stop the replay after the current frame
+
+        :return: None
+
+        """
+
+        self._connected = False
+
+    async def connect(
+            self,
+            initial_webcast_response: Optional[ProtoMessageFetchResult] = None,
+            process_connect_events: bool = True,
+            **_: Any
+    ) -> AsyncIterator[ProtoMessageFetchResult]:
+        """
+        Replay the captured frames, as WebcastWSClient.connect yields live ones.
+        The connection arguments WebcastWSClient takes (cookies, room_id, ...) are accepted & ignored.
+
+        :param initial_webcast_response: Ignored, as the capture holds its own initial fetch result
+        :param process_connect_events: Whether to process the initial events in the first fetch result
+        :return: Yields ProtoMessageFetchResult, as received in the capture
+
+        """
+
+        records: Iterable[CaptureRecord] = (
+            read_capture(self._source) if isinstance(self._source, (str, os.PathLike)) else self._source
+        )
+
+        self._connected = True
+        self.frames_replayed = self.messages_replayed = 0
+        self.started_at, self.ended_at = time.perf_counter(), None
+
+        # Receive times are replayed relative to the first record
+        first_received_at: Optional[float] = None
+        started_at: float = time.monotonic()
+
+        try:
+            for record in records:
+                if not self._connected:
+                    break
+
+                if first_received_at is None:
+                    first_received_at = record.received_at
+
+                # Wait until the frame is due, or just let other tasks (e.g. async handlers) run
+                delay: float = 0.0
+                if self._speed is not None:
+                    delay = started_at + (record.received_at - first_received_at) / self._speed - time.monotonic()
+                await asyncio.sleep(max(delay, 0.0))
+
+                webcast_response: Optional[ProtoMessageFetchResult] = self._decode(record)
+
+                if webcast_response is None:
+                    continue
+
+                if webcast_response.is_first and not process_connect_events:
+                    webcast_response.messages = []
+
+                self.frames_replayed += 1
+                self.messages_replayed += len(webcast_response.messages)
+                yield webcast_response
+
+        finally:
+            self._connected = False
+            self.ended_at = time.perf_counter()
+
+    def _decode(self, record: CaptureRecord) -> Optional[ProtoMessageFetchResult]:
+        """
+        Decode a captured record as WebcastConnect would have
+
+        :param record: The captured record
+        :return: The ProtoMessageFetchResult, or None for frames that carry no messages
+
+        """
+
+        if record.kind == CaptureRecordKind.FETCH_RESULT:
+            return ProtoMessageFetchResult().parse(record.payload)
+
+        if record.kind != CaptureRecordKind.PUSH_FRAME:
+            return None
+
+        webcast_push_frame: WebcastPushFrame = extract_webcast_push_frame(record.payload, logger=self._logger)
+
+        if webcast_push_frame.payload_type != "msg":
+            return None
+
+        return extract_webcast_response_message(webcast_push_frame, logger=self._logger)
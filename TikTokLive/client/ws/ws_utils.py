@@ -7,8 +7,15 @@ from io import BytesIO
 
 from TikTokLive.client.errors import InitialCursorMissingError, WebsocketURLMissingError
 from TikTokLive.client.logger import TikTokLiveLogHandler
-from TikTokLive.proto import ProtoMessageFetchResult
+from TikTokLive.proto import ProtoMessageFetchResult, WebcastControlMessage
 from TikTokLive.proto.custom_extras import WebcastPushFrame
+from TikTokLive.proto.custom_proto import ControlAction
+
+"""The control actions that end a room's stream"""
+ENDED_CONTROL_ACTIONS: frozenset = frozenset({
+    ControlAction.CONTROL_ACTION_STREAM_ENDED,
+    ControlAction.CONTROL_ACTION_STREAM_SUSPENDED
+})
 
 
 def build_webcast_uri(
@@ -55,6 +62,33 @@ def build_webcast_uri(
     return connect_uri
 
 
+def proves_live(initial_webcast_response: ProtoMessageFetchResult) -> bool:
+    """
+    Check whether an initial Webcast response shows the room to be live. It must have everything needed to
+    connect to the WebSocket, & no control message ending the stream.
+
+    :param initial_webcast_response: The initial Webcast response
+    :return: Whether the room is live
+
+    """
+
+    if not (
+            initial_webcast_response.cursor
+            and initial_webcast_response.push_server
+            and initial_webcast_response.route_params
+    ):
+        return False
+
+    for message in initial_webcast_response.messages:
+        if (
+                message.method == "WebcastControlMessage"
+                and WebcastControlMessage().parse(message.payload).action in ENDED_CONTROL_ACTIONS
+        ):
+            return False
+
+    return True
+
+
 def extract_webcast_push_frame(data: bytes, logger: logging.Logger = TikTokLiveLogHandler.get_logger()) -> WebcastPushFrame:
     """
     Extract a WebcastPushFrame from a raw byte payload. This method will parse the payload
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 # noinspection PyUnresolvedReferences
 import re
+from dataclasses import dataclass
+from functools import cached_property
 # noinspection PyUnresolvedReferences
-from typing import Optional, List, Type, TypeVar, Tuple
+from typing import Optional, List, Type, TypeVar, Tuple, Dict, Iterable
 
 # noinspection PyUnresolvedReferences
 import betterproto
@@ -21,6 +23,7 @@ def proto_extension(cls: _MessageType):
     """
     Betterproto doesn't properly handle inheriting existing messages.
     This method takes the superclass proto metadata and assigns that to this one.
+    The metadata is read off the superclass directly, so no message is instantiated at import time.
 
     :param cls: Class to wrap
     :return: The class, wrapped.
@@ -30,12 +33,77 @@ def proto_extension(cls: _MessageType):
     for obj in cls.__mro__[1:]:
         if issubclass(obj, betterproto.Message):
             # noinspection PyProtectedMember
-            cls._betterproto = obj()._betterproto
+            cls._betterproto = obj._betterproto
             return cls
 
     return cls
 
 
+@dataclass(frozen=True)
+class BadgeIndex:
+    """
+    A user's badges indexed by scene, built in a single pass over the badge list
+
+    """
+
+    # Badge scene (e.g. "FANS") to its level, for the first badge of each scene that has a level
+    levels: Dict[str, str]
+
+    is_subscriber: bool
+    is_moderator: bool
+    is_top_gifter: bool
+    member_level: Optional[int]
+    gifter_level: Optional[int]
+
+    @classmethod
+    def from_badges(cls, badges: Iterable[BadgeStruct]) -> BadgeIndex:
+        """
+        Index a list of badges
+
+        :param badges: The badges to index
+        :return: The badge index
+
+        """
+
+        levels: Dict[str, str] = {}
+
+        for badge in badges:
+            scene = getattr(badge, "badge_scene", None)
+            log_extra = getattr(badge, "log_extra", None)
+            badge_level = getattr(log_extra, "level", None) if log_extra else None
+            if scene and badge_level:
+                levels.setdefault(str(scene).replace("BADGE_SCENE_TYPE_", "").upper(), str(badge_level))
+
+        def scene_level(scene_name: str) -> Optional[int]:
+            badge_level: Optional[str] = levels.get(scene_name)
+            return int(badge_level) if badge_level is not None and badge_level.isdigit() else None
+
+        return cls(
+            levels=levels,
+            is_subscriber="SUBSCRIBER" in levels,
+            is_moderator=scene_level("ADMIN") == 0,
+            is_top_gifter=scene_level("RANK_LIST") == 0,
+            member_level=scene_level("FANS"),
+            gifter_level=scene_level("USER_GRADE")
+        )
+
+    def level(self, badge_type: str, level: Optional[str | int] = None) -> Optional[int]:
+        """
+        Retrieve the level of a specific badge type with optional validation.
+
+        :param badge_type: Badge type to check (e.g., "FANS", "SUBSCRIBER").
+        :param level: Optional level to validate.
+        :return: Level as int if found and validated, None otherwise.
+        """
+
+        badge_level: Optional[str] = self.levels.get(badge_type.replace("BADGE_SCENE_TYPE_", "").upper())
+
+        if badge_level is None or (level is not None and str(level) != badge_level):
+            return None
+
+        return int(badge_level)
+
+
 @proto_extension
 class ExtendedUser(User):
     """
@@ -46,32 +114,27 @@ class ExtendedUser(User):
     @classmethod
     def from_user(cls, user: User, **kwargs) -> ExtendedUser:
         """
-        Convert a user to an ExtendedUser object
+        Convert a user to an ExtendedUser object without copying it.
+
+        A plain User is upgraded in place by swapping its class, since ExtendedUser only adds helpers
+        on top of the same fields. Subclasses of User get an ExtendedUser that shares their field storage.
 
         :param user: Original user object
-        :param kwargs: Any kwargs to pass
+        :param kwargs: Unused, kept for backwards compatibility
         :return: ExtendedUser instance
         """
 
         if isinstance(user, ExtendedUser):
             return user
-        try:
-            return ExtendedUser(**user.to_pydict(**kwargs))
-        except AttributeError:
-            user_dict = {}
-            for field in user.__class__.__dataclass_fields__:
-                try:
-                    user_dict[field] = getattr(user, field)
-                except AttributeError as e:
-                    if "is set to None" in str(e):
-                        underlying_attr = f"_{field}"
-                        if hasattr(user, underlying_attr):
-                            user_dict[field] = getattr(user, underlying_attr)
-                        else:
-                            user_dict[field] = None
-                    else:
-                        raise
-            return ExtendedUser(**user_dict)
+
+        if type(user) is User:
+            object.__setattr__(user, "__class__", ExtendedUser)
+            return user
+
+        # Share the instance dict rather than copying the fields
+        extended_user: ExtendedUser = object.__new__(ExtendedUser)
+        object.__setattr__(extended_user, "__dict__", user.__dict__)
+        return extended_user
 
     @property
     def display_id(self):
@@ -113,6 +176,17 @@ class ExtendedUser(User):
 
         return (self.follow_info.follow_status or 0) >= 2
 
+    @cached_property
+    def badge_index(self) -> BadgeIndex:
+        """
+        The user's badges indexed by scene. Built on first access & cached on the user,
+        so checking several badge flags only walks the badge list once.
+
+        :return: The badge index
+        """
+
+        return BadgeIndex.from_badges(getattr(self, "badge_list", []))
+
     def _get_all_badge_info(self) -> List[Tuple[str, str]]:
         """
         Retrieve unique badge types with their levels.
@@ -120,16 +194,7 @@ class ExtendedUser(User):
         :return: List of (badge_type, level) tuples, with unique badge types
         """
 
-        badge_dict = {}
-        for badge in getattr(self, "badge_list", []):
-            scene = getattr(badge, "badge_scene", None)
-            log_extra = getattr(badge, "log_extra", None)
-            badge_level = getattr(log_extra, "level", None) if log_extra else None
-            if scene and badge_level:
-                scene_name = str(scene).replace("BADGE_SCENE_TYPE_", "").upper()
-                if scene_name not in badge_dict:
-                    badge_dict[scene_name] = str(badge_level)
-        return list(badge_dict.items())
+        return list(self.badge_index.levels.items())
 
     def _get_badge_level(self, badge_type: str, level: Optional[str | int] = None) -> Optional[int]:
         """
@@ -140,12 +205,7 @@ class ExtendedUser(User):
         :return: Level as int if found and validated, None otherwise.
         """
 
-        target_badge = badge_type.replace("BADGE_SCENE_TYPE_", "").upper()
-        for badge_name, badge_level in self._get_all_badge_info():
-            if badge_name == target_badge:
-                if level is None or str(level) == badge_level:
-                    return int(badge_level)
-        return None
+        return self.badge_index.level(badge_type, level)
 
     def has_badge(self, badge_type: str, level: Optional[str | int] = None) -> bool:
         """
@@ -177,7 +237,7 @@ class ExtendedUser(User):
 
         """
 
-        return bool(self.has_badge("SUBSCRIBER"))
+        return self.badge_index.is_subscriber
 
     @property
     def is_moderator(self) -> bool:
@@ -188,7 +248,7 @@ class ExtendedUser(User):
 
         """
 
-        return bool(self._get_badge_level("ADMIN") == 0)
+        return self.badge_index.is_moderator
 
     @property
     def is_top_gifter(self) -> bool:
@@ -199,7 +259,7 @@ class ExtendedUser(User):
 
         """
 
-        return bool(self._get_badge_level("RANK_LIST") == 0)
+        return self.badge_index.is_top_gifter
 
     @property
     def member_level(self) -> Optional[int]:
@@ -209,7 +269,7 @@ class ExtendedUser(User):
         :return: The parsed member level badge
         """
 
-        return self._get_badge_level("FANS")
+        return self.badge_index.member_level
 
     @property
     def member_rank(self) -> Optional[str]:
@@ -231,7 +291,7 @@ class ExtendedUser(User):
 
         """
 
-        return self._get_badge_level("USER_GRADE")
+        return self.badge_index.gifter_level
 
 
 @proto_extension
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Union, Optional, Sequence, List, Tuple, Any, Type
+
+import betterproto
+
+from TikTokLive.proto.proto_projection import FieldProjection, InvalidProjectionError
+from TikTokLive.proto.proto_wire import WireBuffer
+
+"""Whether numpy is installed"""
+try:
+    import numpy
+
+    SUPPORTS_NUMPY: bool = True
+except ImportError:
+    SUPPORTS_NUMPY: bool = False
+
+"""The NumPy dtype each scalar protobuf type is stored as. Enums are stored by value."""
+COLUMN_DTYPES: Dict[str, str] = {
+    betterproto.TYPE_BOOL: "?",
+    betterproto.TYPE_INT32: "<i4",
+    betterproto.TYPE_SINT32: "<i4",
+    betterproto.TYPE_SFIXED32: "<i4",
+    betterproto.TYPE_ENUM: "<i4",
+    betterproto.TYPE_UINT32: "<u4",
+    betterproto.TYPE_FIXED32: "<u4",
+    betterproto.TYPE_INT64: "<i8",
+    betterproto.TYPE_SINT64: "<i8",
+    betterproto.TYPE_SFIXED64: "<i8",
+    betterproto.TYPE_UINT64: "<u8",
+    betterproto.TYPE_FIXED64: "<u8",
+    betterproto.TYPE_FLOAT: "<f4",
+    betterproto.TYPE_DOUBLE: "<f8",
+}
+
+"""Protobuf types stored as (offset, length) pairs into the batch's shared buffer"""
+BUFFER_TYPES: Tuple[str, ...] = (betterproto.TYPE_STRING, betterproto.TYPE_BYTES)
+
+
+@dataclass()
+class ColumnBatch:
+    """
+    A batch of decoded messages stored column-wise. String & bytes columns are stored as
+    "<column>_offset" & "<column>_length" fields pointing into the shared `buffer`.
+
+    """
+
+    table: "numpy.ndarray"
+    buffer: bytes
+    string_columns: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def column(self, name: str) -> "numpy.ndarray":
+        """
+        Get a numeric column (a view of the table, not a copy)
+
+        :param name: The column name
+        :return: The column array
+
+        """
+
+        return self.table[name]
+
+    def raw_strings(self, name: str) -> List[memoryview]:
+        """
+        Get the raw bytes of a string column, sliced out of the shared buffer without copies
+
+        :param name: The string column name
+        :return: One memoryview per row
+
+        """
+
+        view: memoryview = memoryview(self.buffer)
+        offsets: List[int] = self.table[f"{name}_offset"].tolist()
+        lengths: List[int] = self.table[f"{name}_length"].tolist()
+
+        return [view[offset:offset + length] for offset, length in zip(offsets, lengths)]
+
+    def strings(self, name: str) -> List[str]:
+        """
+        Decode a string column
+
+        :param name: The string column name
+        :return: One string per row
+
+        """
+
+        return [str(value, "utf-8") for value in self.raw_strings(name)]
+
+    def as_columns(self) -> Dict[str, "numpy.ndarray"]:
+        """
+        Get the batch as a dict of arrays, one per table field
+
+        :return: The columns
+
+        """
+
+        return {name: self.table[name] for name in self.table.dtype.names}
+
+
+class ColumnarDecoder:
+    """
+    Decode many payloads of one message type into a NumPy structured array, without building an object per message.
+    Built on a FieldProjection, so only the requested scalar fields are read from the wire.
+
+    """
+
+    def __init__(
+            self,
+            message_type: Type[betterproto.Message],
+            columns: Union[Iterable[str], Dict[str, str]],
+            aliases: Optional[Dict[str, str]] = None
+    ):
+        """
+        Compile a columnar decoder for a message type
+
+        :param message_type: The message class the payloads are serialized from
+        :param columns: The field paths to decode, or a dict of column name to field path.
+                        Paths are named with dots replaced by underscores.
+        :param aliases: Optional names for top-level fields (e.g. "user" -> "user_info")
+        :raises InvalidProjectionError: If a path does not end on a singular scalar field
+
+        """
+
+        if not SUPPORTS_NUMPY:
+            raise ImportError(
+                'Cannot decode columnar batches without numpy. '
+                'To install it, type "pip install TikTokLive[analytics]".'
+            )
+
+        if not isinstance(columns, dict):
+            columns = {path.replace(".", "_"): path for path in columns}
+
+        self._names: Tuple[str, ...] = tuple(columns.keys())
+        self._projection: FieldProjection = FieldProjection(
+            message_type=message_type,
+            fields=tuple(columns.values()),
+            aliases=aliases,
+            decode_strings=False
+        )
+
+        dtype_fields: List[Tuple[str, str]] = []
+        string_columns: List[str] = []
+
+        for name, path, meta, is_scalar in zip(
+                self._names,
+                self._projection.paths,
+                self._projection.field_metadata,
+                self._projection.scalar_paths
+        ):
+            if not is_scalar:
+                raise InvalidProjectionError(f"The path '{path}' does not end on a singular scalar field.")
+
+            if meta.proto_type in BUFFER_TYPES:
+                string_columns.append(name)
+                dtype_fields.extend([(f"{name}_offset", "<u8"), (f"{name}_length", "<u4")])
+            else:
+                dtype_fields.append((name, COLUMN_DTYPES[meta.proto_type]))
+
+        self._string_columns: Tuple[str, ...] = tuple(string_columns)
+        self._dtype: numpy.dtype = numpy.dtype(dtype_fields)
+
+    @property
+    def dtype(self) -> "numpy.dtype":
+        """The structured dtype of the decoded table"""
+
+        return self._dtype
+
+    @property
+    def projection(self) -> FieldProjection:
+        """The underlying field projection"""
+
+        return self._projection
+
+    def allocate(self, capacity: int) -> "numpy.ndarray":
+        """
+        Preallocate a table that can be reused across calls to `decode`
+
+        :param capacity: The maximum number of rows per batch
+        :return: The empty table
+
+        """
+
+        return numpy.zeros(capacity, dtype=self._dtype)
+
+    def decode(self, payloads: Sequence[WireBuffer], out: Optional["numpy.ndarray"] = None) -> ColumnBatch:
+        """
+        Decode a batch of payloads
+
+        :param payloads: Serialized messages, all of the decoder's message type
+        :param out: An optional preallocated table from `allocate` to fill
+        :return: The batch. Its table is a view of the first len(payloads) rows of `out`, if given.
+
+        """
+
+        count: int = len(payloads)
+
+        if out is None:
+            out = numpy.empty(count, dtype=self._dtype)
+        elif out.dtype != self._dtype or len(out) < count:
+            raise ValueError(f"The output table must have dtype {self._dtype} and room for {count} rows.")
+
+        table: numpy.ndarray = out[:count]
+        decode = self._projection.decode
+
+        # Transpose the records into one tuple per column
+        columns: List[Tuple[Any, ...]] = list(zip(*[decode(payload) for payload in payloads])) if count else []
+        buffer_parts: List[Any] = []
+        buffer_size: int = 0
+
+        for name, column in zip(self._names, columns):
+            if name not in self._string_columns:
+                table[name] = column
+                continue
+
+            lengths: numpy.ndarray = numpy.fromiter(map(len, column), dtype="<u8", count=count)
+            offsets: numpy.ndarray = numpy.cumsum(lengths) - lengths + buffer_size
+
+            table[f"{name}_length"] = lengths
+            table[f"{name}_offset"] = offsets
+            buffer_parts.extend(column)
+            buffer_size += int(lengths.sum())
+
+        return ColumnBatch(
+            table=table,
+            buffer=b"".join(buffer_parts),
+            string_columns=self._string_columns
+        )
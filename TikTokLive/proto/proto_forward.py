@@ -0,0 +1,124 @@
+import struct
+from typing import NamedTuple, Iterator, Optional, FrozenSet, Iterable
+
+from TikTokLive.proto import ProtoMessageFetchResult, ProtoMessageFetchResultBaseProtoMessage
+from TikTokLive.proto.proto_wire import WireBuffer, iter_fields, varint_converter
+
+# noinspection PyProtectedMember
+_MESSAGE_FIELDS = ProtoMessageFetchResultBaseProtoMessage._betterproto.meta_by_field_name
+
+"""Field numbers read straight from the wire when scanning a fetch result"""
+# noinspection PyProtectedMember
+FETCH_RESULT_MESSAGES: int = ProtoMessageFetchResult._betterproto.meta_by_field_name["messages"].number
+MESSAGE_METHOD: int = _MESSAGE_FIELDS["method"].number
+MESSAGE_PAYLOAD: int = _MESSAGE_FIELDS["payload"].number
+MESSAGE_MSG_ID: int = _MESSAGE_FIELDS["msg_id"].number
+
+"""The header of a packed raw message: payload length, room ID, msg_id, method length. The method & payload follow."""
+RAW_MESSAGE_HEADER: struct.Struct = struct.Struct("<IQqH")
+
+_convert_msg_id = varint_converter(_MESSAGE_FIELDS["msg_id"])
+
+
+class RawMessage(NamedTuple):
+    """
+    A Webcast message as received, with its payload left encoded for a downstream service to decode
+
+    """
+
+    room_id: int
+    method: str
+    msg_id: int
+    payload: WireBuffer
+
+    @classmethod
+    def from_message(cls, room_id: int, message: ProtoMessageFetchResultBaseProtoMessage) -> "RawMessage":
+        """
+        Wrap a message from a parsed fetch result. The payload is not copied.
+
+        :param room_id: The room the message was received in
+        :param message: The message
+        :return: The raw message
+
+        """
+
+        return cls(room_id=room_id, method=message.method, msg_id=message.msg_id, payload=memoryview(message.payload))
+
+    def pack(self) -> bytes:
+        """
+        Frame the message for a stream (a socket, a file...), with the payload as received
+
+        :return: The header, method & payload
+
+        """
+
+        method: bytes = self.method.encode("utf-8")
+        return b"".join((RAW_MESSAGE_HEADER.pack(len(self.payload), self.room_id, self.msg_id, len(method)), method, self.payload))
+
+
+def scan_raw_messages(
+        fetch_result: WireBuffer,
+        room_id: int = 0,
+        methods: Optional[Iterable[str]] = None
+) -> Iterator[RawMessage]:
+    """
+    Slice the messages out of a serialized ProtoMessageFetchResult, without decoding it
+
+    :param fetch_result: The serialized fetch result
+    :param room_id: The room the fetch result was received in
+    :param methods: The Webcast methods to keep (e.g. {"WebcastGiftMessage"}). Defaults to all.
+    :return: The messages, with payloads as memoryviews of the buffer
+
+    """
+
+    wanted: Optional[FrozenSet[bytes]] = frozenset(method.encode() for method in methods) if methods is not None else None
+
+    for number, _, message in iter_fields(fetch_result):
+        if number != FETCH_RESULT_MESSAGES:
+            continue
+
+        method: bytes = b""
+        msg_id: int = 0
+        payload: memoryview = memoryview(b"")
+
+        for field_number, _, value in iter_fields(message):
+            if field_number == MESSAGE_METHOD:
+                method = bytes(value)
+                if wanted is not None and method not in wanted:
+                    break
+            elif field_number == MESSAGE_PAYLOAD:
+                payload = value
+            elif field_number == MESSAGE_MSG_ID:
+                msg_id = _convert_msg_id(value)
+        else:
+            if wanted is None or method in wanted:
+                yield RawMessage(room_id=room_id, method=str(method, "utf-8"), msg_id=msg_id, payload=payload)
+
+
+def unpack_raw_messages(buffer: WireBuffer) -> Iterator[RawMessage]:
+    """
+    Read back a stream of packed raw messages. A message cut short at the end of the buffer ends the iteration.
+
+    :param buffer: The packed messages
+    :return: The messages, with payloads as memoryviews of the buffer
+
+    """
+
+    view: memoryview = memoryview(buffer)
+    pos: int = 0
+
+    while pos + RAW_MESSAGE_HEADER.size <= len(view):
+        length, room_id, msg_id, method_length = RAW_MESSAGE_HEADER.unpack_from(view, pos)
+        start: int = pos + RAW_MESSAGE_HEADER.size + method_length
+
+        if start + length > len(view):
+            return
+
+        yield RawMessage(
+            room_id=room_id,
+            method=str(view[pos + RAW_MESSAGE_HEADER.size:start], "utf-8"),
+            msg_id=msg_id,
+            payload=view[start:start + length]
+        )
+
+        pos = start + length
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple, Type, FrozenSet, Set, Any, Optional
+
+import betterproto
+
+"""String fields whose values repeat across a room's messages (nicknames, methods, display-text keys, CDN URLs)"""
+DEFAULT_INTERN_FIELDS: FrozenSet[str] = frozenset({
+    "method",
+    "nick_name",
+    "username",
+    "sec_uid",
+    "display_id",
+    "key",
+    "default_pattern",
+    "font_color",
+    "m_urls",
+    "m_uri",
+    "avg_color",
+})
+
+
+class StringPool:
+    """
+    A bounded intern table. Equal strings passed through the pool come back as one shared object,
+    and the least recently used strings are dropped once the pool is full.
+
+    """
+
+    def __init__(self, max_size: int = 8192):
+        """
+        Create a string pool
+
+        :param max_size: The maximum number of distinct strings to hold
+
+        """
+
+        if max_size < 1:
+            raise ValueError("The pool must be able to hold at least one string.")
+
+        self._max_size: int = max_size
+        self._strings: OrderedDict[str, str] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    @property
+    def max_size(self) -> int:
+        """The maximum number of distinct strings held"""
+
+        return self._max_size
+
+    def intern(self, value: str) -> str:
+        """
+        Get the pooled copy of a string, pooling it if it is new
+
+        :param value: The string to intern
+        :return: The pooled string, equal to `value`
+
+        """
+
+        pooled: Optional[str] = self._strings.get(value)
+
+        if pooled is not None:
+            self._strings.move_to_end(value)
+            self.hits += 1
+            return pooled
+
+        self.misses += 1
+        self._strings[value] = value
+
+        if len(self._strings) > self._max_size:
+            self._strings.popitem(last=False)
+
+        return value
+
+    def clear(self) -> None:
+        """
+        Drop every pooled string & reset the counters
+
+        :return: None
+
+        """
+
+        self._strings.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+@dataclass()
+class _InternPlan:
+    """
+    The fields of one message class the interner visits
+
+    """
+
+    strings: Tuple[str, ...] = ()
+    string_lists: Tuple[str, ...] = ()
+    messages: List[Tuple[str, Type[betterproto.Message]]] = field(default_factory=list)
+
+
+class MessageInterner:
+    """
+    Intern a configurable set of string fields throughout decoded messages.
+    A plan per message class is compiled once, and only descends into fields that can lead to an interned field.
+
+    """
+
+    def __init__(self, fields: Iterable[str] = DEFAULT_INTERN_FIELDS, max_size: int = 8192):
+        """
+        Create a message interner
+
+        :param fields: The names of the string fields to intern, on any message type
+        :param max_size: The maximum number of distinct strings to hold
+
+        """
+
+        self._fields: FrozenSet[str] = frozenset(fields)
+        self._pool: StringPool = StringPool(max_size=max_size)
+        self._plans: Dict[Type[betterproto.Message], _InternPlan] = {}
+
+    @property
+    def fields(self) -> FrozenSet[str]:
+        """The names of the interned string fields"""
+
+        return self._fields
+
+    @property
+    def pool(self) -> StringPool:
+        """The pool the strings are interned into"""
+
+        return self._pool
+
+    def intern(self, message: betterproto.Message) -> betterproto.Message:
+        """
+        Intern the string fields of a message & every message nested in it, in place
+
+        :param message: The decoded message
+        :return: The same message
+
+        """
+
+        plan: _InternPlan = self._plans.get(type(message)) or self._compile(type(message))
+        self._intern_message(message, plan)
+        return message
+
+    def clear(self) -> None:
+        """
+        Drop the pooled strings (e.g. when moving to another room). Compiled plans are kept.
+
+        :return: None
+
+        """
+
+        self._pool.clear()
+
+    def _intern_message(self, message: betterproto.Message, plan: _InternPlan) -> None:
+        """
+        Intern one message. Field values are read & written through __dict__, as betterproto's
+        __setattr__ would otherwise mark the message as serialized on the wire.
+
+        :param message: The message to intern
+        :param plan: The plan for its class
+
+        """
+
+        values: Dict[str, Any] = message.__dict__
+        intern = self._pool.intern
+
+        for name in plan.strings:
+            value: Any = values.get(name)
+            if value and value.__class__ is str:
+                values[name] = intern(value)
+
+        for name in plan.string_lists:
+            value: Any = values.get(name)
+            if value and value.__class__ is list:
+                value[:] = [intern(item) for item in value]
+
+        for name, child_type in plan.messages:
+            value: Any = values.get(name)
+
+            if value is None or value is betterproto.PLACEHOLDER:
+                continue
+
+            child_plan: _InternPlan = self._plans[child_type]
+
+            if value.__class__ is list:
+                for item in value:
+                    self._intern_message(item, child_plan)
+            else:
+                self._intern_message(value, child_plan)
+
+    def _compile(self, root_type: Type[betterproto.Message]) -> _InternPlan:
+        """
+        Compile the plans for a message class & every class reachable from it
+
+        :param root_type: The message class
+        :return: The plan for the message class
+
+        """
+
+        # Collect the classes reachable from the root
+        children: Dict[Type[betterproto.Message], List[Tuple[str, Type[betterproto.Message]]]] = {}
+        pending: List[Type[betterproto.Message]] = [root_type]
+
+        while pending:
+            message_type: Type[betterproto.Message] = pending.pop()
+
+            if message_type in children or message_type in self._plans:
+                continue
+
+            # noinspection PyProtectedMember
+            metadata: betterproto.ProtoClassMetadata = message_type._betterproto
+            children[message_type] = [
+                (name, metadata.cls_by_field[name])
+                for name, meta in metadata.meta_by_field_name.items()
+                if meta.proto_type == betterproto.TYPE_MESSAGE
+                and isinstance(metadata.cls_by_field[name], type)
+                and issubclass(metadata.cls_by_field[name], betterproto.Message)
+            ]
+            pending.extend(child_type for _, child_type in children[message_type])
+
+        # Find the classes that hold an interned field, directly or through their children
+        reaches: Set[Type[betterproto.Message]] = {
+            message_type for message_type, plan in self._plans.items() if plan.strings or plan.string_lists or plan.messages
+        }
+
+        for message_type in children:
+            # noinspection PyProtectedMember
+            metadata: betterproto.ProtoClassMetadata = message_type._betterproto
+            if any(
+                    meta.proto_type == betterproto.TYPE_STRING and name in self._fields
+                    for name, meta in metadata.meta_by_field_name.items()
+            ):
+                reaches.add(message_type)
+
+        changed: bool = True
+
+        while changed:
+            changed = False
+            for message_type, message_children in children.items():
+                if message_type not in reaches and any(child in reaches for _, child in message_children):
+                    reaches.add(message_type)
+                    changed = True
+
+        # Build the plans, skipping fields that cannot lead anywhere
+        for message_type, message_children in children.items():
+            # noinspection PyProtectedMember
+            metadata: betterproto.ProtoClassMetadata = message_type._betterproto
+            strings: List[str] = []
+            string_lists: List[str] = []
+
+            for name, meta in metadata.meta_by_field_name.items():
+                if meta.proto_type == betterproto.TYPE_STRING and name in self._fields:
+                    (string_lists if metadata.default_gen[name] is list else strings).append(name)
+
+            self._plans[message_type] = _InternPlan(
+                strings=tuple(strings),
+                string_lists=tuple(string_lists),
+                messages=[(name, child) for name, child in message_children if child in reaches]
+            )
+
+        return self._plans[root_type]
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import json
+import math
+from base64 import b64encode
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Type, Any, Callable, List, Tuple
+
+import betterproto
+from betterproto import Casing
+
+"""Whether orjson is installed"""
+try:
+    import orjson
+
+    SUPPORTS_ORJSON: bool = True
+except ImportError:
+    SUPPORTS_ORJSON: bool = False
+
+"""Marks a field that has no converter, as its value is already JSON-ready"""
+_IDENTITY: None = None
+
+
+@dataclass()
+class _EncodedField:
+    """
+    A field of a compiled message encoder
+
+    """
+
+    key: str
+    name: str
+    convert: Optional[Callable[[Any], Any]]
+    default: Any
+    default_gen: Callable[[], Any]
+    is_message: bool
+    group: Optional[str]
+
+
+def _dump_float(value: float) -> Any:
+    """Floats as betterproto writes them, with the non-finite values as strings"""
+
+    if math.isfinite(value):
+        return value
+
+    return "NaN" if math.isnan(value) else ("Infinity" if value > 0 else "-Infinity")
+
+
+class MessageJSONEncoder:
+    """
+    Serialize messages (and the events built on them) straight to compact JSON bytes.
+
+    An encoder is compiled once per message class, with the field list, key casing & value formats fixed up front.
+    Encoding reads field values from the message's storage, which skips betterproto's per-attribute
+    lookups, and writes the result with orjson when it is installed.
+
+    With the default options, the output is the same JSON as json.dumps(message.to_dict()).
+
+    """
+
+    def __init__(
+            self,
+            casing: Casing = Casing.CAMEL,
+            enums_as_names: bool = True,
+            bytes_as_base64: bool = True,
+            int64_as_string: bool = True,
+            include_default_values: bool = False,
+            fields: Optional[Dict[Type[betterproto.Message], Iterable[str]]] = None
+    ):
+        """
+        Create a JSON encoder
+
+        :param casing: The casing of the keys
+        :param enums_as_names: Whether to write enums by name, or by value
+        :param bytes_as_base64: Whether to write bytes fields as base64 strings, or leave them out
+        :param int64_as_string: Whether to write 64-bit integers as strings, as JavaScript cannot hold them as numbers
+        :param include_default_values: Whether to write fields that hold their default value
+        :param fields: Optionally, the (top-level) fields to write for some message classes
+
+        """
+
+        self._casing: Casing = casing
+        self._enums_as_names: bool = enums_as_names
+        self._bytes_as_base64: bool = bytes_as_base64
+        self._int64_as_string: bool = int64_as_string
+        self._include_default_values: bool = include_default_values
+        self._fields: Dict[Type[betterproto.Message], Tuple[str, ...]] = {
+            message_type: tuple(field_names) for message_type, field_names in (fields or {}).items()
+        }
+        self._encoders: Dict[Type[betterproto.Message], List[_EncodedField]] = {}
+
+        for message_type, field_names in self._fields.items():
+            # noinspection PyProtectedMember
+            unknown: List[str] = [name for name in field_names if name not in message_type._betterproto.meta_by_field_name]
+            if unknown:
+                raise ValueError(f"'{message_type.__name__}' has no field(s) {', '.join(map(repr, unknown))}.")
+
+    def encode(self, message: betterproto.Message) -> bytes:
+        """
+        Serialize a message to JSON
+
+        :param message: The message (or proto event) to serialize
+        :return: The compact JSON, as UTF-8 bytes
+
+        """
+
+        return self.dumps(self.to_dict(message))
+
+    def to_dict(self, message: betterproto.Message) -> Dict[str, Any]:
+        """
+        Convert a message to a JSON-ready dict, with the encoder's options
+
+        :param message: The message to convert
+        :return: The dict
+
+        """
+
+        fields: Optional[List[_EncodedField]] = self._encoders.get(type(message))
+        return self._convert_message(message, fields if fields is not None else self._compile(type(message)))
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        """
+        Write a JSON-ready value as compact JSON
+
+        :param value: The value to write
+        :return: The JSON, as UTF-8 bytes
+
+        """
+
+        if SUPPORTS_ORJSON:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def _convert_message(self, message: betterproto.Message, fields: List[_EncodedField]) -> Dict[str, Any]:
+        """
+        Convert one message with its compiled encoder
+
+        :param message: The message
+        :param fields: The compiled fields of its class
+        :return: The JSON-ready dict
+
+        """
+
+        values: Dict[str, Any] = message.__dict__
+        output: Dict[str, Any] = {}
+        include_default_values: bool = self._include_default_values
+
+        for field in fields:
+            value: Any = values.get(field.name, betterproto.PLACEHOLDER)
+
+            # Unset fields
+            if value is betterproto.PLACEHOLDER or value is None:
+                if not include_default_values:
+                    continue
+                value = field.default_gen()
+                if value is None:
+                    output[field.key] = None
+                    continue
+
+            # Fields holding their default, unless they are the chosen member of a oneof
+            elif not include_default_values and (
+                    (not value._serialized_on_wire) if field.is_message else value == field.default
+            ):
+                if field.group is None or values["_group_current"].get(field.group) != field.name:
+                    continue
+
+            output[field.key] = value if field.convert is None else field.convert(value)
+
+        return output
+
+    def _compile(self, message_type: Type[betterproto.Message]) -> List[_EncodedField]:
+        """
+        Compile the encoder for a message class
+
+        :param message_type: The message class
+        :return: The compiled fields
+
+        """
+
+        # noinspection PyProtectedMember
+        metadata: betterproto.ProtoClassMetadata = message_type._betterproto
+        field_names: Iterable[str] = self._fields.get(message_type, metadata.meta_by_field_name.keys())
+        fields: List[_EncodedField] = []
+
+        # Registered before the fields are compiled, so recursive message types resolve to it
+        self._encoders[message_type] = fields
+
+        for name in field_names:
+            meta: betterproto.FieldMetadata = metadata.meta_by_field_name[name]
+            field_type: Any = metadata.cls_by_field.get(name)
+            repeated: bool = metadata.default_gen[name] is list
+
+            if meta.proto_type == betterproto.TYPE_BYTES and not self._bytes_as_base64:
+                continue
+
+            convert: Optional[Callable[[Any], Any]] = self._converter(meta, field_type)
+
+            if convert is not _IDENTITY and repeated:
+                convert = self._repeated(convert)
+
+            # Singular messages are skipped when they were not on the wire, everything else when it holds its default
+            is_message: bool = (
+                    meta.proto_type == betterproto.TYPE_MESSAGE
+                    and not repeated
+                    and isinstance(field_type, type)
+                    and issubclass(field_type, betterproto.Message)
+            )
+
+            fields.append(
+                _EncodedField(
+                    key=self._casing(name).rstrip("_"),
+                    name=name,
+                    convert=convert,
+                    default=None if is_message else metadata.default_gen[name](),
+                    default_gen=metadata.default_gen[name],
+                    is_message=is_message,
+                    group=meta.group
+                )
+            )
+
+        return fields
+
+    def _converter(self, meta: betterproto.FieldMetadata, field_type: Any) -> Optional[Callable[[Any], Any]]:
+        """
+        Build the function that turns one (non-repeated) field value into its JSON value
+
+        :param meta: The field metadata
+        :param field_type: The field class from the betterproto metadata
+        :return: The converter, or None if the value can be written as-is
+
+        """
+
+        if meta.proto_type in betterproto.INT_64_TYPES:
+            return str if self._int64_as_string else _IDENTITY
+
+        if meta.proto_type == betterproto.TYPE_BYTES:
+            return lambda value: b64encode(value).decode("utf-8")
+
+        if meta.proto_type == betterproto.TYPE_ENUM:
+            if not self._enums_as_names:
+                return int
+
+            names: Dict[int, str] = {int(member): member.name for member in field_type}
+            return lambda value: names.get(value) or field_type.try_value(value).name
+
+        if meta.proto_type in (betterproto.TYPE_FLOAT, betterproto.TYPE_DOUBLE):
+            return _dump_float
+
+        if meta.proto_type == betterproto.TYPE_MAP:
+            return self._map_converter(meta, field_type)
+
+        if meta.proto_type != betterproto.TYPE_MESSAGE or meta.wraps:
+            return _IDENTITY
+
+        if field_type is datetime:
+            # noinspection PyProtectedMember
+            return betterproto._Timestamp.timestamp_to_json
+
+        if field_type is timedelta:
+            # noinspection PyProtectedMember
+            return betterproto._Duration.delta_to_json
+
+        return self._message_converter(field_type)
+
+    def _message_converter(self, message_type: Type[betterproto.Message]) -> Callable[[Any], Any]:
+        """
+        Build the converter for a nested message field. The nested encoder is compiled on first use.
+
+        :param message_type: The nested message class
+        :return: The converter
+
+        """
+
+        encoders: Dict[Type[betterproto.Message], List[_EncodedField]] = self._encoders
+        convert_message: Callable[..., Dict[str, Any]] = self._convert_message
+
+        def convert(value: betterproto.Message) -> Dict[str, Any]:
+            fields: Optional[List[_EncodedField]] = encoders.get(message_type)
+            return convert_message(value, fields if fields is not None else self._compile(message_type))
+
+        return convert
+
+    def _map_converter(self, meta: betterproto.FieldMetadata, entry_type: Any) -> Optional[Callable[[Any], Any]]:
+        """
+        Build the converter for a map field
+
+        :param meta: The field metadata
+        :param entry_type: The generated map entry class
+        :return: The converter, or None if the map can be written as-is
+
+        """
+
+        # noinspection PyProtectedMember
+        value_meta: betterproto.FieldMetadata = entry_type._betterproto.meta_by_field_name["value"]
+
+        # Map values are written as betterproto writes them, where only messages are converted
+        if value_meta.proto_type != betterproto.TYPE_MESSAGE:
+            return _IDENTITY
+
+        # noinspection PyProtectedMember
+        convert_value: Callable[[Any], Any] = self._message_converter(entry_type._betterproto.cls_by_field["value"])
+        return lambda value: {key: convert_value(item) for key, item in value.items()}
+
+    @classmethod
+    def _repeated(cls, convert: Callable[[Any], Any]) -> Callable[[List[Any]], List[Any]]:
+        """
+        Wrap a converter to convert every item of a repeated field
+
+        :param convert: The item converter
+        :return: The list converter
+
+        """
+
+        return lambda values: [convert(value) for value in values]
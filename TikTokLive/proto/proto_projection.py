@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import enum
+from collections import namedtuple
+from dataclasses import dataclass
+from typing import Iterable, Tuple, Dict, Optional, Callable, Any, List, Type
+
+import betterproto
+
+from TikTokLive.client.errors import TikTokLiveError
+from TikTokLive.proto.proto_wire import WireBuffer, read_varint, skip_field, varint_converter, FIXED_FORMATS
+
+
+class InvalidProjectionError(TikTokLiveError):
+    """
+    Thrown when a projected field path does not resolve to a field that can be projected
+
+    """
+
+
+"""Marks a record slot that was not present on the wire"""
+_MISSING: object = object()
+
+"""Default values that are safe to share between records"""
+_IMMUTABLE_DEFAULTS: Tuple[type, ...] = (int, float, bool, str, bytes, type(None), enum.Enum)
+
+
+class ProjectionRecord(tuple):
+    """
+    The base of projection records. The event name a record is emitted under is kept on `_event_type`, as a
+    namedtuple field can't start with an underscore, so it never hides a projected field (such as "type" or "size").
+
+    """
+
+    __slots__ = ()
+
+    _event_type: str = ""
+
+
+@dataclass()
+class _ProjectedField:
+    """
+    A node in the compiled projection tree, keyed by field number in its parent
+
+    """
+
+    name: str
+    meta: betterproto.FieldMetadata
+
+    # Set when the field itself is part of the record
+    index: Optional[int] = None
+    convert: Optional[Callable[[Any], Any]] = None
+    repeated: bool = False
+    is_map: bool = False
+
+    # Set when a deeper path passes through the field
+    children: Optional[Dict[int, _ProjectedField]] = None
+
+
+class FieldProjection:
+    """
+    Decode a handful of fields from a serialized message, skipping every other tag at the wire level.
+    Nested messages are only descended into when a projected path passes through them.
+
+    Paths are dot-separated field names relative to the message (e.g. "user_info.id" on a WebcastChatMessage).
+    A path may end on any field, but may only pass through singular message fields.
+
+    """
+
+    def __init__(
+            self,
+            message_type: Type[betterproto.Message],
+            fields: Iterable[str],
+            aliases: Optional[Dict[str, str]] = None,
+            decode_strings: bool = True
+    ):
+        """
+        Compile a projection for a message type
+
+        :param message_type: The message class the payloads are serialized from
+        :param fields: The field paths to project. Sets are sorted so the record layout is stable.
+        :param aliases: Optional names for top-level fields (e.g. "user" -> "user_info")
+        :param decode_strings: Whether to decode strings, or leave them as memoryview slices of the payload
+        :raises InvalidProjectionError: If a path cannot be projected
+
+        """
+
+        self._message_type: Type[betterproto.Message] = message_type
+        self._aliases: Dict[str, str] = aliases or {}
+        self._decode_strings: bool = decode_strings
+        self._paths: Tuple[str, ...] = tuple(sorted(fields) if isinstance(fields, (set, frozenset)) else fields)
+
+        if not self._paths:
+            raise InvalidProjectionError("At least one field must be projected.")
+
+        self._root: Dict[int, _ProjectedField] = {}
+        self._terminals: List[_ProjectedField] = []
+        self._defaults: List[Tuple[int, Callable[[], Any]]] = []
+
+        for index, path in enumerate(self._paths):
+            self._compile_path(index, path)
+
+        self._event_name: str = f"{message_type.__name__}[{', '.join(self._paths)}]"
+        self._record_type: Type[tuple] = self._create_record_type()
+
+    @property
+    def message_type(self) -> Type[betterproto.Message]:
+        """The message class this projection decodes"""
+
+        return self._message_type
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        """The projected field paths, in record order"""
+
+        return self._paths
+
+    @property
+    def event_name(self) -> str:
+        """A name unique to this message type & set of paths, used to emit the records"""
+
+        return self._event_name
+
+    @property
+    def record_type(self) -> Type[tuple]:
+        """The named tuple type returned by `decode`"""
+
+        return self._record_type
+
+    @property
+    def field_metadata(self) -> Tuple[betterproto.FieldMetadata, ...]:
+        """The betterproto metadata of the field each path ends on, in record order"""
+
+        return tuple(node.meta for node in self._terminals)
+
+    @property
+    def scalar_paths(self) -> Tuple[bool, ...]:
+        """Whether each path ends on a singular scalar (or string/bytes) field, in record order"""
+
+        return tuple(
+            not node.repeated and not node.is_map and node.meta.proto_type != betterproto.TYPE_MESSAGE
+            for node in self._terminals
+        )
+
+    def decode(self, data: WireBuffer) -> tuple:
+        """
+        Decode the projected fields from a serialized message
+
+        :param data: The serialized message
+        :return: A record with one entry per projected path
+
+        """
+
+        values: List[Any] = [_MISSING] * len(self._paths)
+        self._scan(memoryview(data), self._root, values)
+
+        for index, default in self._defaults:
+            if values[index] is _MISSING:
+                values[index] = default()
+
+        return self._record_type._make(values)
+
+    def _scan(self, buffer: memoryview, nodes: Dict[int, _ProjectedField], values: List[Any]) -> None:
+        """
+        Walk the tags of one message, decoding the projected ones
+
+        :param buffer: The serialized message
+        :param nodes: The projected fields of this message, by field number
+        :param values: The record values to fill in
+
+        """
+
+        pos: int = 0
+        end: int = len(buffer)
+
+        while pos < end:
+            tag, pos = read_varint(buffer, pos)
+            node: Optional[_ProjectedField] = nodes.get(tag >> 3)
+            wire_type: int = tag & 0x7
+
+            if node is None:
+                pos = skip_field(buffer, pos, wire_type)
+                continue
+
+            if wire_type == betterproto.WIRE_VARINT:
+                raw, pos = read_varint(buffer, pos)
+            elif wire_type == betterproto.WIRE_LEN_DELIM:
+                length, pos = read_varint(buffer, pos)
+                raw, pos = buffer[pos:pos + length], pos + length
+            elif wire_type == betterproto.WIRE_FIXED_64:
+                raw, pos = buffer[pos:pos + 8], pos + 8
+            elif wire_type == betterproto.WIRE_FIXED_32:
+                raw, pos = buffer[pos:pos + 4], pos + 4
+            else:
+                raise ValueError(f"Unsupported wire type {wire_type}")
+
+            if node.children is not None:
+                self._scan(raw, node.children, values)
+
+            if node.index is not None:
+                self._store(node, wire_type, raw, values)
+
+    @classmethod
+    def _store(cls, node: _ProjectedField, wire_type: int, raw: Any, values: List[Any]) -> None:
+        """
+        Convert a raw wire value & store it in its record slot
+
+        :param node: The projected field
+        :param wire_type: The wire type the value was read with
+        :param raw: The raw value (an int for varints, a memoryview otherwise)
+        :param values: The record values to fill in
+
+        """
+
+        if node.is_map:
+            current: Any = values[node.index]
+            if current is _MISSING:
+                current = values[node.index] = {}
+            entry: betterproto.Message = node.convert(raw)
+            current[entry.key] = entry.value
+            return
+
+        if not node.repeated:
+            values[node.index] = node.convert(raw)
+            return
+
+        current: Any = values[node.index]
+        if current is _MISSING:
+            current = values[node.index] = []
+
+        # Packed repeated scalars arrive as a single length-delimited run
+        if wire_type == betterproto.WIRE_LEN_DELIM and node.meta.proto_type in betterproto.PACKED_TYPES:
+            current.extend(cls._unpack(node, raw))
+        else:
+            current.append(node.convert(raw))
+
+    @classmethod
+    def _unpack(cls, node: _ProjectedField, raw: memoryview) -> List[Any]:
+        """
+        Unpack a packed run of repeated scalars
+
+        :param node: The projected field
+        :param raw: The packed bytes
+        :return: The converted values
+
+        """
+
+        fixed_format = FIXED_FORMATS.get(node.meta.proto_type)
+
+        if fixed_format is not None:
+            return [item[0] for item in fixed_format.iter_unpack(raw)]
+
+        items: List[Any] = []
+        pos: int = 0
+
+        while pos < len(raw):
+            value, pos = read_varint(raw, pos)
+            items.append(node.convert(value))
+
+        return items
+
+    def _compile_path(self, index: int, path: str) -> None:
+        """
+        Resolve one dot-separated path into the projection tree
+
+        :param index: The record slot the path fills
+        :param path: The path to resolve
+        :raises InvalidProjectionError: If the path cannot be projected
+
+        """
+
+        segments: List[str] = path.split(".")
+        segments[0] = self._aliases.get(segments[0], segments[0])
+
+        message_type: Type[betterproto.Message] = self._message_type
+        nodes: Dict[int, _ProjectedField] = self._root
+
+        for depth, name in enumerate(segments):
+            # noinspection PyProtectedMember
+            metadata: betterproto.ProtoClassMetadata = message_type._betterproto
+            meta: Optional[betterproto.FieldMetadata] = metadata.meta_by_field_name.get(name)
+
+            if meta is None:
+                raise InvalidProjectionError(f"'{message_type.__name__}' has no field '{name}' (in path '{path}').")
+
+            field_type: Any = metadata.cls_by_field[name]
+            repeated: bool = metadata.default_gen[name] is list
+            node: _ProjectedField = nodes.setdefault(meta.number, _ProjectedField(name=name, meta=meta))
+
+            # Passing through a field into the message it holds
+            if depth < len(segments) - 1:
+                if meta.proto_type != betterproto.TYPE_MESSAGE or repeated:
+                    raise InvalidProjectionError(
+                        f"Cannot project through '{name}' in path '{path}', as it is not a singular message field."
+                    )
+
+                node.children = node.children if node.children is not None else {}
+                nodes = node.children
+                message_type = field_type
+                continue
+
+            if node.index is not None:
+                raise InvalidProjectionError(f"The path '{path}' is projected more than once.")
+
+            node.index = index
+            node.repeated = repeated
+            node.is_map = meta.proto_type == betterproto.TYPE_MAP
+            node.convert = self._converter(meta, field_type)
+            self._terminals.append(node)
+            self._defaults.append((index, self._default_factory(
+                bytes if meta.proto_type == betterproto.TYPE_STRING and not self._decode_strings
+                else metadata.default_gen[name]
+            )))
+
+    def _converter(self, meta: betterproto.FieldMetadata, field_type: Any) -> Callable[[Any], Any]:
+        """
+        Build the function that turns a raw wire value into its Python value
+
+        :param meta: The field metadata
+        :param field_type: The field class from the betterproto metadata
+        :return: The converter
+
+        """
+
+        if meta.proto_type in betterproto.WIRE_VARINT_TYPES:
+            return varint_converter(meta, field_type)
+
+        if meta.proto_type in FIXED_FORMATS:
+            fixed_format = FIXED_FORMATS[meta.proto_type]
+            return lambda raw: fixed_format.unpack(raw)[0]
+
+        if meta.proto_type == betterproto.TYPE_STRING:
+            return (lambda raw: str(raw, "utf-8")) if self._decode_strings else (lambda raw: raw)
+
+        if meta.proto_type == betterproto.TYPE_BYTES:
+            return bytes
+
+        # Messages & map entries are handed to betterproto in full
+        return lambda raw: field_type().parse(bytes(raw))
+
+    @classmethod
+    def _default_factory(cls, default_gen: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        Build the factory for a missing field's default value, sharing it when it is immutable
+
+        :param default_gen: Betterproto's default generator for the field
+        :return: The factory
+
+        """
+
+        default: Any = default_gen()
+
+        if isinstance(default, _IMMUTABLE_DEFAULTS):
+            return lambda: default
+
+        return default_gen
+
+    def _create_record_type(self) -> Type[tuple]:
+        """
+        Create the record type, a named tuple which also carries the event name it is emitted under (`_event_type`)
+
+        :return: The record type
+
+        """
+
+        base: Type[tuple] = namedtuple(
+            f"{self._message_type.__name__}Projection",
+            [path.replace(".", "_") for path in self._paths]
+        )
+
+        return type(
+            base.__name__,
+            (base, ProjectionRecord),
+            {
+                "__slots__": (),
+                "_event_type": self._event_name
+            }
+        )
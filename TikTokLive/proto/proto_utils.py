@@ -1,8 +1,13 @@
 import re
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterable, Set, Type, Dict
+
+import betterproto
 
 from TikTokLive.proto import User, BadgeStruct, BadgeStructBadgeDisplayType
 
+"""Message classes whose betterproto metadata has already been built by warm_proto_metadata"""
+_WARMED_MESSAGE_TYPES: Set[Type[betterproto.Message]] = set()
+
 
 def badge_match_user(user: User, p: re.Pattern) -> List[Tuple[re.Match, BadgeStruct]]:
     """
@@ -45,37 +50,69 @@ def badge_match(badge: BadgeStruct, p: re.Pattern) -> Optional[re.Match]:
 
     """
 
-    if badge.badge_display_type == BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_STRING:
-        match: Optional[re.Match] = p.search(string=badge.string_badge.content_str)
-        return match
+    for badge_string in badge_strings(badge):
+        match: Optional[re.Match] = p.search(string=badge_string)
+        if match:
+            return match
 
-    if badge.badge_display_type == BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_TEXT:
-        match: Optional[re.Match] = p.search(string=badge.text_badge.default_pattern)
-        return match
+    return None
 
-    if badge.badge_display_type == BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_IMAGE:
 
-        for image_url in badge.image_badge.image_model.m_urls:
-            match: Optional[re.Match] = p.search(string=image_url)
-            if match:
-                return match
+def badge_strings(badge: BadgeStruct) -> List[str]:
+    """
+    Extract the searchable strings from ANY type of TikTok badge, in the order they should be searched
 
-        return None
+    :param badge: The badge to extract from
+    :return: The badge text and/or image URLs
 
-    if badge.badge_display_type == BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_COMBINE:
+    """
 
-        match: Optional[re.Match] = p.search(string=badge.combine_badge_struct.str)
-        if match:
-            return match
+    # Unset optional fields raise on access in betterproto
+    display_type: Optional[BadgeStructBadgeDisplayType] = getattr(badge, "badge_display_type", None)
 
-        for image_url in badge.combine_badge_struct.icon.m_urls:
-            match: Optional[re.Match] = p.search(string=image_url)
-            if match:
-                return match
+    if display_type == BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_STRING:
+        return [badge.string_badge.content_str]
 
-        return None
+    if display_type == BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_TEXT:
+        return [badge.text_badge.default_pattern]
 
-    return None
+    if display_type == BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_IMAGE:
+        return badge.image_badge.image_model.m_urls
+
+    if display_type == BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_COMBINE:
+        return [badge.combine_badge_struct.str, *badge.combine_badge_struct.icon.m_urls]
+
+    return []
+
+
+def badge_match_user_all(
+        user: User,
+        patterns: Optional[Dict[str, re.Pattern]] = None
+) -> Dict[str, List[Tuple[re.Match, BadgeStruct]]]:
+    """
+    Search a user's badges for several regex patterns in a single pass over the badges.
+    Each badge's strings are extracted once & checked against every pattern.
+
+    :param user: The user to analyze
+    :param patterns: The patterns to check with, by name. Defaults to USER_BADGE_PATTERNS.
+    :return: The matches & their associated badge, by pattern name
+
+    """
+
+    patterns = patterns if patterns is not None else USER_BADGE_PATTERNS
+    badge_matches: Dict[str, List[Tuple[re.Match, BadgeStruct]]] = {name: [] for name in patterns}
+
+    for badge in user.badge_list:
+        strings: List[str] = badge_strings(badge)
+
+        for name, p in patterns.items():
+            for badge_string in strings:
+                found_match: Optional[re.Match] = p.search(string=badge_string)
+                if found_match is not None:
+                    badge_matches[name].append((found_match, badge))
+                    break
+
+    return badge_matches
 
 
 SUBSCRIBER_BADGE_PATTERN: re.Pattern = re.compile("/sub_")
@@ -83,3 +120,46 @@ MODERATOR_BADGE_PATTERN: re.Pattern = re.compile("moderator", flags=re.IGNORECAS
 TOP_GIFTER_BADGE_PATTERN: re.Pattern = re.compile("/new_top_gifter", flags=re.IGNORECASE)
 MEMBER_LEVEL_BADGE_PATTERN: re.Pattern = re.compile("fans_badge_icon_lv(\\d+)_v")
 GIFTER_LEVEL_BADGE_PATTERN: re.Pattern = re.compile("grade_badge_icon_lite_lv(\\d+)_v")
+
+"""The patterns matched by badge_match_user_all by default, by name"""
+USER_BADGE_PATTERNS: Dict[str, re.Pattern] = {
+    "subscriber": SUBSCRIBER_BADGE_PATTERN,
+    "moderator": MODERATOR_BADGE_PATTERN,
+    "top_gifter": TOP_GIFTER_BADGE_PATTERN,
+    "member_level": MEMBER_LEVEL_BADGE_PATTERN,
+    "gifter_level": GIFTER_LEVEL_BADGE_PATTERN,
+}
+
+
+def warm_proto_metadata(message_types: Iterable[Type[betterproto.Message]]) -> int:
+    """
+    Build the lazily-initialized betterproto metadata for the given message classes & every message class
+    reachable through their fields. Betterproto otherwise builds this on first use, which makes the first
+    messages of a busy room slow to parse. Classes are warmed in the order they are passed.
+
+    This is safe to call from a background thread, as betterproto tolerates concurrent initialization.
+
+    :param message_types: The message classes to warm, hottest first
+    :return: The number of message classes warmed by this call
+
+    """
+
+    warmed: int = 0
+    stack: List[Type[betterproto.Message]] = list(reversed(list(message_types)))
+
+    while stack:
+        message_type: Type[betterproto.Message] = stack.pop()
+
+        if message_type in _WARMED_MESSAGE_TYPES:
+            continue
+
+        # noinspection PyProtectedMember
+        metadata: betterproto.ProtoClassMetadata = message_type._betterproto
+        _WARMED_MESSAGE_TYPES.add(message_type)
+        warmed += 1
+
+        for field_type in metadata.cls_by_field.values():
+            if isinstance(field_type, type) and issubclass(field_type, betterproto.Message):
+                stack.append(field_type)
+
+    return warmed
@@ -0,0 +1,136 @@
+import struct
+from typing import Tuple, Union, Callable, Any, Dict, Iterator
+
+import betterproto
+
+"""A buffer the wire readers can index into without copying"""
+WireBuffer = Union[bytes, bytearray, memoryview]
+
+"""Struct formats for the fixed-width protobuf types"""
+FIXED_FORMATS: Dict[str, struct.Struct] = {
+    betterproto.TYPE_DOUBLE: struct.Struct("<d"),
+    betterproto.TYPE_FLOAT: struct.Struct("<f"),
+    betterproto.TYPE_FIXED32: struct.Struct("<I"),
+    betterproto.TYPE_FIXED64: struct.Struct("<Q"),
+    betterproto.TYPE_SFIXED32: struct.Struct("<i"),
+    betterproto.TYPE_SFIXED64: struct.Struct("<q"),
+}
+
+
+def read_varint(buffer: WireBuffer, pos: int) -> Tuple[int, int]:
+    """
+    Read a varint from a buffer. Betterproto's own decode_varint wraps the buffer in a BytesIO on every call,
+    which is far too slow for scanning every tag of a message.
+
+    :param buffer: The buffer to read from
+    :param pos: The position of the varint
+    :return: The value & the position after it
+
+    """
+
+    result: int = 0
+    shift: int = 0
+
+    while True:
+        byte: int = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+
+        if not byte & 0x80:
+            return result, pos
+
+        shift += 7
+
+        if shift >= 64:
+            raise ValueError("Too many bytes when decoding varint.")
+
+
+def skip_field(buffer: WireBuffer, pos: int, wire_type: int) -> int:
+    """
+    Skip over the value of a field without decoding it
+
+    :param buffer: The buffer to read from
+    :param pos: The position of the field value (after the tag)
+    :param wire_type: The wire type from the tag
+    :return: The position after the value
+
+    """
+
+    if wire_type == betterproto.WIRE_VARINT:
+        return read_varint(buffer, pos)[1]
+
+    if wire_type == betterproto.WIRE_LEN_DELIM:
+        length, pos = read_varint(buffer, pos)
+        return pos + length
+
+    if wire_type == betterproto.WIRE_FIXED_64:
+        return pos + 8
+
+    if wire_type == betterproto.WIRE_FIXED_32:
+        return pos + 4
+
+    raise ValueError(f"Unsupported wire type {wire_type}")
+
+
+def varint_converter(meta: betterproto.FieldMetadata, enum_type: Any = None) -> Callable[[int], Any]:
+    """
+    Build the function that turns a raw varint into the value betterproto would have produced
+
+    :param meta: The field metadata
+    :param enum_type: The enum class, for enum fields
+    :return: The converter
+
+    """
+
+    if meta.proto_type in (betterproto.TYPE_INT32, betterproto.TYPE_INT64):
+        bits: int = int(meta.proto_type[3:])
+        mask: int = (1 << bits) - 1
+        sign_bit: int = 1 << (bits - 1)
+        return lambda value: ((value & mask) ^ sign_bit) - sign_bit
+
+    if meta.proto_type in (betterproto.TYPE_SINT32, betterproto.TYPE_SINT64):
+        return lambda value: (value >> 1) ^ (-(value & 1))
+
+    if meta.proto_type == betterproto.TYPE_BOOL:
+        return lambda value: value > 0
+
+    if meta.proto_type == betterproto.TYPE_ENUM:
+        return enum_type.try_value
+
+    return int
+
+
+def iter_fields(buffer: WireBuffer) -> Iterator[Tuple[int, int, Union[int, memoryview]]]:
+    """
+    Walk the top-level fields of a serialized message without decoding any of them
+
+    :param buffer: The serialized message
+    :return: Yields (field number, wire type, value). Varints are yielded as ints,
+             everything else as a memoryview slice of the buffer.
+
+    """
+
+    view: memoryview = memoryview(buffer)
+    pos: int = 0
+    end: int = len(view)
+
+    while pos < end:
+        tag, pos = read_varint(view, pos)
+        wire_type: int = tag & 0x7
+
+        if wire_type == betterproto.WIRE_VARINT:
+            value, pos = read_varint(view, pos)
+            yield tag >> 3, wire_type, value
+            continue
+
+        if wire_type == betterproto.WIRE_LEN_DELIM:
+            length, pos = read_varint(view, pos)
+        elif wire_type == betterproto.WIRE_FIXED_64:
+            length = 8
+        elif wire_type == betterproto.WIRE_FIXED_32:
+            length = 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+
+        yield tag >> 3, wire_type, view[pos:pos + length]
+        pos += length
@@ -0,0 +1,70 @@
+"""
+Compare capture sizes: raw gzipped push frames vs frames compressed with a dictionary trained on the session.
+Run from this directory: python bench_capture_codec.py
+
+"""
+
+import asyncio
+import gzip
+import os
+import tempfile
+import time
+from typing import List
+
+from samples import sample_fetch_results
+from TikTokLive.client.capture import CaptureWriter, CaptureRecordKind, CaptureReader, SUPPORTS_ZSTANDARD
+from TikTokLive.proto import ProtoMessageFetchResult
+from TikTokLive.proto.custom_extras import WebcastPushFrame
+
+FRAMES: int = 300
+MESSAGES_PER_FRAME: int = 10
+
+
+async def write_capture(path: str, frames: List[bytes], compression: bool) -> None:
+    """Capture the frames as WebcastConnect would receive them: gzipped push frames"""
+
+    async with CaptureWriter(path, fsync=False, compression=compression) as capture:
+        for num, frame in enumerate(frames):
+            push_frame: WebcastPushFrame = WebcastPushFrame(
+                log_id=num,
+                payload_type="msg",
+                payload_encoding="pb",
+                headers={"compress_type": "gzip"},
+                payload=gzip.compress(frame)
+            )
+            msg_ids: List[int] = [message.msg_id for message in ProtoMessageFetchResult().parse(frame).messages]
+            capture.write(CaptureRecordKind.PUSH_FRAME, bytes(push_frame), msg_ids=msg_ids, received_at=float(num))
+
+
+def read_gifts(path: str) -> int:
+    """Scan every frame of the capture for gifts"""
+
+    with CaptureReader(path) as reader:
+        return sum(1 for _ in reader.messages(methods={"WebcastGiftMessage"}))
+
+
+async def main() -> None:
+    frames: List[bytes] = sample_fetch_results(FRAMES, MESSAGES_PER_FRAME)
+    print(f"{FRAMES} frames of {MESSAGES_PER_FRAME} messages, {sum(map(len, frames)) / 1024:.0f} KiB uncompressed, "
+          f"dictionary codec: {'zstd' if SUPPORTS_ZSTANDARD else 'zlib'}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, compression in (("gzip frames", False), ("dictionary", True)):
+            path: str = os.path.join(directory, f"{compression}.cap")
+
+            started: float = time.perf_counter()
+            await write_capture(path, frames, compression)
+            written: float = time.perf_counter() - started
+
+            started = time.perf_counter()
+            gifts: int = read_gifts(path)
+            read: float = time.perf_counter() - started
+
+            print(
+                f"{name:>12}: {os.path.getsize(path) / 1024:7.1f} KiB, "
+                f"written in {written * 1000:6.0f} ms, {gifts} gifts scanned in {read * 1000:6.0f} ms"
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
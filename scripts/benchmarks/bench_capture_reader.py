@@ -0,0 +1,93 @@
+"""
+Pull the gifts from one minute of a long capture: sequential reading vs CaptureReader.
+Run from this directory: python bench_capture_reader.py
+
+"""
+
+import asyncio
+import gzip
+import os
+import tempfile
+import time
+from typing import List
+
+from samples import sample_fetch_results
+from TikTokLive.client.capture import CaptureWriter, CaptureRecordKind, CaptureReader, read_capture
+from TikTokLive.client.ws.ws_utils import extract_webcast_response_message
+from TikTokLive.proto import ProtoMessageFetchResult
+from TikTokLive.proto.custom_extras import WebcastPushFrame
+
+# A 6-hour stream with a frame every second
+HOURS: int = 6
+MINUTE: int = 93
+
+
+async def write_long_capture(path: str) -> None:
+    """Capture a long stream, by cycling through a set of sample frames"""
+
+    frames: List[bytes] = [
+        bytes(
+            WebcastPushFrame(
+                payload_type="msg",
+                payload_encoding="pb",
+                headers={"compress_type": "gzip"},
+                payload=gzip.compress(frame)
+            )
+        )
+        for frame in sample_fetch_results(60, 10)
+    ]
+
+    msg_id: int = 1
+
+    async with CaptureWriter(path, batch_size=4096, fsync=False) as capture:
+        for second in range(HOURS * 3600):
+            capture.write(
+                CaptureRecordKind.PUSH_FRAME,
+                frames[second % len(frames)],
+                msg_ids=range(msg_id, msg_id + 10),
+                received_at=float(second)
+            )
+            msg_id += 10
+
+
+def sequential(path: str) -> int:
+    """Read from the start, decoding every frame to find the minute's gifts"""
+
+    gifts: int = 0
+
+    for record in read_capture(path):
+        if MINUTE * 60 <= record.received_at < (MINUTE + 1) * 60:
+            push_frame: WebcastPushFrame = WebcastPushFrame().parse(record.payload)
+            fetch_result: ProtoMessageFetchResult = extract_webcast_response_message(push_frame)
+            gifts += sum(message.method == "WebcastGiftMessage" for message in fetch_result.messages)
+
+    return gifts
+
+
+def mapped(path: str) -> int:
+    """Seek to the minute & scan only its frames"""
+
+    with CaptureReader(path) as reader:
+        return sum(
+            1 for _ in reader.messages(
+                start_time=MINUTE * 60.0,
+                end_time=(MINUTE + 1) * 60.0,
+                methods={"WebcastGiftMessage"}
+            )
+        )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "long.cap")
+        asyncio.run(write_long_capture(path))
+        print(f"{HOURS} h capture: {os.path.getsize(path) / 1024 / 1024:.1f} MiB, gifts from minute {MINUTE}")
+
+        for name, read in (("sequential", sequential), ("CaptureReader", mapped)):
+            started: float = time.perf_counter()
+            gifts: int = read(path)
+            print(f"{name:>14}: {gifts} gifts in {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare ExtendedUser.from_user against the previous to_pydict() round-trip.
+Run from this directory: python bench_extended_user.py
+
+"""
+
+import timeit
+import tracemalloc
+from typing import List, Callable
+
+from samples import sample_messages
+from TikTokLive.proto import User, ExtendedUser, WebcastChatMessage
+
+NUMBER: int = 5
+
+
+def legacy_from_user(user: User) -> ExtendedUser:
+    """The conversion as it was before from_user shared the user's storage"""
+
+    try:
+        return ExtendedUser(**user.to_pydict())
+    except AttributeError:
+        user_dict = {}
+        for field in user.__class__.__dataclass_fields__:
+            try:
+                user_dict[field] = getattr(user, field)
+            except AttributeError as e:
+                if "is set to None" not in str(e):
+                    raise
+                user_dict[field] = getattr(user, f"_{field}", None)
+        return ExtendedUser(**user_dict)
+
+
+def parsed_users() -> List[User]:
+    """Parse fresh (plain) User objects, as a raw User-typed event field would hold them"""
+
+    return [
+        WebcastChatMessage().parse(message.payload).user_info
+        for message in sample_messages(300)
+        if message.method == "WebcastChatMessage"
+    ]
+
+
+def measure(name: str, convert: Callable[[User], ExtendedUser]) -> None:
+    users_runs: List[List[User]] = [parsed_users() for _ in range(NUMBER)]
+
+    # The users are re-parsed for each run, as from_user upgrades them in place
+    elapsed: float = sum(
+        timeit.timeit(lambda: [convert(user) for user in users], number=1)
+        for users in users_runs
+    )
+
+    users: List[User] = parsed_users()
+    tracemalloc.start()
+    converted: List[ExtendedUser] = [convert(user) for user in users]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_user_us: float = elapsed / (NUMBER * len(users)) * 1e6
+    print(f"{name:>10}: {per_user_us:8.2f} us/user | {allocated / len(converted):8.1f} bytes allocated/user")
+
+
+if __name__ == '__main__':
+    measure("legacy", legacy_from_user)
+    measure("from_user", ExtendedUser.from_user)
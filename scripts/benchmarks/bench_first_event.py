@@ -0,0 +1,74 @@
+"""
+Measure time-to-first-event for a freshly imported client, with & without warming the protobuf metadata.
+
+Each measurement runs in a fresh interpreter, since betterproto caches metadata per process.
+Run from this directory: python bench_first_event.py
+
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+RUNS: int = 5
+
+
+async def _time_first_frame(frame: bytes, warm: bool) -> List[float]:
+    """Parse one frame & return [time to first event, time to last event] in milliseconds"""
+
+    from TikTokLive import TikTokLiveClient
+    from TikTokLive.client.client import PROTO_WARM_ORDER
+    from TikTokLive.proto import ProtoMessageFetchResult
+    from TikTokLive.proto.proto_utils import warm_proto_metadata
+
+    client: TikTokLiveClient = TikTokLiveClient(unique_id="@benchmark")
+
+    # Simulates the warm-up having finished in the background while the client connected
+    if warm:
+        warm_proto_metadata(PROTO_WARM_ORDER)
+
+    started: float = time.perf_counter()
+    first_event: float = 0.0
+
+    async for _ in client._parse_webcast_response(ProtoMessageFetchResult().parse(frame)):
+        first_event = first_event or time.perf_counter()
+
+    return [(first_event - started) * 1000, (time.perf_counter() - started) * 1000]
+
+
+def _run_child(mode: str, frame_path: str) -> List[float]:
+    output: str = subprocess.run(
+        [sys.executable, __file__, "--child", mode, frame_path],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+
+    return [float(value) for value in output.split()]
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        with open(sys.argv[3], "rb") as file:
+            timings: List[float] = asyncio.run(_time_first_frame(file.read(), warm=sys.argv[2] == "warm"))
+        print(*timings)
+        sys.exit(0)
+
+    from samples import sample_fetch_results
+
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as tmp:
+        tmp.write(sample_fetch_results(frames=1, messages_per_frame=30)[0])
+
+    try:
+        for mode in ("cold", "warm"):
+            results: List[List[float]] = [_run_child(mode, tmp.name) for _ in range(RUNS)]
+            first: float = sorted(r[0] for r in results)[RUNS // 2]
+            frame: float = sorted(r[1] for r in results)[RUNS // 2]
+            print(f"{mode:>5}: first event {first:8.2f} ms | full 30-message frame {frame:8.2f} ms (median of {RUNS})")
+    finally:
+        os.unlink(tmp.name)
@@ -0,0 +1,61 @@
+"""
+Forward fetch results downstream: decoded to JSON vs raw protobuf pass-through.
+Run from this directory: python bench_forward.py
+
+"""
+
+import time
+from typing import List, Callable
+
+from samples import sample_fetch_results, ROOM_ID
+from TikTokLive.events.proto_events import EVENT_MAPPINGS
+from TikTokLive.proto import ProtoMessageFetchResult
+from TikTokLive.proto.proto_forward import RawMessage, scan_raw_messages, unpack_raw_messages
+from TikTokLive.proto.proto_json import MessageJSONEncoder
+
+FRAMES: int = 30
+MESSAGES_PER_FRAME: int = 10
+
+encoder: MessageJSONEncoder = MessageJSONEncoder()
+
+
+def decode_to_json(frame: bytes) -> bytes:
+    """What forwarding looks like through the event path: decode every event, then re-encode it"""
+
+    fetch_result: ProtoMessageFetchResult = ProtoMessageFetchResult().parse(frame)
+    return b"\n".join(encoder.encode(EVENT_MAPPINGS[message.method]().parse(message.payload)) for message in fetch_result.messages)
+
+
+def raw_from_parsed(frame: bytes) -> bytes:
+    """Pass-through as the client forwards: from the parsed fetch result, payloads untouched"""
+
+    fetch_result: ProtoMessageFetchResult = ProtoMessageFetchResult().parse(frame)
+    return b"".join(RawMessage.from_message(ROOM_ID, message).pack() for message in fetch_result.messages)
+
+
+def raw_from_wire(frame: bytes) -> bytes:
+    """Pass-through straight from the serialized fetch result"""
+
+    return b"".join(message.pack() for message in scan_raw_messages(frame, room_id=ROOM_ID))
+
+
+def main() -> None:
+    frames: List[bytes] = sample_fetch_results(FRAMES, MESSAGES_PER_FRAME)
+    messages: int = FRAMES * MESSAGES_PER_FRAME
+
+    # The packed stream carries every payload unchanged
+    packed: bytes = b"".join(map(raw_from_wire, frames))
+    assert [bytes(message.payload) for message in unpack_raw_messages(packed)] == [
+        message.payload for frame in frames for message in ProtoMessageFetchResult().parse(frame).messages
+    ]
+
+    forward: Callable[[bytes], bytes]
+    for name, forward in (("decode + JSON", decode_to_json), ("raw (parsed)", raw_from_parsed), ("raw (wire)", raw_from_wire)):
+        started: float = time.perf_counter()
+        size: int = sum(len(forward(frame)) for frame in frames)
+        elapsed: float = time.perf_counter() - started
+        print(f"{name:>14}: {elapsed / messages * 1e6:8.1f} us/message, {size / 1024:7.0f} KiB forwarded")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Gift list for many rooms: each client downloading it on start vs one shared GiftCatalogue refreshed with
+conditional requests, plus looking gifts up by ID in the raw list vs the catalogue index.
+Run from this directory: python bench_gift_catalogue.py
+
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from typing import Optional, List
+
+from TikTokLive.client.gift_catalogue import GiftCatalogue
+from TikTokLive.client.web.web_client import TikTokWebClient
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+from TikTokLive.client.web.web_settings import WebDefaults
+from TikTokLive.events.proto_events import GiftEvent
+from TikTokLive.proto import Gift
+
+CLIENTS: int = 100
+GIFTS: int = 600
+LOOKUPS: int = 20_000
+
+
+def build_gift_list() -> bytes:
+    gifts: List[dict] = [
+        {
+            "id": 5000 + num,
+            "name": f"Gift {num}",
+            "diamond_count": num % 100 + 1,
+            "type": num % 2,
+            "image": {"url_list": [f"https://p16-webcast.tiktokcdn.com/img/gift_{num}.png~tplv-obj.webp"]},
+            "describe": "sent Gift %d" % num,
+        }
+        for num in range(GIFTS)
+    ]
+    return json.dumps({"data": {"gifts": gifts}}).encode()
+
+
+class GiftListServer:
+    """Serves the gift list with an ETag, counting requests & body bytes"""
+
+    def __init__(self):
+        self.body: bytes = build_gift_list()
+        self.etag: bytes = b'"' + hashlib.md5(self.body).hexdigest().encode() + b'"'
+        self.requests: int = 0
+        self.sent: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+
+                if b"if-none-match: " + self.etag in head.lower():
+                    writer.write(b"HTTP/1.1 304 Not Modified\r\nETag: %s\r\nContent-Length: 0\r\n\r\n" % self.etag)
+                else:
+                    self.sent += len(self.body)
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nETag: %s\r\nContent-Length: %d\r\n\r\n%s"
+                        % (self.etag, len(self.body), self.body)
+                    )
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main() -> None:
+    server: GiftListServer = GiftListServer()
+    WebDefaults.tiktok_webcast_url = await server.start() + "/webcast"
+    pool: TikTokHTTPPool = TikTokHTTPPool()
+    webs: List[TikTokWebClient] = [TikTokWebClient(pool=pool) for _ in range(CLIENTS)]
+
+    # Each client fetching it on start (the response cache is bypassed, as by direct callers)
+    started: float = time.perf_counter()
+    gift_lists = await asyncio.gather(*(web.fetch_gift_list.fetch_if_changed() for web in webs))
+    print(
+        f"  per client: {server.requests} requests, {server.sent / 1024:6.0f} KiB in "
+        f"{(time.perf_counter() - started) * 1000:5.0f} ms"
+    )
+
+    # A shared catalogue, then a refresh once its TTL is up
+    server.requests, server.sent = 0, 0
+    catalogue: GiftCatalogue = GiftCatalogue(web=webs[0])
+    started = time.perf_counter()
+    await asyncio.gather(*(catalogue.ensure() for _ in webs))
+    print(
+        f"      shared: {server.requests} requests, {server.sent / 1024:6.0f} KiB in "
+        f"{(time.perf_counter() - started) * 1000:5.0f} ms, {len(catalogue)} gifts indexed"
+    )
+
+    server.requests, server.sent = 0, 0
+    changed: bool = await catalogue.refresh()
+    print(f"     refresh: {server.requests} request, {server.sent / 1024:6.0f} KiB (changed: {changed})")
+
+    # Lookups by gift ID
+    raw_gifts: List[dict] = gift_lists[0][0]["gifts"]
+    gift_ids: List[int] = [random.choice(raw_gifts)["id"] for _ in range(LOOKUPS)]
+
+    started = time.perf_counter()
+    for gift_id in gift_ids:
+        next(gift for gift in raw_gifts if gift["id"] == gift_id)
+    scan: float = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for gift_id in gift_ids:
+        catalogue.get(gift_id)
+    indexed: float = time.perf_counter() - started
+
+    events: List[GiftEvent] = [GiftEvent(m_gift=Gift(id=gift_id)) for gift_id in gift_ids]
+    started = time.perf_counter()
+    for event in events:
+        catalogue.enrich(event)
+    enrich: float = time.perf_counter() - started
+
+    assert all(event.m_gift.diamond_count and event.m_gift.image.m_urls for event in events)
+    print(
+        f"      lookup: list scan {scan / LOOKUPS * 1e6:6.2f} us, index {indexed / LOOKUPS * 1e6:5.2f} us, "
+        f"enrich {enrich / LOOKUPS * 1e6:5.2f} us per event"
+    )
+
+    for web in webs:
+        await web.close()
+
+    await pool.close()
+    server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+"""
+Startup burst: many rooms making their start requests at once, over HTTP/1.1 vs HTTP/2, per client & pooled.
+A local TLS server speaks both (by ALPN) & adds latency to each new connection (the TCP + TLS round trips to
+TikTok) & to each response, so what is measured is how many handshakes the burst waits on.
+Needs the openssl CLI to make a throwaway certificate, & the h2 package.
+Run from this directory: python bench_http2.py
+
+"""
+
+import asyncio
+import os
+import ssl
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Optional, List, Dict
+
+import h2.config
+import h2.connection
+import h2.events
+
+from TikTokLive.client.web.web_base import TikTokHTTPClient
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+from TikTokLive.client.web.web_transport import HostSettings
+
+CLIENTS: int = 100
+REQUESTS_PER_CLIENT: int = 3
+HANDSHAKE_DELAY: float = 0.1
+RESPONSE_DELAY: float = 0.03
+HOST_SETTINGS: Dict[str, HostSettings] = {"127.0.0.1": HostSettings(max_connections=50, max_keepalive_connections=50, keepalive_expiry=60.0, connect_timeout=5.0)}
+
+
+class BurstServer:
+    """An HTTP/1.1 & HTTP/2 server with emulated network latency, counting connections"""
+
+    def __init__(self, context: ssl.SSLContext):
+        self.context: ssl.SSLContext = context
+        self.connections: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0, ssl=self.context)
+        return f"https://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/webcast/room/info/"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(HANDSHAKE_DELAY)
+
+        try:
+            if writer.get_extra_info("ssl_object").selected_alpn_protocol() == "h2":
+                await self._serve_h2(reader, writer)
+            else:
+                await self._serve_h1(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+    @classmethod
+    async def _serve_h1(cls, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while await reader.readuntil(b"\r\n\r\n"):
+            await asyncio.sleep(RESPONSE_DELAY)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}")
+            await writer.drain()
+
+    @classmethod
+    async def _serve_h2(cls, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        writer.write(connection.data_to_send())
+
+        async def respond(stream_id: int) -> None:
+            await asyncio.sleep(RESPONSE_DELAY)
+            connection.send_headers(stream_id, [(":status", "200"), ("content-type", "application/json"), ("content-length", "2")])
+            connection.send_data(stream_id, b"{}", end_stream=True)
+            writer.write(connection.data_to_send())
+
+        while data := await reader.read(65536):
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    asyncio.create_task(respond(event.stream_id))
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+
+            writer.write(connection.data_to_send())
+
+
+def make_contexts(directory: str) -> ssl.SSLContext:
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert, "-days", "1", "-subj", "/CN=127.0.0.1"],
+        check=True, capture_output=True
+    )
+
+    context: ssl.SSLContext = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+    return context
+
+
+async def burst(url: str, http2: bool, pooled: bool) -> List[float]:
+    """Start every client at once, each making its requests in turn as on start, & time each client"""
+
+    pool: Optional[TikTokHTTPPool] = (
+        TikTokHTTPPool(http2=http2, host_limits=HOST_SETTINGS, transport_kwargs={"verify": False}) if pooled else None
+    )
+    clients: List[TikTokHTTPClient] = [
+        TikTokHTTPClient(pool=pool) if pooled else
+        TikTokHTTPClient(http2=http2, host_settings=HOST_SETTINGS, httpx_kwargs={"verify": False})
+        for _ in range(CLIENTS)
+    ]
+
+    async def start(client: TikTokHTTPClient) -> float:
+        started: float = time.perf_counter()
+        for _ in range(REQUESTS_PER_CLIENT):
+            (await client.get(url, base_params=False)).raise_for_status()
+        return time.perf_counter() - started
+
+    latencies: List[float] = await asyncio.gather(*(start(client) for client in clients))
+
+    for client in clients:
+        await client.close()
+
+    if pool is not None:
+        await pool.close()
+
+    return latencies
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        context: ssl.SSLContext = make_contexts(directory)
+
+        for pooled in (False, True):
+            for http2 in (False, True):
+                server: BurstServer = BurstServer(context)
+                url: str = await server.start()
+
+                started: float = time.perf_counter()
+                latencies: List[float] = sorted(await burst(url, http2, pooled))
+                elapsed: float = time.perf_counter() - started
+
+                print(
+                    f"{'pooled' if pooled else 'per client':>10} {'HTTP/2' if http2 else 'HTTP/1.1':>8}: "
+                    f"burst {elapsed * 1000:5.0f} ms, start p50 {statistics.median(latencies) * 1000:5.0f} ms, "
+                    f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:5.0f} ms, {server.connections:3d} connections"
+                )
+
+                server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Many clients making a few requests each: one connection pool per client vs a shared TikTokHTTPPool.
+Counts the connections a local keep-alive server sees (each is a TCP + TLS handshake against TikTok)
+and the memory held by the clients.
+Run from this directory: python bench_http_pool.py
+
+"""
+
+import asyncio
+import time
+import tracemalloc
+from typing import List, Optional
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+
+CLIENTS: int = 200
+REQUESTS_PER_CLIENT: int = 3
+CONCURRENCY: int = 10
+
+
+class CountingServer:
+    """A minimal HTTP/1.1 keep-alive server that counts the connections it accepts"""
+
+    def __init__(self):
+        self.connections: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/webcast/room/info/"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run(url: str, pool: Optional[TikTokHTTPPool]) -> List[TikTokLiveClient]:
+    """Build the clients & have them request in waves, as rooms come & go"""
+
+    clients: List[TikTokLiveClient] = [
+        TikTokLiveClient(unique_id=f"creator_{num}", http_pool=pool) for num in range(CLIENTS)
+    ]
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def poll(client: TikTokLiveClient) -> None:
+        for _ in range(REQUESTS_PER_CLIENT):
+            async with semaphore:
+                (await client.web.get(url)).raise_for_status()
+
+    await asyncio.gather(*(poll(client) for client in clients))
+    return clients
+
+
+async def main() -> None:
+    for name in ("per client", "shared pool"):
+        server: CountingServer = CountingServer()
+        url: str = await server.start()
+        pool: Optional[TikTokHTTPPool] = TikTokHTTPPool() if name == "shared pool" else None
+
+        tracemalloc.start()
+        started: float = time.perf_counter()
+        clients: List[TikTokLiveClient] = await run(url, pool)
+        elapsed: float = time.perf_counter() - started
+        memory: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print(
+            f"{name:>12}: {CLIENTS} clients x {REQUESTS_PER_CLIENT} requests in {elapsed * 1000:6.0f} ms, "
+            f"{server.connections:4d} connections, {memory / 1024 / 1024:5.1f} MiB held"
+        )
+
+        for client in clients:
+            await client.close()
+
+        if pool is not None:
+            await pool.close()
+
+        server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
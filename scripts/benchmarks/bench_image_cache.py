@@ -0,0 +1,120 @@
+"""
+Overlay-style image fetching: many rooms asking for the same avatars & gift icons, through signed CDN URLs
+that differ on every event. Downloads with no cache vs the memory tier vs a restart on a warm disk tier.
+A local "CDN" serves the images from two mirrors, the first of which fails for some of them.
+Run from this directory: python bench_image_cache.py
+
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Optional, List
+
+from TikTokLive.client.web.web_client import TikTokWebClient
+from TikTokLive.client.web.web_image_cache import ImageCache
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+from TikTokLive.proto import ImageModel
+
+IMAGES: int = 300
+IMAGE_SIZE: int = 8 * 1024
+REQUESTS: int = 5000
+CONCURRENCY: int = 50
+
+
+class MirrorServer:
+    """Serves any image path, counting downloads. A flaky mirror fails one in five images."""
+
+    def __init__(self, flaky: bool):
+        self.flaky: bool = flaky
+        self.downloads: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                path: bytes = head.split(b" ")[1].split(b"?")[0]
+
+                if self.flaky and int(path.split(b"/")[-1].split(b"~")[0]) % 5 == 0:
+                    writer.write(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n")
+                else:
+                    self.downloads += 1
+                    body: bytes = path.ljust(IMAGE_SIZE, b".")
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: image/webp\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def signed_image(mirrors: List[str], num: int) -> ImageModel:
+    """An image as it arrives in an event, signed differently each time"""
+
+    query: str = f"x-expires={random.randint(1, 10 ** 9)}&x-signature={random.getrandbits(64):x}"
+    return ImageModel(m_urls=[f"{mirror}/tos-maliva-avt-0068/{num}~c5_100x100.webp?{query}" for mirror in mirrors])
+
+
+async def run(name: str, web: TikTokWebClient, mirrors: List[str], servers: List[MirrorServer], cached: bool) -> None:
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(CONCURRENCY)
+    for server in servers:
+        server.downloads = 0
+
+    async def fetch(num: int) -> None:
+        image: ImageModel = signed_image(mirrors, num)
+        async with semaphore:
+            data: bytes = await (web.fetch_image_data(image) if cached else web.fetch_image_data.download(image.m_urls))
+        assert data.startswith(b"/tos-maliva-avt-0068/%d~" % num)
+
+    # Popular images are asked for far more often, as with regular chatters & cheap gifts
+    numbers: List[int] = [min(int(random.paretovariate(1.2)) - 1, IMAGES - 1) for _ in range(REQUESTS)]
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(fetch(num) for num in numbers))
+    elapsed: float = time.perf_counter() - started
+
+    print(
+        f"{name:>14}: {REQUESTS} fetches in {elapsed * 1000:6.0f} ms, "
+        f"{sum(server.downloads for server in servers):5d} downloads"
+    )
+
+
+async def main() -> None:
+    servers: List[MirrorServer] = [MirrorServer(flaky=True), MirrorServer(flaky=False)]
+    mirrors: List[str] = [await server.start() for server in servers]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, cache, cached in (
+                ("no cache", None, False),
+                ("memory + disk", ImageCache(directory=directory), True),
+                ("restart (disk)", ImageCache(directory=directory), True),
+        ):
+            pool: TikTokHTTPPool = TikTokHTTPPool(image_cache=cache)
+            web: TikTokWebClient = TikTokWebClient(pool=pool)
+            await run(name, web, mirrors, servers, cached)
+
+            if cache is not None:
+                print(
+                    f"{'':>14}  memory hits {cache.memory_hits}, disk hits {cache.disk_hits}, "
+                    f"coalesced {cache.coalesced}, {cache.memory_bytes / 1024:.0f} KiB in memory"
+                )
+
+            await web.close()
+            await pool.close()
+
+        objects: int = sum(len(files) for _, _, files in os.walk(os.path.join(directory, "objects")))
+        print(f"{'':>14}  {objects} images on disk")
+
+    for server in servers:
+        server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Measure the memory held by a window of decoded events, with & without string interning,
+as a long-running ingest process that keeps recent events around would hold them.
+Run from this directory: python bench_intern.py
+
+"""
+
+import gc
+import time
+import tracemalloc
+from typing import List, Optional, Type
+
+from samples import sample_messages
+from TikTokLive.events.proto_events import EVENT_MAPPINGS, ProtoEvent
+from TikTokLive.proto import ProtoMessageFetchResultBaseProtoMessage
+from TikTokLive.proto.proto_intern import MessageInterner
+
+MESSAGES: int = 1500
+USERS: int = 100
+
+
+def ingest(messages: List[ProtoMessageFetchResultBaseProtoMessage], interner: Optional[MessageInterner]) -> List[ProtoEvent]:
+    events: List[ProtoEvent] = []
+
+    for message in messages:
+        event_type: Type[ProtoEvent] = EVENT_MAPPINGS[message.method]
+        event: ProtoEvent = event_type().parse(message.payload)
+
+        if interner is not None:
+            interner.intern(event)
+
+        events.append(event)
+
+    return events
+
+
+def measure(name: str, messages: List[ProtoMessageFetchResultBaseProtoMessage], interner: Optional[MessageInterner]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    events: List[ProtoEvent] = ingest(messages, interner)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    extra: str = ""
+    if interner is not None:
+        extra = f" | pool {len(interner.pool)} strings, {interner.pool.hits / (interner.pool.hits + interner.pool.misses):.0%} hits"
+
+    print(f"{name:>12}: {retained / 1024 / 1024:7.2f} MiB retained{extra}")
+    del events
+
+
+def measure_cost(messages: List[ProtoMessageFetchResultBaseProtoMessage]) -> None:
+    events: List[ProtoEvent] = ingest(messages, None)
+    interner: MessageInterner = MessageInterner()
+
+    started: float = time.perf_counter()
+    for event in events:
+        interner.intern(event)
+    interned: float = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ingest(messages, None)
+    parsed: float = time.perf_counter() - started
+
+    print(f"Interning costs {interned / len(events) * 1e6:.1f} us/event, {interned / parsed:.1%} of the parse")
+
+
+def main() -> None:
+    messages: List[ProtoMessageFetchResultBaseProtoMessage] = sample_messages(MESSAGES, users=USERS)
+
+    # Build the metadata & intern plans up front, so neither run pays for them
+    ingest(messages[:30], MessageInterner())
+
+    print(f"{MESSAGES} comment/gift/like events from {USERS} users, all kept alive")
+    measure("no interning", messages, None)
+    measure("interned", messages, MessageInterner())
+    measure("pool of 256", messages, MessageInterner(max_size=256))
+    measure_cost(messages)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare MessageJSONEncoder against to_dict() + json.dumps, as used to forward events to browsers.
+Run from this directory: python bench_json.py
+
+"""
+
+import json
+import time
+from typing import List, Callable
+
+from samples import sample_messages
+from TikTokLive.events.proto_events import EVENT_MAPPINGS, ProtoEvent, CommentEvent
+from TikTokLive.proto import proto_json
+from TikTokLive.proto.proto_json import MessageJSONEncoder
+
+MESSAGES: int = 600
+ROUNDS: int = 3
+
+
+def measure(name: str, events: List[ProtoEvent], encode: Callable[[ProtoEvent], bytes]) -> float:
+    best: float = min(
+        _timed(lambda: [encode(event) for event in events])
+        for _ in range(ROUNDS)
+    )
+
+    per_event_us: float = best / len(events) * 1e6
+    print(f"{name:>32}: {per_event_us:8.1f} us/event")
+    return per_event_us
+
+
+def _timed(run: Callable[[], object]) -> float:
+    started: float = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    events: List[ProtoEvent] = [EVENT_MAPPINGS[message.method]().parse(message.payload) for message in sample_messages(MESSAGES)]
+    encoder: MessageJSONEncoder = MessageJSONEncoder()
+
+    # The output must match the old path before the timings mean anything
+    for event in events:
+        assert json.loads(encoder.encode(event)) == json.loads(json.dumps(event.to_dict())), event.type
+
+    print(f"{MESSAGES} comment/gift/like events, best of {ROUNDS}")
+    baseline: float = measure("to_dict() + json.dumps", events, lambda event: json.dumps(event.to_dict()).encode())
+
+    supports_orjson: bool = proto_json.SUPPORTS_ORJSON
+    proto_json.SUPPORTS_ORJSON = False
+    stdlib: float = measure("MessageJSONEncoder (json)", events, MessageJSONEncoder().encode)
+    proto_json.SUPPORTS_ORJSON = supports_orjson
+
+    results: List[str] = [f"json {baseline / stdlib:.1f}x"]
+
+    if supports_orjson:
+        fast: float = measure("MessageJSONEncoder (orjson)", events, encoder.encode)
+        results.append(f"orjson {baseline / fast:.1f}x")
+
+    comments: List[ProtoEvent] = [event for event in events if isinstance(event, CommentEvent)]
+    narrow: MessageJSONEncoder = MessageJSONEncoder(fields={CommentEvent: ["user_info", "content"]})
+    measure("to_dict() + json.dumps (comments)", comments, lambda event: json.dumps(event.to_dict()).encode())
+    measure("user_info + content (comments)", comments, narrow.encode)
+
+    print("Speed-up over to_dict() + json.dumps: " + ", ".join(results))
+
+
+if __name__ == '__main__':
+    main()
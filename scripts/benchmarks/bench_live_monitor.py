@@ -0,0 +1,135 @@
+"""
+Tracking the live status of many creators: one is_live() call per creator per interval vs a LiveMonitor.
+A local server plays both /room/check_alive/ & the user room API for a population of creators who go
+live & offline at random, counting the requests each approach makes & the status changes the monitor sees.
+Run from this directory: python bench_live_monitor.py
+
+"""
+
+import asyncio
+import json
+import random
+import time
+import urllib.parse
+from typing import Dict, Optional, List
+
+from TikTokLive.client.live_monitor import LiveMonitor
+from TikTokLive.client.web.web_client import TikTokWebClient
+from TikTokLive.client.web.web_settings import WebDefaults
+
+CREATORS: int = 1000
+LIVE_SHARE: float = 0.1
+FLIPS_PER_SECOND: int = 2
+DURATION: float = 60.0
+MIN_INTERVAL: float = 2.0
+MAX_INTERVAL: float = 16.0
+
+
+class FakeTikTok:
+    """Answers check_alive & user room lookups for creators whose status flips at random"""
+
+    def __init__(self):
+        self.live: Dict[str, bool] = {f"creator_{num}": random.random() < LIVE_SHARE for num in range(CREATORS)}
+        self.rooms: Dict[str, int] = {unique_id: 1_000_000 + num for num, unique_id in enumerate(self.live)}
+        self.requests: int = 0
+        self.changes: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    def flip(self) -> None:
+        """Creators going live get a new room, as on TikTok"""
+
+        for unique_id in random.sample(list(self.live), FLIPS_PER_SECOND):
+            self.live[unique_id] = not self.live[unique_id]
+            self.changes += 1
+
+            if self.live[unique_id]:
+                self.rooms[unique_id] += CREATORS
+
+    def _respond(self, target: str) -> dict:
+        url = urllib.parse.urlsplit(target)
+        params: Dict[str, str] = dict(urllib.parse.parse_qsl(url.query))
+
+        if url.path.endswith("/room/check_alive/"):
+            live_rooms = {room_id for unique_id, room_id in self.rooms.items() if self.live[unique_id]}
+            room_ids: List[int] = [int(room_id) for room_id in params["room_ids"].split(",")]
+            return {"data": [{"alive": room_id in live_rooms, "room_id": room_id} for room_id in room_ids]}
+
+        unique_id: str = params["uniqueId"]
+        return {
+            "message": "",
+            "data": {"user": {"roomId": str(self.rooms[unique_id])}, "liveRoom": {"status": 2 if self.live[unique_id] else 4}}
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                body: bytes = json.dumps(self._respond(head.split(b" ")[1].decode())).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def flipping(tiktok: FakeTikTok) -> None:
+    while True:
+        await asyncio.sleep(1)
+        tiktok.flip()
+
+
+async def main() -> None:
+    tiktok: FakeTikTok = FakeTikTok()
+    url: str = await tiktok.start()
+    WebDefaults.tiktok_app_url, WebDefaults.tiktok_webcast_url = url, url + "/webcast"
+
+    # One round of individual checks, as with is_live() per creator
+    web: TikTokWebClient = TikTokWebClient()
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(10)
+
+    async def check(unique_id: str) -> None:
+        async with semaphore:
+            await web.fetch_is_live(unique_id=unique_id)
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(check(unique_id) for unique_id in tiktok.live))
+    elapsed: float = time.perf_counter() - started
+    print(
+        f"  is_live() each: {tiktok.requests} requests per round ({elapsed:.1f} s), "
+        f"{tiktok.requests * DURATION / MIN_INTERVAL:.0f} over {DURATION:.0f} s at a {MIN_INTERVAL:.0f} s interval"
+    )
+    await web.close()
+
+    # The monitor, while creators come & go
+    tiktok.requests = 0
+    seen: List[str] = []
+    monitor: LiveMonitor = LiveMonitor(min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL)
+    monitor.on_live(lambda unique_id, room_id: seen.append(unique_id))
+    monitor.on_offline(lambda unique_id, room_id: seen.append(unique_id))
+    monitor.watch(*tiktok.live)
+
+    await monitor.poll()
+    first_round, initial = tiktok.requests, len(seen)
+    seen.clear()
+
+    flipper: asyncio.Task = asyncio.create_task(flipping(tiktok))
+    monitor.start()
+    await asyncio.sleep(DURATION)
+    flipper.cancel()
+    await monitor.close()
+
+    print(
+        f"     LiveMonitor: {first_round} requests on the first round ({initial} live), "
+        f"{tiktok.requests - first_round} over {DURATION:.0f} s, {len(seen)} of {tiktok.changes} changes seen"
+    )
+
+    tiktok.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Measure end-to-end events per second by replaying a capture through TikTokLiveClient.
+Run from this directory: python bench_replay.py [capture path]
+
+Without a path, a capture of sample traffic is generated first.
+
+"""
+
+import asyncio
+import gzip
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import List
+
+from samples import sample_fetch_results
+from TikTokLive import TikTokLiveClient
+from TikTokLive.client.capture import CaptureWriter, CaptureRecordKind
+from TikTokLive.events import CommentEvent, GiftEvent, LikeEvent, ConnectEvent
+from TikTokLive.proto import ProtoMessageFetchResult
+from TikTokLive.proto.custom_extras import WebcastPushFrame
+
+FRAMES: int = 100
+MESSAGES_PER_FRAME: int = 10
+FRAME_INTERVAL: float = 0.01
+
+
+async def write_sample_capture(path: str) -> None:
+    """Capture sample traffic as WebcastConnect would: a fetch result, then gzipped push frames"""
+
+    frames: List[bytes] = sample_fetch_results(FRAMES, MESSAGES_PER_FRAME)
+
+    async with CaptureWriter(path, fsync=False) as capture:
+        for num, frame in enumerate(frames):
+            msg_ids: List[int] = [message.msg_id for message in ProtoMessageFetchResult().parse(frame).messages]
+
+            if num == 0:
+                capture.write(CaptureRecordKind.FETCH_RESULT, frame, msg_ids=msg_ids, received_at=0.0)
+                continue
+
+            push_frame: WebcastPushFrame = WebcastPushFrame(
+                log_id=num,
+                payload_type="msg",
+                payload_encoding="pb",
+                headers={"compress_type": "gzip"},
+                payload=gzip.compress(frame)
+            )
+            capture.write(CaptureRecordKind.PUSH_FRAME, bytes(push_frame), msg_ids=msg_ids, received_at=num * FRAME_INTERVAL)
+
+
+async def replay(path: str, speed: float = None) -> None:
+    client: TikTokLiveClient = TikTokLiveClient(unique_id="replay")
+    counts: Counter = Counter()
+
+    @client.on(ConnectEvent)
+    async def on_connect(_: ConnectEvent) -> None:
+        counts["connect"] += 1
+
+    @client.on(CommentEvent)
+    async def on_comment(event: CommentEvent) -> None:
+        counts["events"] += 1
+        counts["nicknames"] += len(event.user.nickname)
+
+    @client.on(GiftEvent)
+    def on_gift(event: GiftEvent) -> None:
+        counts["events"] += 1
+        counts["diamonds"] += event.gift.diamond_count * event.repeat_count
+
+    @client.on(LikeEvent)
+    def on_like(event: LikeEvent) -> None:
+        counts["events"] += 1
+        counts["likes"] += event.count
+
+    started: float = time.perf_counter()
+    await (await client.replay(path, speed=speed))
+
+    # Let the last async handlers finish
+    await asyncio.sleep(0)
+    elapsed: float = time.perf_counter() - started
+
+    label: str = "as fast as possible" if speed is None else f"{speed:g}x real-time"
+    print(f"{label:>20}: {counts['events']} events handled in {elapsed:6.2f} s -> {counts['events'] / elapsed:7.1f} events/s")
+
+
+async def main() -> None:
+    if len(sys.argv) > 1:
+        await replay(sys.argv[1])
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "sample.cap")
+        await write_sample_capture(path)
+        print(f"Captured {FRAMES} frames of {MESSAGES_PER_FRAME} messages, {FRAME_INTERVAL * 1000:g} ms apart")
+
+        await replay(path)
+        await replay(path, speed=1.0)
+        await replay(path, speed=10.0)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
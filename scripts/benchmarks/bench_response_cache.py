@@ -0,0 +1,79 @@
+"""
+Many clients on one TikTokHTTPPool fetching the same room info as they start: every request sent vs
+identical GETs coalesced & cached by route. Counts the requests a local server sees.
+Run from this directory: python bench_response_cache.py
+
+"""
+
+import asyncio
+import time
+from typing import List, Optional
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+
+CLIENTS: int = 200
+ROOMS: int = 5
+REQUESTS_PER_CLIENT: int = 3
+RESPONSE_DELAY: float = 0.05
+
+
+class CountingServer:
+    """A minimal HTTP/1.1 keep-alive server that counts the requests it answers, each after a delay"""
+
+    def __init__(self):
+        self.requests: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/webcast/room/info/"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                await asyncio.sleep(RESPONSE_DELAY)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main() -> None:
+    for name, cache_ttl in (("no cache", None), ("cached", 5.0)):
+        server: CountingServer = CountingServer()
+        url: str = await server.start()
+        pool: TikTokHTTPPool = TikTokHTTPPool()
+
+        # Several clients watch each room, as when fanning out over a creator's rooms
+        clients: List[TikTokLiveClient] = [
+            TikTokLiveClient(unique_id=f"creator_{num}", http_pool=pool) for num in range(CLIENTS)
+        ]
+
+        async def poll(num: int, client: TikTokLiveClient) -> None:
+            for _ in range(REQUESTS_PER_CLIENT):
+                response = await client.web.get(url, extra_params={"room_id": num % ROOMS}, cache_ttl=cache_ttl)
+                response.raise_for_status()
+
+        started: float = time.perf_counter()
+        await asyncio.gather(*(poll(num, client) for num, client in enumerate(clients)))
+        elapsed: float = time.perf_counter() - started
+        cache = pool.response_cache
+
+        print(
+            f"{name:>8}: {CLIENTS * REQUESTS_PER_CLIENT} GETs over {ROOMS} rooms in {elapsed * 1000:6.0f} ms, "
+            f"{server.requests:4d} sent (hits {cache.hits}, coalesced {cache.coalesced})"
+        )
+
+        for client in clients:
+            await client.close()
+
+        await pool.close()
+        server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+Room ID lookup from a live page: the whole page downloaded & SIGI_STATE fully parsed vs the page streamed
+up to the end of SIGI_STATE & only the room user decoded. The page is synthetic, sized like a real one, &
+served by a local server at a fixed bandwidth that counts the bytes it gets to send.
+Run from this directory: python bench_room_id_html.py
+
+"""
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.client.web.routes.fetch_room_id_live_html import FetchRoomIdLiveHTMLRoute
+
+LOOKUPS: int = 20
+CHUNK_SIZE: int = 16 * 1024
+BANDWIDTH: float = 20 * 1024 * 1024
+
+
+def build_page() -> bytes:
+    """A live page: markup, then a SIGI_STATE with the room user among other state, then the app bundle"""
+
+    filler = lambda num: {f"key_{idx}": {"id": str(idx) * 8, "text": "lorem ipsum " * 8, "n": idx} for idx in range(num)}
+    sigi_state: dict = {
+        "AppContext": filler(150),
+        "LiveRoom": {
+            "liveRoomUserInfo": {
+                "user": {"id": "6812345678901234567", "uniqueId": "creator", "roomId": "7301234567890123456", "status": 2},
+                "stats": {"followerCount": 1234567},
+                "liveRoom": {"status": 2, "title": "live", "streamData": filler(100)},
+            }
+        },
+        "UserModule": filler(200),
+    }
+
+    return b"".join((
+        b"<html><head>" + b"<meta name='x' content='" + b"y" * 40_000 + b"'></head><body>",
+        b'<script id="SIGI_STATE" type="application/json">' + json.dumps(sigi_state).encode() + b"</script>",
+        b"<script>" + b"var bundle = 0;" * 30_000 + b"</script></body></html>",
+    ))
+
+
+class PageServer:
+    """Serves one page per connection at a fixed bandwidth, counting the bytes sent before the client hangs up"""
+
+    def __init__(self, page: bytes):
+        self.page: bytes = page
+        self.sent: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/@creator/live"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: %d\r\n\r\n" % len(self.page))
+
+                for start in range(0, len(self.page), CHUNK_SIZE):
+                    chunk: bytes = self.page[start:start + CHUNK_SIZE]
+                    writer.write(chunk)
+                    await writer.drain()
+                    self.sent += len(chunk)
+                    await asyncio.sleep(len(chunk) / BANDWIDTH)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def parse_full(html: str) -> str:
+    """The previous parse: all of SIGI_STATE loaded"""
+
+    sigi_state: dict = json.loads(FetchRoomIdLiveHTMLRoute.SIGI_PATTERN.search(html).group(1))
+    return sigi_state["LiveRoom"]["liveRoomUserInfo"]["user"]["roomId"]
+
+
+async def main() -> None:
+    page: bytes = build_page()
+    html: str = page.decode()
+    print(f"page: {len(page) / 1024:.0f} KiB")
+
+    # Parse only
+    for name, parse in (("full parse", parse_full), ("room user scan", FetchRoomIdLiveHTMLRoute.parse_room_id)):
+        started: float = time.perf_counter()
+        for _ in range(LOOKUPS):
+            assert parse(html) == "7301234567890123456"
+        print(f"{name:>16}: {(time.perf_counter() - started) / LOOKUPS * 1000:6.2f} ms/parse")
+
+    # Download & parse
+    for name, read_until in (("whole page", None), ("streamed", FetchRoomIdLiveHTMLRoute.SIGI_MARKERS)):
+        server: PageServer = PageServer(page)
+        url: str = await server.start()
+        client: TikTokLiveClient = TikTokLiveClient(unique_id="creator")
+
+        started: float = time.perf_counter()
+        for _ in range(LOOKUPS):
+            response = await client.web.get(url, base_params=False, read_until=read_until)
+            FetchRoomIdLiveHTMLRoute.parse_room_id(response.text)
+        elapsed: float = time.perf_counter() - started
+
+        print(
+            f"{name:>16}: {elapsed / LOOKUPS * 1000:6.1f} ms/lookup, "
+            f"{server.sent / LOOKUPS / 1024:5.0f} KiB sent/lookup"
+        )
+
+        await client.close()
+        server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
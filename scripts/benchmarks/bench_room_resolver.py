@@ -0,0 +1,136 @@
+"""
+Room ID lookups through the live page HTML, falling back to the API (as before, & ordered by stats) vs hedging
+the first method with the other vs racing both.
+A local server stands in for TikTok: the HTML is usually quicker, but some pages stall & some are captcha pages,
+while the API is slower but steady. Each lookup gets the same latencies in every mode.
+Run from this directory: python bench_room_resolver.py
+
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Optional, List
+
+from TikTokLive.client.room_resolver import RoomIdResolver, RoomIdMethod
+from TikTokLive.client.web.web_client import TikTokWebClient
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+from TikTokLive.client.web.web_settings import WebDefaults
+
+LOOKUPS: int = 300
+CONCURRENCY: int = 20
+SIGI_OPEN_TAG: bytes = b'<script id="SIGI_STATE" type="application/json">'
+
+
+class LookupServer:
+    """Serves live pages & the user room API with seeded latencies, counting requests"""
+
+    def __init__(self):
+        self.requests: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                target: str = head.split(b" ")[1].decode()
+
+                if target.startswith("/api-live/"):
+                    num: int = int(target.split("uniqueId=creator")[1].split("&")[0])
+                    body: bytes = await self._api(num)
+                else:
+                    num: int = int(target.split("/@creator")[1].split("/")[0])
+                    body: bytes = await self._html(num)
+
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    @classmethod
+    async def _html(cls, num: int) -> bytes:
+        rng: random.Random = random.Random(f"html-{num}")
+        draw: float = rng.random()
+
+        # Stalled pages & captcha pages
+        if draw < 0.1:
+            await asyncio.sleep(2.5)
+        elif draw < 0.15:
+            await asyncio.sleep(0.3)
+            return b"<html><body>Verify to continue</body></html>"
+        else:
+            await asyncio.sleep(rng.uniform(0.15, 0.35))
+
+        sigi_state: dict = {"LiveRoom": {"liveRoomUserInfo": {"user": {"roomId": str(7 * 10 ** 18 + num), "status": 2}}}}
+        return b"<html><head>%s%s</script></head></html>" % (SIGI_OPEN_TAG, json.dumps(sigi_state).encode())
+
+    @classmethod
+    async def _api(cls, num: int) -> bytes:
+        await asyncio.sleep(random.Random(f"api-{num}").uniform(0.3, 0.5))
+        return json.dumps({"message": "", "data": {"user": {"roomId": str(7 * 10 ** 18 + num)}}}).encode()
+
+
+class BaselineResolver(RoomIdResolver):
+    """The lookup as it was: always the HTML, then the API once that fails"""
+
+    async def resolve(self, web: TikTokWebClient, unique_id: str) -> int:
+        try:
+            room_id: int = int(await web.fetch_room_id_from_html(unique_id))
+            self.stats[RoomIdMethod.HTML].wins += 1
+        except Exception:
+            room_id: int = int(await web.fetch_room_id_from_api(unique_id))
+            self.stats[RoomIdMethod.API].wins += 1
+
+        return room_id
+
+
+async def run(name: str, resolver: RoomIdResolver, server: LookupServer, web: TikTokWebClient) -> None:
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(CONCURRENCY)
+    server.requests = 0
+
+    async def look_up(num: int) -> float:
+        async with semaphore:
+            started: float = time.perf_counter()
+            assert await resolver.resolve(web, f"creator{num}") == 7 * 10 ** 18 + num
+            return time.perf_counter() - started
+
+    timings: List[float] = sorted(await asyncio.gather(*(look_up(num) for num in range(LOOKUPS))))
+    html, api = resolver.stats[RoomIdMethod.HTML], resolver.stats[RoomIdMethod.API]
+
+    print(
+        f"{name:>8}: mean {statistics.mean(timings) * 1000:5.0f} ms, p50 {timings[len(timings) // 2] * 1000:5.0f} ms, "
+        f"p95 {timings[int(len(timings) * 0.95)] * 1000:5.0f} ms, p99 {timings[int(len(timings) * 0.99)] * 1000:5.0f} ms, "
+        f"{server.requests / LOOKUPS:.2f} requests per lookup (HTML won {html.wins}, API won {api.wins})"
+    )
+
+
+async def main() -> None:
+    server: LookupServer = LookupServer()
+    WebDefaults.tiktok_app_url = await server.start()
+
+    for name, resolver in (
+            ("baseline", BaselineResolver()),
+            ("fallback", RoomIdResolver(hedge=False)),
+            ("hedged", RoomIdResolver()),
+            ("race", RoomIdResolver(hedge_delay=0)),
+    ):
+        # No response cache, as every lookup is for another creator anyway
+        pool: TikTokHTTPPool = TikTokHTTPPool(cache_entries=0)
+        web: TikTokWebClient = TikTokWebClient(pool=pool)
+        await run(name, resolver, server, web)
+        await web.close()
+        await pool.close()
+
+    server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+"""
+Many clients fetching the signed WebSocket at once against a sign server quota, each retrying on its own after a 429
+(as before) vs waiting their turn on the shared SignRateLimiter, learning the quota or given it up front.
+A local sign server allows QUOTA requests per second (a fixed window) & answers the rest with 429s & its usual hints.
+Run from this directory: python bench_sign_limiter.py
+
+"""
+
+import asyncio
+import json
+import math
+import statistics
+import time
+from typing import Optional, List
+
+from TikTokLive.client.errors import SignatureRateLimitError
+from TikTokLive.client.web.web_client import TikTokWebClient
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+from TikTokLive.client.web.web_settings import WebDefaults
+from TikTokLive.client.web.web_sign_limiter import SignRateLimiter
+from TikTokLive.proto import ProtoMessageFetchResult
+
+CLIENTS: int = 200
+QUOTA: int = 20
+SIGN_DELAY: float = 0.05
+
+INITIAL_RESPONSE: bytes = bytes(ProtoMessageFetchResult(
+    cursor="1",
+    push_server="wss://127.0.0.1:1/webcast/im/push/v2/",
+    route_params={"room_id": "7000000000000000000"}
+))
+
+
+class QuotaSignServer:
+    """A sign server allowing QUOTA requests per one second window, counting what it serves & refuses"""
+
+    def __init__(self):
+        self.served: int = 0
+        self.refused: int = 0
+        self.window: int = 0
+        self.window_count: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                now: float = time.time()
+
+                if int(now) != self.window:
+                    self.window, self.window_count = int(now), 0
+
+                self.window_count += 1
+
+                if self.window_count > QUOTA:
+                    self.refused += 1
+                    body: bytes = json.dumps({"message": "Rate limited", "limit_label": f"{QUOTA} per second"}).encode()
+                    writer.write(
+                        b"HTTP/1.1 429 Too Many Requests\r\nContent-Type: application/json\r\nRateLimit-Limit: %d\r\n"
+                        b"RateLimit-Remaining: %d\r\nRateLimit-Reset: %d\r\nContent-Length: %d\r\n\r\n%s"
+                        % (QUOTA, math.ceil(self.window + 1 - now), self.window + 1, len(body), body)
+                    )
+                else:
+                    self.served += 1
+                    await asyncio.sleep(SIGN_DELAY)
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/x-protobuf\r\nX-Set-TT-Cookie: ttwid=benchmark\r\n"
+                        b"Content-Length: %d\r\n\r\n%s" % (len(INITIAL_RESPONSE), INITIAL_RESPONSE)
+                    )
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+class UnlimitedLimiter(SignRateLimiter):
+    """No limiter, as before: every request goes straight out"""
+
+    async def acquire(self) -> float:
+        return 0.0
+
+    def on_rate_limited(self, response) -> None:
+        pass
+
+
+async def run(name: str, limiter: SignRateLimiter, server: QuotaSignServer) -> None:
+    server.served, server.refused = 0, 0
+    pool: TikTokHTTPPool = TikTokHTTPPool(signer_kwargs={"rate_limiter": limiter})
+    webs: List[TikTokWebClient] = [TikTokWebClient(pool=pool) for _ in range(CLIENTS)]
+
+    async def connect(web: TikTokWebClient) -> float:
+        started: float = time.perf_counter()
+
+        while True:
+            try:
+                await web.fetch_signed_websocket(room_id=7000000000000000000)
+                return time.perf_counter() - started
+            except SignatureRateLimitError as ex:
+                await asyncio.sleep(ex.retry_after)
+
+    started: float = time.perf_counter()
+    timings: List[float] = sorted(await asyncio.gather(*(connect(web) for web in webs)))
+    elapsed: float = time.perf_counter() - started
+
+    print(
+        f"{name:>9}: all connected in {elapsed:5.2f} s (ideal {CLIENTS / QUOTA - 1:.0f}-{CLIENTS / QUOTA:.0f} s), "
+        f"p50 {statistics.median(timings):5.2f} s, p99 {timings[int(len(timings) * 0.99)]:5.2f} s, "
+        f"{server.refused:4d} 429s for {server.served} signatures"
+    )
+
+    if not isinstance(limiter, UnlimitedLimiter):
+        print(
+            f"{'':>9}  limiter: rate {limiter.rate:.0f}/s, waits mean {limiter.mean_wait:.2f} s, "
+            f"p99 {limiter.wait_percentile(99):.2f} s, max {limiter.max_wait:.2f} s"
+        )
+
+    for web in webs:
+        await web.close()
+
+    await pool.close()
+
+
+async def main() -> None:
+    server: QuotaSignServer = QuotaSignServer()
+    WebDefaults.tiktok_sign_url = await server.start()
+
+    await run("unlimited", UnlimitedLimiter(), server)
+    await asyncio.sleep(1)
+    await run("limiter", SignRateLimiter(), server)
+    await asyncio.sleep(1)
+    await run("preset", SignRateLimiter(rate=QUOTA), server)
+
+    server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
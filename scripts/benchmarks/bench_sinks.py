@@ -0,0 +1,93 @@
+"""
+Forward events to a file: one write per event (typical `client.on` glue) vs a batching FileSink.
+Then push events into a slow destination under each overflow policy.
+Run from this directory: python bench_sinks.py
+
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from typing import List, Tuple
+
+from samples import sample_messages
+from TikTokLive.client.sinks import FileSink, EventSink, OverflowPolicy
+from TikTokLive.events import Event
+from TikTokLive.events.proto_events import EVENT_MAPPINGS
+from TikTokLive.proto.proto_json import MessageJSONEncoder
+
+MESSAGES: int = 1000
+
+
+async def per_event(path: str, events: List[Event]) -> None:
+    """Write each event as it arrives, off the event loop"""
+
+    encoder: MessageJSONEncoder = MessageJSONEncoder()
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    with open(path, "ab") as file:
+        def write_line(line: bytes) -> None:
+            file.write(line)
+            file.flush()
+
+        for event in events:
+            await loop.run_in_executor(None, write_line, encoder.encode(event) + b"\n")
+
+
+async def batched(path: str, events: List[Event]) -> None:
+    """Hand each event to a FileSink"""
+
+    sink: FileSink = FileSink(path, max_batch=200, max_latency=0.5)
+
+    for event in events:
+        await sink.put(event)
+
+    await sink.close()
+
+
+class SlowSink(EventSink):
+    """A destination that takes 20 ms per batch"""
+
+    async def write(self, events: List[Tuple[Event, float]]) -> None:
+        await asyncio.sleep(0.02)
+
+
+async def slow(events: List[Event], overflow: OverflowPolicy) -> None:
+    sink: SlowSink = SlowSink(max_batch=50, max_latency=0.05, max_pending=100, overflow=overflow)
+    started: float = time.perf_counter()
+
+    for event in events:
+        await sink.put(event)
+
+        # Events arrive about every 0.2 ms
+        if sink.metrics.events_received % 10 == 0:
+            await asyncio.sleep(0.002)
+
+    producer: float = time.perf_counter() - started
+    await sink.close()
+
+    print(
+        f"{overflow.name:>12}: producer took {producer * 1000:6.0f} ms, written {sink.metrics.events_written:5d}, "
+        f"dropped {sink.metrics.events_dropped:5d}, max lag {sink.metrics.max_lag * 1000:5.0f} ms, "
+        f"{sink.metrics.events_per_second:7.0f} events/s"
+    )
+
+
+async def main() -> None:
+    events: List[Event] = [EVENT_MAPPINGS[message.method]().parse(message.payload) for message in sample_messages(MESSAGES)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, forward in (("per event", per_event), ("FileSink", batched)):
+            path: str = os.path.join(directory, f"{name}.jsonl")
+            started: float = time.perf_counter()
+            await forward(path, events)
+            elapsed: float = time.perf_counter() - started
+            print(f"{name:>12}: {len(events)} events in {elapsed * 1000:6.0f} ms ({os.path.getsize(path) / 1024:.0f} KiB)")
+
+    for overflow in OverflowPolicy:
+        await slow(events, overflow)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
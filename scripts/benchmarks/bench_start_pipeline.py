@@ -0,0 +1,122 @@
+"""
+Time-to-connect: the requests `TikTokLiveClient.start` makes before connecting, one by one vs all at once.
+A local server stands in for TikTok (live check, room info, gift list) & the sign server, with a fixed latency
+per response, & the WebSocket connection itself is left out.
+Run from this directory: python bench_start_pipeline.py
+
+"""
+
+import asyncio
+import json
+import statistics
+import time
+from typing import Optional, List, Dict
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.client.web.web_settings import WebDefaults
+from TikTokLive.proto import ProtoMessageFetchResult
+
+STARTS: int = 20
+WEBCAST_DELAY: float = 0.08
+SIGN_DELAY: float = 0.15
+
+INITIAL_RESPONSE: bytes = bytes(ProtoMessageFetchResult(
+    cursor="1",
+    push_server="wss://127.0.0.1:1/webcast/im/push/v2/",
+    route_params={"room_id": "7000000000000000000"},
+    internal_ext="internal_src:dim"
+))
+
+ROUTES: Dict[bytes, bytes] = {
+    b"/webcast/room/check_alive/": json.dumps({"data": [{"alive": True}]}).encode(),
+    b"/webcast/room/info/": json.dumps({"data": {"id": 1, "status": 2, "title": "Benchmark"}}).encode(),
+    b"/webcast/gift/list/": json.dumps({"data": {"gifts": [{"id": 5655, "name": "Rose"}]}}).encode(),
+}
+
+
+class StartServer:
+    """Answers the start requests after a delay, counting them"""
+
+    def __init__(self):
+        self.requests: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                path: bytes = head.split(b" ")[1].split(b"?")[0]
+
+                if path == b"/webcast/fetch/":
+                    await asyncio.sleep(SIGN_DELAY)
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/x-protobuf\r\nX-Set-TT-Cookie: ttwid=benchmark\r\n"
+                        b"Content-Length: %d\r\n\r\n%s" % (len(INITIAL_RESPONSE), INITIAL_RESPONSE)
+                    )
+                else:
+                    await asyncio.sleep(WEBCAST_DELAY)
+                    body: bytes = ROUTES[path]
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                        % (len(body), body)
+                    )
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def time_start(concurrent_start: bool, fetch_extras: bool) -> float:
+    client: TikTokLiveClient = TikTokLiveClient(unique_id="@benchmark")
+
+    started: float = time.perf_counter()
+    task: asyncio.Task = await client.start(
+        room_id=7000000000000000000,
+        fetch_room_info=fetch_extras,
+        fetch_gift_info=fetch_extras,
+        warm_proto_cache=False,
+        concurrent_start=concurrent_start
+    )
+    elapsed: float = time.perf_counter() - started
+
+    # Leave the WebSocket out of it
+    task.cancel()
+
+    try:
+        await task
+    except (asyncio.CancelledError, Exception):
+        pass
+
+    await client.close()
+    return elapsed
+
+
+async def main() -> None:
+    server: StartServer = StartServer()
+    url: str = await server.start()
+    WebDefaults.tiktok_webcast_url = url + "/webcast"
+    WebDefaults.tiktok_sign_url = url
+
+    for fetch_extras in (False, True):
+        for concurrent_start in (False, True):
+            server.requests = 0
+            timings: List[float] = [await time_start(concurrent_start, fetch_extras) for _ in range(STARTS)]
+
+            print(
+                f"{'live check + info + gifts' if fetch_extras else 'live check':>25}, "
+                f"{'at once' if concurrent_start else 'one by one':>10}: "
+                f"start p50 {statistics.median(timings) * 1000:4.0f} ms, "
+                f"max {max(timings) * 1000:4.0f} ms, {server.requests / STARTS:.0f} requests per start"
+            )
+
+    server.server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
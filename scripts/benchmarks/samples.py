@@ -0,0 +1,140 @@
+import random
+import zlib
+from typing import List
+
+from TikTokLive.proto import ProtoMessageFetchResult, ProtoMessageFetchResultBaseProtoMessage, User, ImageModel, \
+    WebcastChatMessage, WebcastGiftMessage, WebcastLikeMessage, CommonMessageData, Gift, BadgeStruct, \
+    BadgeStructBadgeSceneType, BadgeStructBadgeDisplayType, PrivilegeLogExtra, ImageBadge, Text, FollowInfo
+
+"""A fixed seed so every benchmark run decodes the same traffic"""
+SAMPLE_SEED: int = 1988
+
+ROOM_ID: int = 7400000000000000000
+CDN_URL: str = "https://p16-webcast.tiktokcdn.com/img/maliva/webcast-va/{key}~tplv-obj.image?x-expires=1700000000&x-signature={sig}"
+
+
+def sample_image(key: str) -> ImageModel:
+    """Build an ImageModel with a few CDN mirrors. Like the real CDN, an image always gets the same URLs."""
+
+    return ImageModel(
+        m_urls=[CDN_URL.format(key=key, sig=f"{zlib.crc32(key.encode()):08x}{mirror}") for mirror in range(3)],
+        m_uri=f"webcast-va/{key}",
+        height=100,
+        width=100
+    )
+
+
+def sample_user(user_num: int) -> User:
+    """Build a User with an avatar & a couple of badges"""
+
+    return User(
+        id=6800000000000000000 + user_num,
+        nick_name=f"viewer {user_num}",
+        username=f"viewer_{user_num}",
+        avatar_thumb=sample_image(f"avatar_{user_num}"),
+        follow_info=FollowInfo(follow_status=user_num % 3),
+        badge_list=[
+            BadgeStruct(
+                badge_scene=BadgeStructBadgeSceneType.BADGE_SCENE_TYPE_USER_GRADE,
+                badge_display_type=BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_IMAGE,
+                log_extra=PrivilegeLogExtra(level=str(user_num % 50)),
+                image_badge=ImageBadge(image_model=sample_image(f"grade_badge_icon_lite_lv{user_num % 50}_v1"))
+            ),
+            BadgeStruct(
+                badge_scene=BadgeStructBadgeSceneType.BADGE_SCENE_TYPE_FANS,
+                badge_display_type=BadgeStructBadgeDisplayType.BADGE_DISPLAY_TYPE_IMAGE,
+                log_extra=PrivilegeLogExtra(level=str(user_num % 20)),
+                image_badge=ImageBadge(image_model=sample_image(f"fans_badge_icon_lv{user_num % 20}_v0"))
+            )
+        ]
+    )
+
+
+def sample_base_message(method: str, message_id: int, key: str) -> CommonMessageData:
+    """Build the CommonMessageData every Webcast message carries"""
+
+    return CommonMessageData(
+        method=method,
+        message_id=message_id,
+        room_id=ROOM_ID,
+        create_time=1700000000000 + message_id,
+        display_text=Text(key=key, default_pattern="{0:user} " + key)
+    )
+
+
+def sample_messages(count: int, users: int = 200) -> List[ProtoMessageFetchResultBaseProtoMessage]:
+    """
+    Build a mix of comment, gift & like messages as they would arrive in a ProtoMessageFetchResult
+
+    :param count: The number of messages to build
+    :param users: The number of distinct users to draw from
+    :return: The messages
+
+    """
+
+    rng: random.Random = random.Random(SAMPLE_SEED)
+    messages: List[ProtoMessageFetchResultBaseProtoMessage] = []
+
+    for msg_id in range(1, count + 1):
+        user: User = sample_user(rng.randrange(users))
+        kind: int = msg_id % 3
+
+        if kind == 0:
+            method = "WebcastChatMessage"
+            payload = WebcastChatMessage(
+                base_message=sample_base_message(method, msg_id, "pm_mt_chat"),
+                user_info=user,
+                content=f"comment number {msg_id}"
+            )
+        elif kind == 1:
+            method = "WebcastGiftMessage"
+            payload = WebcastGiftMessage(
+                base_message=sample_base_message(method, msg_id, "pm_mt_gift"),
+                from_user=user,
+                repeat_count=rng.randrange(1, 30),
+                repeat_end=rng.randrange(2),
+                m_gift=Gift(id=5655, name="Rose", diamond_count=1, type=1, image=sample_image("rose"))
+            )
+        else:
+            method = "WebcastLikeMessage"
+            payload = WebcastLikeMessage(
+                base_message=sample_base_message(method, msg_id, "pm_mt_like"),
+                user=user,
+                count=rng.randrange(1, 15),
+                total=msg_id * 10
+            )
+
+        messages.append(
+            ProtoMessageFetchResultBaseProtoMessage(
+                method=method,
+                payload=bytes(payload),
+                msg_id=msg_id
+            )
+        )
+
+    return messages
+
+
+def sample_fetch_results(frames: int, messages_per_frame: int = 10) -> List[bytes]:
+    """
+    Build serialized ProtoMessageFetchResult frames
+
+    :param frames: The number of frames to build
+    :param messages_per_frame: How many messages to put in each frame
+    :return: The serialized frames
+
+    """
+
+    messages: List[ProtoMessageFetchResultBaseProtoMessage] = sample_messages(frames * messages_per_frame)
+
+    return [
+        bytes(
+            ProtoMessageFetchResult(
+                messages=messages[idx:idx + messages_per_frame],
+                cursor=str(idx),
+                internal_ext=f"internal_ext:{idx}",
+                is_first=idx == 0
+            )
+        )
+        for idx in range(0, len(messages), messages_per_frame)
+    ]
@@ -0,0 +1,21 @@
+from TikTokLive.client.capture.capture_codec import DictionaryCodec, DictionaryCodecType, ZLIB_MAX_DICTIONARY_SIZE
+
+
+def payload(num: int) -> bytes:
+    return b"".join(
+        b'{"nick_name": "viewer %d", "avatar": "https://p16-webcast.tiktokcdn.com/img/avatar_%d~tplv.image"}'
+        % (user, user) for user in range(num, num + 200)
+    )
+
+
+def test_zlib_dictionary_round_trip():
+    samples = [payload(num) for num in range(64)]
+    codec = DictionaryCodec.train(samples, codec_type=DictionaryCodecType.ZLIB)
+
+    assert 0 < len(codec.to_bytes()) <= ZLIB_MAX_DICTIONARY_SIZE + 5
+
+    for data in (payload(1000), b"", b"unrelated"):
+        assert codec.decompress(codec.compress(data)) == data
+
+    # The dictionary carries the shared content
+    assert len(codec.compress(payload(1000))) < len(DictionaryCodec(b"", DictionaryCodecType.ZLIB).compress(payload(1000)))
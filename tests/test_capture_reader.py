@@ -0,0 +1,30 @@
+import asyncio
+
+from TikTokLive.client.capture import CaptureWriter, CaptureRecordKind, CaptureReader
+from TikTokLive.proto import ProtoMessageFetchResult, ProtoMessageFetchResultBaseProtoMessage
+
+
+def fetch_result(*msg_ids: int) -> bytes:
+    return bytes(ProtoMessageFetchResult(messages=[
+        ProtoMessageFetchResultBaseProtoMessage(method="WebcastChatMessage", msg_id=msg_id) for msg_id in msg_ids
+    ]))
+
+
+def test_seek_msg_id_with_overlapping_ranges(tmp_path):
+    frames = [(1, 100), (50,), (60, 70), (200,)]
+
+    async def write():
+        async with CaptureWriter(tmp_path / "room.capture") as writer:
+            for msg_ids in frames:
+                writer.write(CaptureRecordKind.FETCH_RESULT, fetch_result(*msg_ids), msg_ids=msg_ids)
+
+    asyncio.run(write())
+
+    with CaptureReader(tmp_path / "room.capture") as reader:
+        # 50 & 60 start later ranges, but also fall inside the first record's
+        assert reader.seek_msg_id(50) == 1
+        assert reader.seek_msg_id(60) == 2
+        assert reader.seek_msg_id(100) == 0
+        assert reader.seek_msg_id(200) == 3
+        assert reader.seek_msg_id(150) is None
+        assert reader.seek_msg_id(0) is None
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from TikTokLive.client.capture import CaptureWriter, CaptureRecordKind, CaptureReader
+
+
+def test_buffered_records_are_flushed_without_more_writes(tmp_path):
+    async def run():
+        writer = CaptureWriter(tmp_path / "room.capture", flush_interval=0.05, fsync=False)
+        writer.write(CaptureRecordKind.PUSH_FRAME, b"frame")
+
+        await asyncio.sleep(0.2)
+        assert writer.records_written == 1
+        await writer.close()
+
+    asyncio.run(run())
+
+
+def test_failed_flush_stops_the_capture_without_raising_on_write(tmp_path):
+    async def run():
+        writer = CaptureWriter(tmp_path / "room.capture", batch_size=1, fsync=False)
+
+        def broken(records):
+            raise OSError("No space left on device")
+
+        writer._write_batch = broken
+        writer.write(CaptureRecordKind.PUSH_FRAME, b"frame")
+        await asyncio.sleep(0.05)
+
+        # The receive loop carries on, & the error is raised on close
+        writer.write(CaptureRecordKind.PUSH_FRAME, b"frame")
+        assert isinstance(writer.error, OSError)
+
+        with pytest.raises(OSError):
+            await writer.close()
+
+    asyncio.run(run())
+
+
+def test_partial_write_is_cut_off(tmp_path):
+    async def run():
+        path = tmp_path / "room.capture"
+        writer = CaptureWriter(path, batch_size=2, fsync=False)
+
+        writer.write(CaptureRecordKind.PUSH_FRAME, b"good", msg_ids=[1])
+        writer.write(CaptureRecordKind.PUSH_FRAME, b"good", msg_ids=[2])
+        await writer.flush()
+
+        def half_then_fail(file, data):
+            file.write(data[:len(data) // 2])
+            raise OSError("No space left on device")
+
+        writer._write_all = half_then_fail
+        writer.write(CaptureRecordKind.PUSH_FRAME, b"lost", msg_ids=[3])
+        writer.write(CaptureRecordKind.PUSH_FRAME, b"lost", msg_ids=[4])
+        await writer.flush()
+
+        with pytest.raises(OSError):
+            await writer.close()
+
+        with CaptureReader(path) as reader:
+            assert [bytes(record.payload) for record in reader.records()] == [b"good", b"good"]
+
+    asyncio.run(run())
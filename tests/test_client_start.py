@@ -0,0 +1,103 @@
+import asyncio
+import gc
+
+import pytest
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.client.errors import UserOfflineError
+from TikTokLive.client.web.web_identity import IdentityCache
+from TikTokLive.client.ws.ws_replay import WebcastReplayClient
+from TikTokLive.events import ControlEvent
+from TikTokLive.events.custom_events import LiveEndEvent
+from TikTokLive.proto import ProtoMessageFetchResult, ProtoMessageFetchResultBaseProtoMessage
+from TikTokLive.proto.custom_proto import ControlAction
+
+LIVE_RESPONSE: ProtoMessageFetchResult = ProtoMessageFetchResult(
+    cursor="1",
+    push_server="wss://127.0.0.1:1/webcast/im/push/v2/",
+    route_params={"room_id": "9"}
+)
+
+
+class Resolver:
+    """Looks up the user's new room"""
+
+    def __init__(self):
+        self.lookups = 0
+
+    async def resolve(self, web, unique_id):
+        self.lookups += 1
+        return 9
+
+
+def test_unproven_cached_room_is_looked_up_again_without_live_check():
+    async def run():
+        identity_cache = IdentityCache()
+        identity_cache.set_room_id("creator", 7)
+        resolver = Resolver()
+        client = TikTokLiveClient(unique_id="@creator", identity_cache=identity_cache, room_id_resolver=resolver)
+        fetched_rooms = []
+
+        async def fetch_start_responses(**_):
+            fetched_rooms.append(client.room_id)
+
+            # The cached room has ended, so its first response can't connect
+            return LIVE_RESPONSE if client.room_id == 9 else ProtoMessageFetchResult()
+
+        client._fetch_start_responses = fetch_start_responses
+        task = await client.start(fetch_live_check=False, warm_proto_cache=False)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert fetched_rooms == [7, 9]
+        assert resolver.lookups == 1
+        assert identity_cache.get_room_id("creator") == 9
+        await client.close()
+
+    asyncio.run(run())
+
+
+
+def test_failed_start_collects_the_proto_warm_up(monkeypatch):
+    def broken_warm_up(*_):
+        raise RuntimeError("warm-up failed")
+
+    monkeypatch.setattr("TikTokLive.client.client.warm_proto_metadata", broken_warm_up)
+
+    async def run():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda _, context: errors.append(context))
+        client = TikTokLiveClient(unique_id="@creator")
+
+        async def fetch_start_responses(**_):
+            # Long enough for the warm-up to fail first
+            await asyncio.sleep(0.05)
+            raise UserOfflineError()
+
+        client._fetch_start_responses = fetch_start_responses
+
+        with pytest.raises(UserOfflineError):
+            await client.start(room_id=7)
+
+        await client.close()
+        gc.collect()
+
+        # Nothing was left to report "exception was never retrieved"
+        assert errors == []
+
+    asyncio.run(run())
+
+def test_replayed_stream_end_leaves_the_live_room_alone():
+    async def run():
+        identity_cache = IdentityCache()
+        identity_cache.set_room_id("creator", 7)
+        client = TikTokLiveClient(unique_id="@creator", identity_cache=identity_cache)
+        client._ws = WebcastReplayClient(source=[])
+        control = ControlEvent(action=ControlAction.CONTROL_ACTION_STREAM_ENDED)
+        message = ProtoMessageFetchResultBaseProtoMessage(method="WebcastControlMessage", payload=bytes(control))
+
+        assert isinstance(await client.handle_custom_event(message, control), LiveEndEvent)
+        assert identity_cache.get_room_id("creator") == 7
+        await client.close()
+
+    asyncio.run(run())
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+
+from TikTokLive.client.export import ParquetExportSink
+from TikTokLive.events.proto_events import CommentEvent
+from TikTokLive.proto import CommonMessageData, User
+
+ROOMS = (7000000000000000001, 7000000000000000002)
+
+
+def comment(room_id: int, num: int) -> CommentEvent:
+    return CommentEvent(
+        base_message=CommonMessageData(message_id=num, room_id=room_id, create_time=num),
+        user_info=User(id=num, nick_name=f"User {num}"),
+        content=f"comment {num}"
+    )
+
+
+def test_interleaved_rooms_round_trip(tmp_path):
+    sink = ParquetExportSink(tmp_path, event_types=(CommentEvent,), compression="snappy")
+    received_at = time.time()
+
+    for num in range(100):
+        sink.write(comment(ROOMS[num % 2], num), received_at=received_at)
+
+    asyncio.run(sink.close())
+
+    # One file & one row group per room, rather than a row group per room change
+    assert len(sink.files_written) == 2
+    assert sink.rows_written == 100
+
+    for path in sink.files_written:
+        room_id = ROOMS[0] if f"room_id={ROOMS[0]}" in path else ROOMS[1]
+        table = pyarrow_parquet.read_table(path)
+
+        assert pyarrow_parquet.ParquetFile(path).metadata.num_row_groups == 1
+        assert table.num_rows == 50
+        assert set(table.column("room_id").to_pylist()) == {room_id}
+        assert table.column("content").to_pylist() == [
+            f"comment {num}" for num in range(100) if ROOMS[num % 2] == room_id
+        ]
+
+
+def test_idle_files_are_closed_before_close(tmp_path):
+    sink = ParquetExportSink(tmp_path, event_types=(CommentEvent,), compression="snappy", idle_timeout=0)
+    sink.write(comment(ROOMS[0], 1))
+
+    async def flush_twice():
+        # The first flush writes the batch, the second finds its file idle
+        await sink.flush()
+        await sink.flush()
+
+    asyncio.run(flush_twice())
+
+    assert pyarrow_parquet.read_table(sink.files_written[0]).num_rows == 1
+    asyncio.run(sink.close())
+
+
+def test_quiet_room_is_written_and_closed_without_flushing(tmp_path, monkeypatch):
+    monkeypatch.setattr("TikTokLive.client.export.export_parquet.SWEEP_INTERVAL", 0.05)
+    sink = ParquetExportSink(tmp_path, event_types=(CommentEvent,), compression="snappy", flush_interval=0.1,
+                             idle_timeout=0.1)
+
+    async def write_then_wait():
+        sink.write(comment(ROOMS[0], 1))
+
+        # No more events, no flush: the timer writes the batch, then closes the idle file
+        await asyncio.sleep(0.5)
+
+        assert sink.rows_written == 1
+        assert pyarrow_parquet.read_table(sink.files_written[0]).num_rows == 1
+
+        await sink.close()
+
+    asyncio.run(write_then_wait())
@@ -0,0 +1,74 @@
+import asyncio
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.client.sinks import EventSink
+from TikTokLive.events.proto_events import CommentEvent, CompetitionEvent
+from TikTokLive.proto import ProtoMessageFetchResultBaseProtoMessage, User
+from TikTokLive.proto.proto_projection import FieldProjection, ProjectionRecord
+from TikTokLive.proto.tiktok_proto import WebcastCompetitionMessage, WebcastCompetitionMessageCompetitionMessageType
+
+MESSAGE: ProtoMessageFetchResultBaseProtoMessage = ProtoMessageFetchResultBaseProtoMessage(
+    method="WebcastChatMessage",
+    payload=bytes(CommentEvent(user_info=User(id=1, nick_name="User"), content="hi"))
+)
+
+
+class ListSink(EventSink):
+    async def write(self, events):
+        pass
+
+
+def parse(client: TikTokLiveClient) -> list:
+    return asyncio.run(client._parse_webcast_response_message(MESSAGE))
+
+
+def test_projection_only_skips_the_full_parse():
+    client = TikTokLiveClient(unique_id="@creator")
+    client.project(CommentEvent, ["content"], lambda record: None)
+
+    assert not any(isinstance(event, CommentEvent) for event in parse(client))
+
+
+def test_failed_projection_falls_back_to_the_full_parse():
+    client = TikTokLiveClient(unique_id="@creator")
+    client.on(CommentEvent, lambda event: None)
+    client.project(CommentEvent, ["content"], lambda record: None)
+
+    def broken(payload):
+        raise ValueError("Broken projection")
+
+    for projection in client._projections["WebcastChatMessage"].values():
+        projection.decode = broken
+
+    comments = [event for event in parse(client) if isinstance(event, CommentEvent)]
+    assert [comment.content for comment in comments] == ["hi"]
+
+
+def test_sinks_get_projected_events_in_full():
+    client = TikTokLiveClient(unique_id="@creator")
+    client.project(CommentEvent, ["content"], lambda record: None)
+    client.add_sink(ListSink())
+
+    assert any(isinstance(event, CommentEvent) for event in parse(client))
+
+
+def test_projected_type_field_is_not_hidden():
+    message_type = list(WebcastCompetitionMessageCompetitionMessageType)[1]
+    projection = FieldProjection(message_type=CompetitionEvent, fields=["type"])
+    record = projection.decode(bytes(WebcastCompetitionMessage(type=message_type)))
+
+    assert isinstance(record, ProjectionRecord)
+    assert record.type == message_type
+    assert record._event_type == projection.event_name
+
+
+def test_projection_records_reach_their_handlers():
+    client = TikTokLiveClient(unique_id="@creator")
+    received = []
+    client.project(CommentEvent, ["content"], received.append)
+
+    for event in parse(client):
+        if isinstance(event, ProjectionRecord):
+            client.emit(event._event_type, event)
+
+    assert [record.content for record in received] == ["hi"]
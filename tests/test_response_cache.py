@@ -0,0 +1,30 @@
+import asyncio
+
+import httpx
+
+from TikTokLive import TikTokLiveClient
+from TikTokLive.client.web.web_settings import WebDefaults
+
+
+def test_invalidating_a_room_drops_its_cached_lookups():
+    async def run():
+        client = TikTokLiveClient(unique_id="@creator")
+        cache = client.web.response_cache
+        keys = {
+            "html": f"GET {WebDefaults.tiktok_app_url}/@creator/live",
+            "api": f"GET {WebDefaults.tiktok_app_url}/api-live/user/room/?aid=1988&uniqueId=creator&sourceType=54",
+            "live": f"GET {WebDefaults.tiktok_webcast_url}/room/check_alive/?aid=1988&room_ids=7",
+            "other_api": f"GET {WebDefaults.tiktok_app_url}/api-live/user/room/?aid=1988&uniqueId=other&sourceType=54",
+            "other_live": f"GET {WebDefaults.tiktok_webcast_url}/room/check_alive/?aid=1988&room_ids=8",
+        }
+
+        for key in keys.values():
+            cache._store(key, 60, httpx.Response(200))
+
+        client._room_id = 7
+        client._invalidate_room_id()
+
+        assert set(cache._entries) == {keys["other_api"], keys["other_live"]}
+        await client.close()
+
+    asyncio.run(run())
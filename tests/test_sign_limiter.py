@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from TikTokLive.client.errors import SignatureRateLimitError
+from TikTokLive.client.web.web_sign_limiter import SignRateLimiter
+
+
+def rate_limited(reset_in: int) -> httpx.Response:
+    return httpx.Response(
+        status_code=429,
+        headers={"RateLimit-Limit": "10", "RateLimit-Remaining": str(reset_in)},
+        json={"message": "Rate limited", "limit_label": "per_hour"}
+    )
+
+
+def test_long_pause_fails_instead_of_blocking():
+    async def run():
+        limiter = SignRateLimiter(max_wait=1.0)
+        limiter.on_rate_limited(rate_limited(3600))
+
+        started = time.monotonic()
+        results = await asyncio.gather(*(limiter.acquire() for _ in range(3)), return_exceptions=True)
+
+        # Every queued request fails right away, rather than each holding the queue for an hour
+        assert time.monotonic() - started < 0.5
+        assert all(isinstance(result, SignatureRateLimitError) for result in results)
+        assert 3590 <= results[0].retry_after <= 3600
+        assert limiter.gave_up == 3
+
+    asyncio.run(run())
+
+
+def test_short_pause_is_waited_out():
+    async def run():
+        limiter = SignRateLimiter(max_wait=1.0)
+        limiter.on_rate_limited(httpx.Response(status_code=429, headers={"Retry-After": "0.1"}))
+
+        assert await limiter.acquire() >= 0.05
+        assert limiter.gave_up == 0
+
+    asyncio.run(run())
+
+
+def test_queue_wait_is_bounded():
+    async def run():
+        limiter = SignRateLimiter(rate=2, burst=1, max_wait=0.2)
+
+        await limiter.acquire()
+
+        # The next turn is 0.5s away
+        with pytest.raises(SignatureRateLimitError):
+            await limiter.acquire()
+
+    asyncio.run(run())
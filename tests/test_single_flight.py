@@ -0,0 +1,82 @@
+import asyncio
+
+from TikTokLive.client.gift_catalogue import GiftCatalogue
+from TikTokLive.client.web.web_image_cache import ImageCache
+
+
+class SlowGiftList:
+    """Stands in for the gift list route, answering after a delay"""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def fetch_if_changed(self, validators=None):
+        self.requests += 1
+        await asyncio.sleep(0.05)
+        return {"gifts": [{"id": 5655, "name": "Rose", "diamond_count": 1}]}, {}
+
+
+class FakeWeb:
+    def __init__(self):
+        self.fetch_gift_list = SlowGiftList()
+
+
+def test_catalogue_refresh_survives_cancelled_owner():
+    async def run():
+        web = FakeWeb()
+        catalogue = GiftCatalogue(web=web)
+
+        owner = asyncio.create_task(catalogue.ensure())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(catalogue.ensure())
+        await asyncio.sleep(0.01)
+
+        # The client that started the refresh gives up, the other still gets the list
+        owner.cancel()
+        await waiter
+
+        assert catalogue.get(5655).name == "Rose"
+        assert web.fetch_gift_list.requests == 2
+
+    asyncio.run(run())
+
+
+def test_image_download_survives_cancelled_owner():
+    async def run():
+        cache = ImageCache()
+        downloads = []
+
+        async def download(urls):
+            downloads.append(urls[0])
+            await asyncio.sleep(0.05)
+            return b"image"
+
+        urls = ["https://p16-sign.tiktokcdn.com/tos/avatar.webp?x-expires=1"]
+        owner = asyncio.create_task(cache.fetch(urls, download))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.fetch(urls, download))
+        await asyncio.sleep(0.01)
+
+        owner.cancel()
+        assert await waiter == b"image"
+        assert len(downloads) == 2
+
+    asyncio.run(run())
+
+
+def test_image_download_survives_failed_disk_write(tmp_path):
+    async def run():
+        cache = ImageCache(directory=tmp_path)
+
+        def fail(key, data):
+            raise OSError(28, "No space left on device")
+
+        cache._write_disk_sync = fail
+
+        async def download(urls):
+            return b"image"
+
+        assert await cache.fetch(["https://p16-sign.tiktokcdn.com/tos/avatar.webp"], download) == b"image"
+        assert cache.memory_bytes == len(b"image")
+
+    asyncio.run(run())
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+from TikTokLive.client.web.web_base import TikTokHTTPClient
+from TikTokLive.client.web.web_pool import TikTokHTTPPool
+from TikTokLive.client.web.web_signer import TikTokSigner
+from TikTokLive.client.web.web_transport import environment_proxy, environment_proxies, create_host_mounts, \
+    DEFAULT_HOST_SETTINGS, HostTransport
+
+PROXY: str = "http://127.0.0.1:9"
+
+
+def proxied(transport) -> bool:
+    """Whether a (host or shared) transport connects through a proxy"""
+
+    while not hasattr(transport, "_pool"):
+        transport = transport._transport
+
+    return type(transport._pool).__name__ == "AsyncHTTPProxy"
+
+
+def test_environment_proxies(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "127.0.0.1:9")
+    monkeypatch.setenv("NO_PROXY", "tiktok.com, .tiktokcdn.com,::1,localhost")
+
+    assert environment_proxies() == {
+        "https://": PROXY,
+        "all://*tiktok.com": None,
+        "all://*.tiktokcdn.com": None,
+        "all://[::1]": None,
+        "all://localhost": None,
+    }
+
+    monkeypatch.setenv("NO_PROXY", "*")
+    assert environment_proxies() == {}
+
+
+def test_environment_proxy(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", PROXY)
+    monkeypatch.setenv("NO_PROXY", "www.tiktok.com")
+
+    assert environment_proxy("webcast.tiktok.com") == PROXY
+    assert environment_proxy("*.tiktokcdn.com") == PROXY
+    assert environment_proxy("www.tiktok.com") is None
+
+
+def test_host_mounts_use_environment_proxy(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", PROXY)
+    monkeypatch.setenv("NO_PROXY", "www.tiktok.com")
+
+    mounts = create_host_mounts(DEFAULT_HOST_SETTINGS)
+    assert proxied(mounts["all://webcast.tiktok.com"])
+    assert not proxied(mounts["all://www.tiktok.com"])
+
+    # Unless trust_env is off
+    assert not proxied(create_host_mounts(DEFAULT_HOST_SETTINGS, trust_env=False)["all://webcast.tiktok.com"])
+
+
+def test_signer_and_pool_use_environment_proxy(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", PROXY)
+
+    async def check():
+        signer = TikTokSigner(sign_api_base="https://sign.example.com")
+        assert proxied(signer.client._transport)
+        await signer.client.aclose()
+
+        pool = TikTokHTTPPool()
+        assert any(proxied(transport) for transport in pool.client_kwargs()["mounts"].values())
+        await pool.close()
+
+    asyncio.run(check())
+
+
+def test_pooled_clients_have_their_own_curl_cffi_cookies():
+    pytest.importorskip("curl_cffi")
+
+    async def check():
+        pool = TikTokHTTPPool()
+        first, second = TikTokHTTPClient(pool=pool), TikTokHTTPClient(pool=pool)
+
+        assert first.curl_cffi_client is not second.curl_cffi_client
+        assert first.curl_cffi_client.acurl is second.curl_cffi_client.acurl
+
+        first.curl_cffi_client.cookies.set("msToken", "first")
+        assert second.curl_cffi_client.cookies.get("msToken") is None
+
+        # Closing one client leaves the shared connections open for the other
+        await first.close()
+        assert second.curl_cffi_client.acurl._curlm is not None
+
+        await second.close()
+        await pool.close()
+
+    asyncio.run(check())
+
+
+def test_host_pools_are_opt_in():
+    async def check():
+        limits = httpx.Limits(max_connections=3)
+        url = httpx.URL("https://webcast.tiktok.com/webcast/room/info/")
+
+        # By default, the client's own limits apply to every host
+        client = TikTokHTTPClient(httpx_kwargs={"limits": limits})
+        transport = client.httpx_client._transport_for_url(url)
+        assert not isinstance(transport, HostTransport)
+        assert transport._pool._max_connections == 3
+        await client.close()
+
+        client = TikTokHTTPClient(host_settings={})
+        assert isinstance(client.httpx_client._transport_for_url(url), HostTransport)
+        await client.close()
+
+    asyncio.run(check())